@@ -1,9 +0,0 @@
-"""
-工业营销自动化系统核心模块包
-包含五大功能模块：
-1. strategy_insight - 战略洞察与定向
-2. planning - 策略与计划制定
-3. content_creation - 内容创造与武装
-4. execution - 执行、互动与追踪
-5. analysis - 复盘、归因与进化
-"""
\ No newline at end of file
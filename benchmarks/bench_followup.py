@@ -0,0 +1,105 @@
+"""
+跟进动作调度基准
+批量写入百万级待办动作，测量入队吞吐、重启后重建堆的耗时、堆的内存占用与按到期顺序弹出的吞吐，
+并以模拟大模型提供商按限定速率发送一批到期动作，核对实际调用速率不超过上限
+用法: python -m benchmarks.bench_followup --actions 1000000 --rate 50 --outreach 200
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from modules.followup_scheduler import FollowUpScheduler
+from modules.llm_orchestrator import LLMOrchestrator
+from modules.mock_provider import SimulatedProvider
+
+ACTIONS = ["安排技术团队演示", "发送详细ROI分析报告", "安排国际团队视频会议"]
+PRIORITIES = ["高", "中", "低"]
+BASE = 1_760_000_000
+
+
+def synthetic_actions(count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {"client": f"客户{i}", "action": ACTIONS[i % 3], "priority": PRIORITIES[rng.randrange(3)],
+               "deadline": BASE + rng.randrange(30 * 86400)}
+
+
+def run(actions=1_000_000, rate=50.0, outreach=200, seed=0):
+    workdir = tempfile.mkdtemp(prefix="bench_followup_")
+    db_path = os.path.join(workdir, "followup.db")
+    provider = SimulatedProvider(seed=seed, time_scale=0)
+    orchestrator = LLMOrchestrator(provider=provider)
+    try:
+        scheduler = FollowUpScheduler(db_path, orchestrator=orchestrator, rate_per_sec=rate)
+        start = time.perf_counter()
+        batch = []
+        for action in synthetic_actions(actions, seed):
+            batch.append(action)
+            if len(batch) == 50_000:
+                scheduler.schedule_many(batch)
+                batch = []
+        scheduler.schedule_many(batch)
+        schedule_seconds = time.perf_counter() - start
+
+        # 增量单条入队(O(log n)堆插入 + 单条事务)
+        start = time.perf_counter()
+        for action in synthetic_actions(1000, seed + 1):
+            scheduler.schedule(action)
+        single_us = (time.perf_counter() - start) / 1000 * 1e6
+        scheduler.close()
+
+        # 重启：从数据库重建堆
+        start = time.perf_counter()
+        scheduler = FollowUpScheduler(db_path, orchestrator=orchestrator, rate_per_sec=rate, burst=1)
+        reload_seconds = time.perf_counter() - start
+        heap_bytes = sys.getsizeof(scheduler._heap) + sum(map(sys.getsizeof, scheduler._heap))
+        pending = len(scheduler)
+
+        # 按到期顺序弹出前10%
+        cutoff = BASE + 3 * 86400
+        start = time.perf_counter()
+        popped = scheduler.pop_due(cutoff)
+        pop_seconds = time.perf_counter() - start
+        dues = [action.deadline for _, action in popped]
+        assert all(int(a) <= int(b) for a, b in zip(dues, dues[1:]))
+
+        # 限速发送(桶容量为1，不计突发)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = scheduler.run_due(BASE + 6 * 86400, limit=outreach)
+        outreach_seconds = time.perf_counter() - start
+        scheduler.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "actions": actions,
+        "schedule_per_sec": round(actions / schedule_seconds),
+        "single_schedule_us": round(single_us, 1),
+        "reload_s": round(reload_seconds, 3),
+        "heap_mb": round(heap_bytes / 2 ** 20, 1),
+        "pending_after_reload": pending,
+        "popped": len(popped),
+        "pop_per_sec": round(len(popped) / pop_seconds) if popped else None,
+        "outreach": summary,
+        "outreach_rate_limit": rate,
+        "outreach_calls_per_sec": round(summary["dispatched"] / outreach_seconds, 1)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--actions", type=int, default=1_000_000)
+    parser.add_argument("--rate", type=float, default=50.0)
+    parser.add_argument("--outreach", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.actions, args.rate, args.outreach, args.seed), ensure_ascii=False, indent=2))
@@ -0,0 +1,296 @@
+"""
+五阶段工作流端到端基准
+按客户规模(10~100k)生成合成活动数据，依次运行战略洞察、计划制定、内容创造、执行追踪与复盘分析，
+测量各阶段与端到端耗时、吞吐、峰值常驻内存及每个活动的大模型调用次数；
+大模型调用走SimulatedProvider，每个规模在独立子进程中运行以便分别统计峰值内存。
+结果写入JSON，可用--compare与上一次提交的结果对比，发现性能回退
+用法: python -m benchmarks.bench_pipeline --scales 10 1000 100000 --output pipeline.json
+      python benchmarks/bench_pipeline.py --scales 10 --repeat 1   (任意工作目录)
+      python -m benchmarks.bench_pipeline --compare pipeline.json --output pipeline_new.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _ensure_modules_package():
+    """
+    保证modules包可导入，与运行方式和工作目录无关(python -m、直接运行脚本、在其他目录运行)，
+    子进程导入本模块时同样执行。源码迁入modules/之前的提交中源码位于仓库根目录，
+    此时把根目录登记为modules包，便于在历史提交上运行同一基准做对比
+    """
+    if os.path.isdir(os.path.join(ROOT, "modules")):
+        if ROOT not in sys.path:
+            sys.path.insert(0, ROOT)
+        return
+    if "modules" in sys.modules or not os.path.exists(os.path.join(ROOT, "__init__.py")):
+        return
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location("modules", os.path.join(ROOT, "__init__.py"),
+                                                  submodule_search_locations=[ROOT])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules["modules"] = package
+    spec.loader.exec_module(package)
+
+
+_ensure_modules_package()
+
+DEFAULT_SCALES = (10, 100, 1000, 10_000, 100_000)
+STAGES = ("strategy_insight", "planning", "content_creation", "execution", "analysis")
+INDUSTRIES = ["化工", "汽车", "钢铁", "电子", "机械"]
+OWNERSHIP = ["国企", "民企", "外企", "合资", "私企"]
+CHANNELS = ["行业展会", "垂直平台", "国际展会"]
+INTERESTS = ["技术合规方案", "ROI分析", "全球技术标准"]
+REGIONS = ["华东", "华南", "华北", "华中", "西南", "西北", "东北"]
+
+
+def synthetic_campaign(clients, seed=0):
+    """生成规模为clients的合成活动数据"""
+    rng = np.random.default_rng(seed)
+    segments = max(1, min(clients // 10, 2000))
+    cases = max(1, min(clients // 10, 10_000))
+    return {
+        "client_data": {
+            "pain_points": ["设备维护成本高", "生产效率低"],
+            "operational_data": {"downtime": 15, "energy_consumption": 1200},
+            "critical_issues": ["安全合规"]
+        },
+        # 列式运营数据，供批量需求挖掘
+        "operational_data": {
+            "client_id": [f"client-{i}" for i in range(clients)],
+            "industry": [INDUSTRIES[i % len(INDUSTRIES)] for i in range(clients)],
+            "downtime": rng.exponential(8.0, clients),
+            "energy_consumption": rng.gamma(4.0, 300.0, clients),
+            "explicit_need_count": rng.integers(0, 4, clients),
+            "critical_issue": rng.random(clients) < 0.2
+        },
+        "competitor_data": {
+            "win_cases": [
+                {"client": f"客户{i % (cases // 2 + 1)}", "solution": f"智能维护系统{i % 7}",
+                 "value_prop": f"降低维护成本{10 + i % 30}%"} for i in range(cases)
+            ],
+            "marketing_activities": [
+                {"channel": CHANNELS[i % len(CHANNELS)], "content_type": "技术演示",
+                 "name": f"活动{i}", "success_rate": round(float(rate), 2)}
+                for i, rate in enumerate(rng.random(min(cases, 500)))
+            ]
+        },
+        "market_data": {
+            "customer_segments": [
+                {"name": f"{INDUSTRIES[i % len(INDUSTRIES)]}{OWNERSHIP[i % len(OWNERSHIP)]}{i}",
+                 "market_size": int(size), "growth_rate": round(float(growth), 3)}
+                for i, (size, growth) in enumerate(zip(rng.integers(200, 3000, segments),
+                                                       rng.uniform(0.0, 0.3, segments)))
+            ],
+            "regional_data": [
+                {"name": region, "demand_level": int(rng.integers(3, 10)), "competition_index": int(rng.integers(1, 8))}
+                for region in REGIONS
+            ]
+        },
+        # 线索库中的意向客户，与渠道发布产生的客户一起进入执行阶段
+        "leads": [
+            {"name": f"线索客户{i}", "contact": f"联系人{i}", "interest": INTERESTS[i % len(INTERESTS)],
+             "channel": CHANNELS[i % len(CHANNELS)], "type": OWNERSHIP[i % 3]} for i in range(clients)
+        ]
+    }
+
+
+def run_pipeline(campaign):
+    """运行一次五阶段工作流，返回各阶段耗时(秒)"""
+    from modules.analysis import Analysis
+    from modules.content_creation import ContentCreation
+    from modules.execution import Execution
+    from modules.planning import Planning
+    from modules.strategy_insight import StrategyInsight
+
+    timings = {}
+
+    def timed(stage, func):
+        start = time.perf_counter()
+        result = func()
+        timings[stage] = time.perf_counter() - start
+        return result
+
+    def strategy_insight():
+        insight = StrategyInsight()
+        insight.process_client_needs_batch(campaign["operational_data"])
+        insight.process_client_needs(campaign["client_data"])
+        insight.analyze_competition(campaign["competitor_data"])
+        insight.evaluate_market_opportunities(campaign["market_data"])
+        return insight.generate_strategy_brief()
+
+    def planning():
+        plan = Planning()
+        plan.match_client_strategies(brief)
+        plan.calculate_pricing_strategies()
+        plan.develop_channel_strategies()
+        return plan.generate_marketing_plan()
+
+    def content_creation():
+        content = ContentCreation()
+        content.generate_technical_materials(marketing_plan)
+        content.generate_sales_scripts()
+        return content.package_marketing_kit()
+
+    def execution():
+        execution = Execution()
+        potential_clients = execution.publish_to_channels(kit)["potential_clients"] + campaign["leads"]
+        execution.interact_and_follow_up(execution.resolve_clients(potential_clients))
+        execution.track_sales_progress(execution.interaction_records)
+        return {
+            "potential_clients": potential_clients,
+            "client_entities": execution.client_entities,
+            "channel_feedbacks": execution.channel_feedbacks["feedbacks"],
+            "sales_progress": execution.sales_progress
+        }
+
+    def analysis():
+        analysis = Analysis()
+        analysis.analyze_performance(dict(execution_results, client_strategies=marketing_plan["client_strategies"]))
+        analysis.identify_success_factors()
+        analysis.diagnose_failure_causes()
+        return analysis.optimize_knowledge_base()
+
+    brief = timed("strategy_insight", strategy_insight)
+    marketing_plan = timed("planning", planning)
+    kit = timed("content_creation", content_creation)
+    execution_results = timed("execution", execution)
+    timed("analysis", analysis)
+    return timings
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_scale(clients, repeat=3, seed=0, llm_latency_ms=800.0, time_scale=0.0):
+    """
+    在当前进程中运行指定规模，取各阶段耗时中位数
+    每次运行使用独立的临时数据库，避免情报库与知识库在多次运行间累积
+    """
+    from modules.llm_orchestrator import set_default_provider
+    from modules.mock_provider import SimulatedProvider
+    from modules.services import reset_services
+
+    provider = SimulatedProvider(seed=seed, latency_ms=llm_latency_ms, time_scale=time_scale)
+    set_default_provider(provider)
+    campaign = synthetic_campaign(clients, seed)
+    runs = []
+    workdir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    try:
+        for i in range(repeat):
+            os.environ["COMPETITOR_DB_PATH"] = os.path.join(workdir, f"competitor_{i}.db")
+            os.environ["KNOWLEDGE_DB_PATH"] = os.path.join(workdir, f"knowledge_{i}.db")
+            # 共享调度器的响应缓存会让后续运行不再调用大模型，每次运行从空服务容器开始
+            reset_services()
+            calls_before = provider.stats["calls"]
+            # 各阶段的日志输出不计入耗时
+            with contextlib.redirect_stdout(io.StringIO()):
+                timings = run_pipeline(campaign)
+            runs.append((timings, provider.stats["calls"] - calls_before))
+    finally:
+        set_default_provider(None)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    stage_ms = {stage: round(statistics.median(t[stage] for t, _ in runs) * 1000, 2) for stage in STAGES}
+    total = statistics.median(sum(t.values()) for t, _ in runs)
+    return {
+        "clients": clients,
+        "repeat": repeat,
+        "stage_ms": stage_ms,
+        "end_to_end_ms": round(total * 1000, 2),
+        "clients_per_sec": round(clients / total, 1),
+        "llm_calls_per_campaign": runs[-1][1],
+        "simulated_llm_seconds": round(provider.stats["simulated_seconds"] / repeat, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(scales=DEFAULT_SCALES, repeat=3, seed=0, llm_latency_ms=800.0, time_scale=0.0):
+    """每个规模在新的子进程中运行，峰值内存互不影响"""
+    results = []
+    for clients in scales:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results.append(pool.submit(run_scale, clients, repeat, seed, llm_latency_ms, time_scale).result())
+    return {
+        "benchmark": "pipeline",
+        "commit": _git_commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "config": {"repeat": repeat, "seed": seed, "llm_latency_ms": llm_latency_ms, "time_scale": time_scale},
+        "results": results
+    }
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    对比两次结果，返回超过阈值的回退项
+    :param threshold: 耗时/内存/调用次数的相对增幅阈值
+    """
+    previous = {result["clients"]: result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get(result["clients"])
+        if before is None:
+            continue
+        metrics = [(f"stage_ms.{stage}", before["stage_ms"][stage], result["stage_ms"][stage]) for stage in STAGES]
+        metrics += [(key, before[key], result[key])
+                    for key in ("end_to_end_ms", "peak_rss_mb", "llm_calls_per_campaign")]
+        for name, old, new in metrics:
+            # 1ms以内的阶段耗时波动不计
+            if new > old * (1 + threshold) and not (name.startswith("stage_ms") and new - old < 1):
+                regressions.append({"clients": result["clients"], "metric": name, "baseline": old, "current": new,
+                                    "change": round(new / old - 1, 3) if old else None})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    parser.add_argument("--time-scale", type=float, default=0.0, help="模拟大模型延迟的实际等待比例")
+    parser.add_argument("--output", help="结果JSON文件路径")
+    parser.add_argument("--compare", help="作为基线的历史结果JSON文件")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = run(args.scales, args.repeat, args.seed, args.llm_latency_ms, args.time_scale)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["regressions"] = compare(json.load(f), report, args.threshold)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    if report.get("regressions"):
+        sys.exit(1)
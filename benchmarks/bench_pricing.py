@@ -0,0 +1,59 @@
+"""
+定价优化引擎基准
+测量细分客户 × 方案 × 价格点的向量化搜索耗时
+用法: python -m benchmarks.bench_pricing --segments 500 --price-points 2000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from modules.pricing_engine import PricingEngine
+
+
+def run(segments=500, price_points=2000, repeats=5, seed=0):
+    rng = np.random.default_rng(seed)
+    engine = PricingEngine(price_points=price_points)
+    arrays = (
+        rng.uniform(1e5, 1e6, segments),
+        rng.uniform(10, 200, segments),
+        rng.uniform(1.2, 3.0, segments),
+        rng.uniform(5e4, 4e5, segments),
+        np.full(segments, 0.15)
+    )
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = engine.optimize_arrays(*arrays)
+        timings.append(time.perf_counter() - start)
+
+    profiles = [
+        {"segment": f"细分{i}", "reference_price": arrays[0][i], "base_demand": arrays[1][i],
+         "elasticity": arrays[2][i], "unit_cost": arrays[3][i], "min_margin": 0.15}
+        for i in range(segments)
+    ]
+    start = time.perf_counter()
+    engine.optimize(profiles)
+    quote_seconds = time.perf_counter() - start
+
+    return {
+        "segments": segments,
+        "bundles": len(engine.bundles),
+        "price_points": price_points,
+        "evaluated_points": segments * len(engine.bundles) * price_points,
+        "solve_seconds_best": round(min(timings), 4),
+        "solve_seconds_median": round(sorted(timings)[len(timings) // 2], 4),
+        "quotes_seconds": round(quote_seconds, 4),
+        "feasible_share": round(float(result["feasible"].mean()), 3)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=500)
+    parser.add_argument("--price-points", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.segments, args.price_points, args.repeats), ensure_ascii=False, indent=2))
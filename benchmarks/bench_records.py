@@ -0,0 +1,99 @@
+"""
+流程记录内存与耗时基准
+对比执行阶段以嵌套字典与__slots__记录(modules.records)表示意向客户、跟进记录与阶段推进时的
+构建耗时、峰值内存(tracemalloc)以及按键读取、JSON序列化的耗时
+用法: python -m benchmarks.bench_records --rows 100000 1000000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from modules.records import Channel, Interaction, PotentialClient, Stage, StageProgress, to_dicts
+
+CHANNELS = ["行业展会", "垂直平台", "国际展会"]
+STAGES = [Stage.INITIAL_CONTACT.value, Stage.NEEDS_ANALYSIS.value, Stage.SOLUTION_CONFIRMED.value]
+
+
+def build_dicts(rows):
+    clients, records, progress = [], [], []
+    for i in range(rows):
+        name = f"客户{i}"
+        clients.append({"name": name, "contact": "张经理", "interest": "技术合规方案",
+                        "channel": CHANNELS[i % 3], "type": "国企"})
+        records.append({"client": name, "contact": "张经理", "date": "2025-10-26",
+                        "interaction": "初次接触，讨论技术合规方案", "outcome": "初步意向"})
+        progress.append({"client": name, "current_stage": STAGES[i % 3], "next_milestone": "方案确认"})
+    return clients, records, progress
+
+
+def build_records(rows):
+    channels = [Channel(channel) for channel in CHANNELS]
+    stages = list(Stage)[:3]
+    clients, records, progress = [], [], []
+    for i in range(rows):
+        name = f"客户{i}"
+        clients.append(PotentialClient(name, "张经理", "技术合规方案", channels[i % 3], "国企"))
+        records.append(Interaction(name, "张经理", "2025-10-26", "初次接触，讨论技术合规方案", "初步意向"))
+        progress.append(StageProgress(name, stages[i % 3], Stage.SOLUTION_CONFIRMED))
+    return clients, records, progress
+
+
+def measure(builder, rows, attribute_access=False):
+    gc.collect()
+    start = time.perf_counter()
+    clients, records, progress = builder(rows)
+    build_seconds = time.perf_counter() - start
+    del clients, records, progress
+
+    # 峰值内存单独构建一次测量，tracemalloc本身会拖慢构建
+    gc.collect()
+    tracemalloc.start()
+    clients, records, progress = builder(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    confirmed = sum(1 for item in progress if item["current_stage"] == "方案确认")
+    by_channel = {}
+    for client in clients:
+        by_channel[client["channel"]] = by_channel.get(client["channel"], 0) + 1
+    read_seconds = time.perf_counter() - start
+    assert confirmed == sum(1 for i in range(rows) if i % 3 == 2) and len(by_channel) == 3
+
+    start = time.perf_counter()
+    json.dumps(to_dicts(records[:10_000]), ensure_ascii=False)
+    dump_seconds = time.perf_counter() - start
+    result = {
+        "build_ms": round(build_seconds * 1000, 1),
+        "peak_mb": round(peak / 2 ** 20, 1),
+        "bytes_per_row": round(peak / rows),
+        "read_by_key_ms": round(read_seconds * 1000, 1),
+        "dump_10k_ms": round(dump_seconds * 1000, 1)
+    }
+    if attribute_access:
+        start = time.perf_counter()
+        sum(1 for item in progress if item.current_stage is Stage.SOLUTION_CONFIRMED)
+        for client in clients:
+            by_channel[client.channel] += 1
+        result["read_by_attribute_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def run(rows_list=(100_000,)):
+    results = []
+    for rows in rows_list:
+        dicts = measure(build_dicts, rows)
+        records = measure(build_records, rows, attribute_access=True)
+        results.append({"rows": rows, "dict": dicts, "records": records,
+                        "memory_ratio": round(records["peak_mb"] / dicts["peak_mb"], 3)})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000])
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows), ensure_ascii=False, indent=2))
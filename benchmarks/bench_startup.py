@@ -0,0 +1,66 @@
+"""
+包启动与对象构造开销基准
+在全新子进程中测量导入包及各入口模块的冷启动耗时，并对比每次调用都构造
+LLMOrchestrator/PromptEngineeringManager与复用服务容器共享实例的开销
+用法: python -m benchmarks.bench_startup --runs 15 --calls 20000
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+COLD_IMPORTS = (
+    "modules",
+    "modules.industrial_marketing_system",
+    "modules.strategy_insight",
+    "modules.llm_orchestrator",
+    "modules.service",
+)
+
+
+def cold_import_ms(module, runs=15):
+    """子进程中导入指定模块的耗时中位数(毫秒)，不含解释器自身启动"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        samples.append(float(output) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def per_call_us(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return round((time.perf_counter() - start) / calls * 1e6, 3)
+
+
+def run(runs=15, calls=20000):
+    from modules.llm_orchestrator import LLMOrchestrator
+    from modules.prompt_manager import PromptEngineeringManager
+    from modules.services import get_services
+
+    services = get_services()
+
+    def construct():
+        return LLMOrchestrator(), PromptEngineeringManager()
+
+    def shared():
+        return services.orchestrator, services.prompt_manager
+
+    return {
+        "cold_import_ms": {module: cold_import_ms(module, runs) for module in COLD_IMPORTS},
+        "construct_per_call_us": per_call_us(construct, calls),
+        "shared_per_call_us": per_call_us(shared, calls)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs, args.calls), ensure_ascii=False, indent=2))
@@ -0,0 +1,96 @@
+"""
+传输层连接复用基准
+对本地模拟大模型HTTP桩服务发起并发请求，对比每次请求新建连接与连接池复用(同步线程/asyncio)的吞吐与延迟
+用法: python -m benchmarks.bench_transport --requests 2000 --concurrency 16 --pool-size 8
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from modules.mock_provider import SimulatedProvider, serve_http
+from modules.transport import AsyncConnectionPool, ConnectionPool
+
+BODY = json.dumps({"task_type": "content_creation", "messages": [{"role": "user", "content": "生成技术方案"}]},
+                  ensure_ascii=False).encode("utf-8")
+
+
+def _summary(name, latencies, elapsed, stats=None):
+    latencies = sorted(latencies)
+    result = {
+        "mode": name,
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 3)
+    }
+    if stats is not None:
+        result["connections_created"] = stats["connections_created"]
+        result["pool_waits"] = stats["pool_waits"]
+    return result
+
+
+def run_sync(url, requests, concurrency, pool=None):
+    """pool为None时每个请求新建连接"""
+    parts = urlsplit(url)
+
+    def call(_):
+        start = time.perf_counter()
+        if pool is not None:
+            pool.request("POST", url, body=BODY)
+        else:
+            connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+            connection.request("POST", parts.path, body=BODY, headers={"Connection": "close"})
+            connection.getresponse().read()
+            connection.close()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(call, range(requests)))
+    return latencies, time.perf_counter() - start
+
+
+async def run_async(url, requests, concurrency, pool_size):
+    pool = AsyncConnectionPool(max_connections_per_endpoint=pool_size)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call():
+        async with semaphore:
+            start = time.perf_counter()
+            await pool.request("POST", url, body=BODY)
+            return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(call() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    await pool.close()
+    return latencies, elapsed, pool.stats
+
+
+def run(requests=2000, concurrency=16, pool_size=8):
+    server = serve_http(SimulatedProvider(time_scale=0), port=0)
+    url = f"http://127.0.0.1:{server.server_port}/v1/chat/completions"
+    try:
+        results = [_summary("sync_new_connection", *run_sync(url, requests, concurrency))]
+        pool = ConnectionPool(max_connections_per_endpoint=pool_size)
+        results.append(_summary("sync_pooled", *run_sync(url, requests, concurrency, pool), pool.stats))
+        pool.close()
+        latencies, elapsed, stats = asyncio.run(run_async(url, requests, concurrency, pool_size))
+        results.append(_summary("async_pooled", latencies, elapsed, stats))
+    finally:
+        server.shutdown()
+    return {"requests": requests, "concurrency": concurrency, "pool_size": pool_size, "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--pool-size", type=int, default=8)
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests, args.concurrency, args.pool_size), ensure_ascii=False, indent=2))
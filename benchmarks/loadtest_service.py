@@ -0,0 +1,139 @@
+"""
+营销活动服务压测
+在进程内启动CampaignService(大模型调用走SimulatedProvider，可注入延迟、错误与限流)，
+并发提交活动任务并订阅SSE进度，统计提交延迟、首个阶段事件延迟、端到端耗时与吞吐
+用法: python -m benchmarks.loadtest_service --jobs 200 --concurrency 20 --workers 4 \
+          --llm-latency-ms 800 --rate-limit-rate 0.05 --time-scale 0.01
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+
+from modules.industrial_marketing_system import SAMPLE_CAMPAIGN
+from modules.job_queue import JobQueue
+from modules.llm_orchestrator import set_default_provider
+from modules.mock_provider import SimulatedProvider
+from modules.service import CampaignService
+
+
+async def http_request(host, port, method, path, body=None):
+    """最小HTTP客户端，返回(状态码, 响应体)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    data = json.dumps(body, ensure_ascii=False).encode("utf-8") if body is not None else b""
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(data)}\r\n\r\n").encode("latin-1") + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), payload
+
+
+async def stream_events(host, port, path):
+    """读取SSE事件流直至连接关闭，产出(事件名, 到达时间)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: text/event-stream\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    await reader.readuntil(b"\r\n\r\n")
+    events = []
+    async for line in reader:
+        if line.startswith(b"event: "):
+            events.append((line[7:].strip().decode("utf-8"), time.perf_counter()))
+    writer.close()
+    return events
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else None
+
+
+async def run_async(jobs, concurrency, workers):
+    db_path = os.path.join(tempfile.mkdtemp(prefix="loadtest_"), "jobs.db")
+    service = CampaignService(JobQueue(db_path), workers=workers, port=0)
+    await service.start()
+    host, port = service.host, service.port
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def client():
+        async with semaphore:
+            start = time.perf_counter()
+            status, body = await http_request(host, port, "POST", "/jobs", SAMPLE_CAMPAIGN)
+            submitted = time.perf_counter()
+            if status != 202:
+                samples.append({"ok": False})
+                return
+            job_id = json.loads(body)["job_id"]
+            events = await stream_events(host, port, f"/jobs/{job_id}/events")
+            stage_times = [t for name, t in events if name == "stage"]
+            samples.append({
+                "ok": bool(events) and events[-1][0] == "succeeded",
+                "submit": submitted - start,
+                "first_stage": (stage_times[0] - start) if stage_times else None,
+                "total": events[-1][1] - start if events else None
+            })
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(jobs)))
+    elapsed = time.perf_counter() - start
+    status, body = await http_request(host, port, "GET", "/health")
+    await service.close()
+
+    ok = [s for s in samples if s["ok"]]
+
+    def summary(key):
+        values = [s[key] for s in ok if s[key] is not None]
+        return {"p50_ms": round(percentile(values, 0.5) * 1000, 1), "p95_ms": round(percentile(values, 0.95) * 1000, 1),
+                "max_ms": round(max(values) * 1000, 1)} if values else None
+
+    return {
+        "jobs": jobs,
+        "concurrency": concurrency,
+        "workers": workers,
+        "succeeded": len(ok),
+        "failed": len(samples) - len(ok),
+        "seconds": round(elapsed, 3),
+        "jobs_per_sec": round(jobs / elapsed, 2),
+        "submit_latency": summary("submit"),
+        "first_stage_latency": summary("first_stage"),
+        "end_to_end": summary("total"),
+        "queue": json.loads(body)["jobs"] if status == 200 else None
+    }
+
+
+def run(jobs=200, concurrency=20, workers=4, llm_latency_ms=800.0, error_rate=0.0, rate_limit_rate=0.0,
+        seed=0, time_scale=0.0):
+    """time_scale为0时模拟提供商只统计延迟不实际等待，用于测量编排本身的开销"""
+    provider = SimulatedProvider(seed=seed, latency_ms=llm_latency_ms, error_rate=error_rate,
+                                 rate_limit_rate=rate_limit_rate, time_scale=time_scale)
+    set_default_provider(provider)
+    try:
+        # 工作流各阶段的日志输出不计入压测结果
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = asyncio.run(run_async(jobs, concurrency, workers))
+    finally:
+        set_default_provider(None)
+    result["llm"] = dict(provider.stats, simulated_seconds=round(provider.stats["simulated_seconds"], 3))
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-scale", type=float, default=0.0, help="模拟延迟的实际等待比例，1为真实时长")
+    args = parser.parse_args()
+    print(json.dumps(run(args.jobs, args.concurrency, args.workers, args.llm_latency_ms, args.error_rate,
+                         args.rate_limit_rate, args.seed, args.time_scale), ensure_ascii=False, indent=2))
@@ -1,172 +0,0 @@
-"""
-工业执行、互动与追踪模块
-实现多渠道发布、客户互动跟进和销售过程推进功能
-"""
-
-class Execution:
-    def __init__(self):
-        self.marketing_kit = None
-        self.channel_feedbacks = []
-        self.interaction_records = []
-        self.sales_progress = []
-    
-    def publish_to_channels(self, marketing_kit):
-        """
-        工业多渠道发布
-        输入: 工业营销弹药包
-        输出: 渠道反馈与意向客户
-        """
-        self.marketing_kit = marketing_kit
-        feedbacks = []
-        potential_clients = []
-        
-        # 获取技术物料和渠道策略
-        materials = marketing_kit.get("technical_materials", {}).get("materials", [])
-        channel_strategies = marketing_kit.get("channel_strategies", {}).get("channel_mix", [])
-        
-        # 执行渠道发布
-        for strategy in channel_strategies:
-            for channel in strategy["channels"]:
-                # 模拟发布到不同渠道
-                if channel == "行业展会":
-                    feedbacks.append({
-                        "channel": channel,
-                        "response": "展位咨询量: 25人",
-                        "effectiveness": "高"
-                    })
-                    potential_clients.append({
-                        "name": "XX制造企业",
-                        "contact": "张经理",
-                        "interest": "技术合规方案"
-                    })
-                elif channel == "垂直平台":
-                    feedbacks.append({
-                        "channel": channel,
-                        "response": "点击量: 320次",
-                        "effectiveness": "中"
-                    })
-                    potential_clients.append({
-                        "name": "YY科技公司",
-                        "contact": "李总监",
-                        "interest": "ROI分析"
-                    })
-                elif channel == "国际展会":
-                    feedbacks.append({
-                        "channel": channel,
-                        "response": "国际客户咨询: 15家",
-                        "effectiveness": "高"
-                    })
-                    potential_clients.append({
-                        "name": "ZZ国际集团",
-                        "contact": "John Smith",
-                        "interest": "全球技术标准"
-                    })
-        
-        self.channel_feedbacks = {
-            "feedbacks": feedbacks,
-            "potential_clients": potential_clients
-        }
-        
-        return self.channel_feedbacks
-    
-    def interact_and_follow_up(self, potential_clients):
-        """
-        工业客户互动与跟进
-        输入: 意向客户列表
-        输出: 结构化跟进记录与下次动作
-        """
-        records = []
-        next_actions = []
-        
-        # 使用营销弹药包中的话术进行互动
-        sales_scripts = self.marketing_kit.get("sales_scripts", {}).get("scenarios", [])
-        
-        for client in potential_clients:
-            # 记录初次接触
-            record = {
-                "client": client["name"],
-                "contact": client["contact"],
-                "date": "2025-10-26",
-                "interaction": f"初次接触，讨论{client['interest']}",
-                "outcome": "初步意向"
-            }
-            records.append(record)
-            
-            # 规划下一步行动
-            if "技术合规" in client["interest"]:
-                next_actions.append({
-                    "client": client["name"],
-                    "action": "安排技术团队演示",
-                    "deadline": "2025-11-02",
-                    "priority": "高"
-                })
-            elif "ROI" in client["interest"]:
-                next_actions.append({
-                    "client": client["name"],
-                    "action": "发送详细ROI分析报告",
-                    "deadline": "2025-10-28",
-                    "priority": "中"
-                })
-            elif "全球技术" in client["interest"]:
-                next_actions.append({
-                    "client": client["name"],
-                    "action": "安排国际团队视频会议",
-                    "deadline": "2025-10-30",
-                    "priority": "高"
-                })
-        
-        self.interaction_records = {
-            "records": records,
-            "next_actions": next_actions
-        }
-        
-        return self.interaction_records
-    
-    def track_sales_progress(self, interaction_records):
-        """
-        工业销售过程推进
-        输入: 跟进记录
-        输出: 客户意向度变化与阶段推进记录
-        """
-        interest_changes = []
-        stage_progress = []
-        
-        # 分析跟进记录，跟踪销售进展
-        for record in interaction_records.get("records", []):
-            client_name = record["client"]
-            
-            # 模拟意向度变化 (1-10, 10为最高)
-            interest_level = 5  # 初始意向度
-            if "技术团队演示" in str(interaction_records.get("next_actions", [])):
-                interest_level = 7
-            if "ROI分析报告" in record["interaction"]:
-                interest_level = 6
-            if "视频会议" in record["interaction"]:
-                interest_level = 8
-            
-            interest_changes.append({
-                "client": client_name,
-                "interest_level": interest_level,
-                "trend": "上升" if interest_level > 5 else "稳定"
-            })
-            
-            # 跟踪销售阶段
-            if interest_level >= 8:
-                stage = "方案确认"
-            elif interest_level >= 6:
-                stage = "需求分析"
-            else:
-                stage = "初步接触"
-            
-            stage_progress.append({
-                "client": client_name,
-                "current_stage": stage,
-                "next_milestone": "签订合同" if stage == "方案确认" else "方案确认"
-            })
-        
-        self.sales_progress = {
-            "interest_changes": interest_changes,
-            "stage_progress": stage_progress
-        }
-        
-        return self.sales_progress
\ No newline at end of file
@@ -1,39 +0,0 @@
-"""
-工业营销自动化系统主程序
-实现从战略洞察到执行追踪的全流程自动化
-"""
-
-class IndustrialMarketingSystem:
-    def __init__(self):
-        self.modules = {
-            "strategy_insight": None,
-            "planning": None,
-            "content_creation": None,
-            "execution": None,
-            "analysis": None
-        }
-        
-    def run_workflow(self):
-        """执行完整的工业营销工作流程"""
-        print("工业营销自动化系统启动...")
-        
-        # 第一步：工业战略洞察与定向
-        strategy_brief = self.strategy_insight()
-        
-        # 第二步：工业策略与计划制定
-        marketing_plan = self.planning(strategy_brief)
-        
-        # 第三步：工业内容创造与武装
-        marketing_kit = self.content_creation(marketing_plan)
-        
-        # 第四步：工业执行、互动与追踪
-        execution_results = self.execution(marketing_kit)
-        
-        # 第五步：工业复盘、归因与进化
-        self.analysis(execution_results)
-        
-        print("工业营销工作流程执行完成")
-
-if __name__ == "__main__":
-    system = IndustrialMarketingSystem()
-    system.run_workflow()
\ No newline at end of file
@@ -1,99 +0,0 @@
-"""
-大模型调度器模块
-实现多模型调度和智能任务分发
-"""
-
-from typing import Dict, Any, Optional
-import time
-import hashlib
-import json
-
-class LLMOrchestrator:
-    def __init__(self):
-        # 提供商配置 (实际使用时替换XXX为真实值)
-        self.providers = {
-            "wenxin": {
-                "api_key": "XXX",
-                "endpoint": "https://aip.baidubce.com/xxx",
-                "models": ["ERNIE-Bot", "ERNIE-Bot-turbo"],
-                "priority": 1
-            },
-            "openai": {
-                "api_key": "XXX",
-                "endpoint": "https://api.openai.com/v1",
-                "models": ["gpt-4", "gpt-3.5-turbo"],
-                "priority": 2
-            }
-        }
-        
-        # 缓存配置
-        self.cache_enabled = True
-        self.cache: Dict[str, Any] = {}
-        
-        # 性能统计
-        self.stats = {
-            "total_requests": 0,
-            "successful_requests": 0,
-            "total_tokens": 0
-        }
-
-    def _get_cache_key(self, provider: str, model: str, prompt: str) -> str:
-        """生成缓存键"""
-        key_str = f"{provider}:{model}:{prompt}"
-        return hashlib.md5(key_str.encode()).hexdigest()
-
-    def _call_provider_api(self, provider: str, model: str, prompt: str, **kwargs) -> Any:
-        """调用具体提供商API (模拟实现)"""
-        # 这里应该是实际的API调用代码
-        # 模拟返回结果
-        return {
-            "response": f"这是{provider} {model}对提示词'{prompt[:20]}...'的模拟响应",
-            "tokens_used": 100,
-            "success": True
-        }
-
-    def dispatch_request(self, task_type: str, prompt: str, **kwargs) -> Dict[str, Any]:
-        """
-        智能任务分发
-        :param task_type: 任务类型 (strategy/creation/analysis等)
-        :param prompt: 提示词
-        :return: 响应结果
-        """
-        start_time = time.time()
-        self.stats["total_requests"] += 1
-        
-        # 1. 检查缓存
-        cache_key = self._get_cache_key("wenxin", "ERNIE-Bot", prompt)
-        if self.cache_enabled and cache_key in self.cache:
-            return self.cache[cache_key]
-        
-        # 2. 根据任务类型选择模型
-        provider_config = self.providers["wenxin"]  # 默认使用文心
-        
-        # 3. 调用API
-        try:
-            result = self._call_provider_api(
-                provider="wenxin",
-                model="ERNIE-Bot",
-                prompt=prompt,
-                **kwargs
-            )
-            
-            if result["success"]:
-                self.stats["successful_requests"] += 1
-                self.stats["total_tokens"] += result.get("tokens_used", 0)
-                
-                # 缓存结果
-                if self.cache_enabled:
-                    self.cache[cache_key] = result
-                
-                return result
-            else:
-                raise Exception("API调用返回失败")
-                
-        except Exception as e:
-            # TODO: 实现降级逻辑
-            raise Exception(f"API调用失败: {str(e)}")
-        finally:
-            elapsed = time.time() - start_time
-            print(f"请求完成，耗时: {elapsed:.2f}s")
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""
+工业营销自动化系统核心模块包
+包含五大功能模块：
+1. strategy_insight - 战略洞察与定向
+2. planning - 策略与计划制定
+3. content_creation - 内容创造与武装
+4. execution - 执行、互动与追踪
+5. analysis - 复盘、归因与进化
+
+导入本包不会加载任何子模块，常用类在首次访问时才导入(如modules.StrategyInsight)
+"""
+
+import importlib
+
+# 对外导出名 -> 所在子模块
+_EXPORTS = {
+    "IndustrialMarketingSystem": "industrial_marketing_system",
+    "StrategyInsight": "strategy_insight",
+    "Planning": "planning",
+    "ContentCreation": "content_creation",
+    "Execution": "execution",
+    "Analysis": "analysis",
+    "LLMOrchestrator": "llm_orchestrator",
+    "PromptEngineeringManager": "prompt_manager",
+    "ServiceContainer": "services",
+    "get_services": "services",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    # 缓存到包命名空间，之后的访问不再经过__getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
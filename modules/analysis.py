@@ -0,0 +1,278 @@
+"""
+工业复盘、归因与进化模块
+实现数据分析、成功要素提取和失败原因诊断功能
+"""
+
+import json
+
+from modules.tracing import traced
+
+
+class Analysis:
+    def __init__(self, knowledge_store=None, orchestrator=None, prompt_manager=None):
+        from modules.rolling_metrics import RollingMetrics
+        from modules.services import get_services
+
+        self.sales_data = None
+        self.key_metrics = {}
+        self.success_factors = []
+        self.failure_causes = []
+        # 增量聚合层：执行事件到达即更新，分析时直接读取汇总结果
+        self.metrics = RollingMetrics()
+        # 持久化知识库，首次写入时按默认路径创建
+        self.knowledge_store = knowledge_store
+        # 复用进程内共享的大模型调度器与提示词管理器
+        self.orchestrator = orchestrator or get_services().orchestrator
+        self.prompt_manager = prompt_manager or get_services().prompt_manager
+    
+    @traced()
+    def record_execution_events(self, potential_clients=(), channel_feedbacks=(), stage_progress=(),
+                                client_entities=None):
+        """
+        接入新到达的执行事件
+        输入: 新增意向客户、渠道反馈与阶段推进记录，以及可选的实体消解结果(客户名称 -> 实体键)
+        """
+        if client_entities:
+            self.metrics.add_client_entities(client_entities)
+        for client in potential_clients:
+            self.metrics.record_client(client)
+        for feedback in channel_feedbacks:
+            self.metrics.record_feedback(feedback)
+        for progress in stage_progress:
+            self.metrics.record_stage(progress)
+    
+    @traced()
+    def analyze_performance(self, sales_data=None):
+        """
+        工业数据汇总与归因分析
+        输入: 工业营销全流程数据(为空时仅使用已接入的执行事件)
+        输出: 成功或失败判断
+        """
+        if sales_data is not None:
+            self.sales_data = sales_data
+            self.metrics.ingest(sales_data)
+        elif self.sales_data is None:
+            self.sales_data = {}
+        
+        conversion_rate = self.metrics.conversion_rate
+        
+        # 判断成功标准 (假设转化率>30%为成功)
+        success = conversion_rate > 0.3
+        
+        self.key_metrics = {
+            "total_clients": self.metrics.total_clients,
+            "converted_clients": self.metrics.converted_clients,
+            "conversion_rate": round(conversion_rate, 2),
+            "channel_performance": self.metrics.channel_performance(),
+            "channel_window_rates": self.metrics.window_rates("channel"),
+            "client_type_window_rates": self.metrics.window_rates("client_type"),
+            "success": success
+        }
+        
+        return self.key_metrics
+    
+    @traced()
+    def identify_success_factors(self):
+        """
+        工业成功要素分析
+        输出: 成功关键因素
+        """
+        if self.sales_data is None:
+            raise ValueError("需要先执行数据分析")
+        
+        factors = []
+        recommendations = []
+        
+        # 渠道与客户类型的显著性检验，只引用有统计支持的要素
+        from modules.channel_stats import compare_stats
+        
+        channel_stats = compare_stats(self.metrics.channel_performance())
+        supported_channels = [s for s in channel_stats if s["direction"] == "高"]
+        if supported_channels:
+            best_channel = max(supported_channels, key=lambda s: s["wilson_low"])
+            factors.append({
+                "factor": f"高效渠道: {best_channel['segment']}",
+                "impact": f"转化率{best_channel['rate']:.0%} "
+                          f"(95%区间{best_channel['wilson_low']:.0%}-{best_channel['wilson_high']:.0%}，"
+                          f"高于其他渠道{best_channel['uplift']:.0%})"
+            })
+            recommendations.append(f"增加{best_channel['segment']}渠道的投入")
+        
+        client_type_stats = compare_stats(self.metrics.client_type_stats)
+        for segment in client_type_stats:
+            if segment["direction"] == "高":
+                factors.append({
+                    "factor": f"精准客户定位: {segment['segment']}",
+                    "impact": f"转化率{segment['rate']:.0%} "
+                              f"(95%区间{segment['wilson_low']:.0%}-{segment['wilson_high']:.0%})"
+                })
+                recommendations.append(f"向{segment['segment']}客户倾斜资源")
+        
+        # 分析内容效果
+        content_types = self.sales_data.get("content_types", [])
+        if content_types:
+            factors.append({
+                "factor": "定制化内容",
+                "impact": "提升客户参与度"
+            })
+            recommendations.append("扩展高互动内容类型")
+        
+        self.success_factors = {
+            "factors": factors,
+            "recommendations": recommendations,
+            "segment_stats": {
+                "channels": channel_stats,
+                "client_types": client_type_stats
+            }
+        }
+        
+        return self.success_factors
+    
+    @traced()
+    def diagnose_failure_causes(self):
+        """
+        工业失败根因分析
+        输出: 失败根本原因
+        """
+        if self.sales_data is None:
+            raise ValueError("需要先执行数据分析")
+        
+        from modules.failure_digest import build_failure_digest
+        
+        prompt_manager = self.prompt_manager
+        
+        # 预聚合为固定规模的统计摘要，提示词长度不随客户数/事件数增长
+        digest = build_failure_digest(self.metrics)
+        
+        # 构建提示词
+        prompt = prompt_manager.render_template("failure_analysis", {
+            "total_clients": str(self.metrics.total_clients),
+            "conversion_rate": f"{self.metrics.conversion_rate:.0%}",
+            "digest": json.dumps(digest, ensure_ascii=False, separators=(",", ":"))
+        })
+        
+        try:
+            # 调用大模型分析
+            response = self.orchestrator.dispatch_request(
+                task_type="failure_analysis",
+                prompt=prompt
+            )
+            
+            if prompt_manager.validate_response_format(response["response"], "json"):
+                result = json.loads(response["response"])
+                self.failure_causes = result
+                return result
+            else:
+                raise ValueError("大模型返回格式无效")
+                
+        except Exception as e:
+            print(f"大模型分析失败，使用备用逻辑: {str(e)}")
+            # 降级方案：使用原逻辑
+            return self._fallback_failure_analysis()
+    
+    def _fallback_failure_analysis(self):
+        """备用失败分析逻辑"""
+        root_causes = []
+        improvements = []
+        
+        from modules.channel_stats import compare_stats
+        
+        underperforming = [s for s in compare_stats(self.metrics.channel_performance())
+                           if s["direction"] == "低"]
+        if underperforming:
+            worst_channel = min(underperforming, key=lambda s: s["wilson_high"])
+            root_causes.append({
+                "cause": f"低效渠道: {worst_channel['segment']}",
+                "evidence": f"转化率仅{worst_channel['rate']:.0%} "
+                            f"(95%区间{worst_channel['wilson_low']:.0%}-{worst_channel['wilson_high']:.0%}，"
+                            f"显著低于其他渠道)"
+            })
+            improvements.append(f"优化或淘汰{worst_channel['segment']}渠道")
+        
+        # 阶段分布由聚合层维护，无需重新遍历销售进展
+        stuck_stages = {stage: count for stage, count in self.metrics.stage_counts.items()
+                        if stage not in ["方案确认", "签订合同"]}
+        if stuck_stages:
+            main_stuck_stage = max(stuck_stages.items(), key=lambda x: x[1])
+            root_causes.append({
+                "cause": f"销售漏斗阻塞: {main_stuck_stage[0]}阶段",
+                "evidence": f"{main_stuck_stage[1]}个客户在此阶段停滞"
+            })
+            improvements.append(f"加强{main_stuck_stage[0]}阶段的销售支持")
+        
+        content_issues = self.metrics.low_effectiveness_channels()
+        if content_issues:
+            root_causes.append({
+                "cause": "内容效果不佳",
+                "evidence": f"在{', '.join(content_issues)}渠道表现差"
+            })
+            improvements.append("重新设计低效渠道的内容策略")
+        
+        self.failure_causes = {
+            "root_causes": root_causes,
+            "improvements": improvements
+        }
+        
+        return self.failure_causes
+    
+    @traced()
+    def optimize_knowledge_base(self):
+        """
+        工业策略与知识库优化
+        输出: 迭代成果
+        """
+        updated_strategies = []
+        new_templates = []
+        experience_entries = []
+        
+        # 更新策略
+        for factor in self.success_factors.get("factors", []):
+            updated_strategies.append({
+                "strategy": factor["factor"],
+                "update": f"强化{factor['factor']}的应用",
+                "reason": factor["impact"]
+            })
+        
+        # 创建新模板
+        for cause in self.failure_causes.get("root_causes", []):
+            new_templates.append({
+                "template": f"{cause['cause']}应对方案",
+                "content": f"针对{cause['cause']}的标准处理流程",
+                "based_on": cause["evidence"]
+            })
+        
+        # 添加经验条目
+        if self.key_metrics.get("success"):
+            experience_entries.append({
+                "title": "成功案例",
+                "content": "详细记录本次营销活动的成功实践",
+                "tags": ["高效渠道", "精准定位"]
+            })
+        else:
+            experience_entries.append({
+                "title": "改进案例",
+                "content": "记录本次营销活动的教训和改进措施",
+                "tags": ["渠道优化", "流程改进"]
+            })
+        
+        # 写入持久化知识库，重复条目只累计出现次数
+        if self.knowledge_store is None:
+            from modules.knowledge_store import KnowledgeStore
+            self.knowledge_store = KnowledgeStore()
+        
+        stored = {
+            "strategy": self.knowledge_store.add_entries("strategy", (
+                {"title": s["strategy"], "content": s["update"], "meta": {"reason": s["reason"]}}
+                for s in updated_strategies)),
+            "template": self.knowledge_store.add_entries("template", (
+                {"title": t["template"], "content": t["content"], "meta": {"based_on": t["based_on"]}}
+                for t in new_templates)),
+            "experience": self.knowledge_store.add_entries("experience", experience_entries)
+        }
+        
+        return {
+            "updated_strategies": updated_strategies,
+            "new_templates": new_templates,
+            "experience_entries": experience_entries,
+            "stored": stored
+        }
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""
+渠道预算分配模块
+按历史转化率与获客成本，在总预算约束下求解各渠道最优投放额(支持批量活动)
+"""
+
+import heapq
+from typing import Dict, Any, Iterable, List, Optional
+
+import numpy as np
+
+# 各渠道默认单条线索成本(元)与可触达线索上限
+DEFAULT_CHANNEL_COSTS: Dict[str, Dict[str, float]] = {
+    "行业展会": {"cost_per_lead": 3000, "lead_capacity": 80},
+    "政府对接会": {"cost_per_lead": 5000, "lead_capacity": 30},
+    "行业协会": {"cost_per_lead": 2000, "lead_capacity": 50},
+    "垂直平台": {"cost_per_lead": 600, "lead_capacity": 400},
+    "私域社群": {"cost_per_lead": 300, "lead_capacity": 200},
+    "线上研讨会": {"cost_per_lead": 800, "lead_capacity": 250},
+    "国际展会": {"cost_per_lead": 8000, "lead_capacity": 40},
+    "英文技术社区": {"cost_per_lead": 1200, "lead_capacity": 150},
+    "全球合作伙伴网络": {"cost_per_lead": 4000, "lead_capacity": 60}
+}
+DEFAULT_CHANNEL_COST = {"cost_per_lead": 1500, "lead_capacity": 100}
+# 无历史数据时的先验转化率
+DEFAULT_CONVERSION_RATE = 0.1
+
+
+def expected_conversions(spend, rate, cost_per_lead, capacity):
+    """
+    渠道响应曲线(边际收益递减)
+    转化数 = 转化率 × 线索上限 × (1 - exp(-投入 / (单条成本 × 线索上限)))
+    """
+    scale = np.asarray(cost_per_lead) * np.asarray(capacity)
+    return np.asarray(rate) * np.asarray(capacity) * (1 - np.exp(-np.asarray(spend) / scale))
+
+
+def channel_inputs(channels: Iterable[str], channel_performance: Optional[Dict[str, Dict[str, int]]] = None,
+                   cost_overrides: Optional[Dict[str, Dict[str, float]]] = None) -> List[Dict[str, Any]]:
+    """
+    由Analysis输出的渠道表现构造分配输入
+    转化率取Beta(1,1)先验下的后验均值，避免小样本渠道出现0或100%
+    """
+    from modules.channel_stats import beta_posterior
+
+    channel_performance = channel_performance or {}
+    inputs = []
+    for channel in dict.fromkeys(channels):
+        costs = dict(DEFAULT_CHANNEL_COSTS.get(channel, DEFAULT_CHANNEL_COST), **(cost_overrides or {}).get(channel, {}))
+        stats = channel_performance.get(channel)
+        if stats and stats["leads"]:
+            rate = float(beta_posterior(min(stats["conversions"], stats["leads"]), stats["leads"])[0])
+        else:
+            rate = DEFAULT_CONVERSION_RATE
+        inputs.append({"channel": channel, "conversion_rate": rate, **costs})
+    return inputs
+
+
+class BudgetAllocator:
+    def __init__(self, tolerance: float = 1e-9, max_iter: int = 100):
+        """
+        :param tolerance: 对偶变量二分搜索的相对精度
+        :param max_iter: 二分搜索最大迭代次数
+        """
+        self.tolerance = tolerance
+        self.max_iter = max_iter
+
+    def allocate_batch(self, rates, cost_per_lead, capacity, budgets, mask=None) -> Dict[str, np.ndarray]:
+        """
+        批量求解: C个活动 × K个渠道
+        响应曲线为凹函数，最优解满足各渠道边际收益相等(注水法)：
+        投入 = 单条成本 × 上限 × ln(转化率 / (单条成本 × λ))，对λ做向量化二分
+        :param mask: (C, K)布尔数组，标记活动实际拥有的渠道
+        :return: spend/leads/conversions/marginal_return，形状均为(C, K)
+        """
+        rates = np.asarray(rates, dtype=float)
+        cpl = np.asarray(cost_per_lead, dtype=float)
+        capacity = np.asarray(capacity, dtype=float)
+        budgets = np.asarray(budgets, dtype=float)
+        mask = np.ones_like(rates, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+
+        scale = cpl * capacity
+        # 边际收益 = rate/cpl × exp(-s/scale)，投入为0时取最大值
+        initial_marginal = np.where(mask, rates / cpl, 0.0)
+
+        def spend_at(lam):
+            with np.errstate(divide="ignore"):
+                spend = scale * np.log(initial_marginal / lam[:, None])
+            return np.where(mask & (initial_marginal > lam[:, None]), spend, 0.0)
+
+        low = np.zeros(len(budgets))
+        high = initial_marginal.max(axis=1)
+        for _ in range(self.max_iter):
+            mid = (low + high) / 2
+            total = spend_at(np.maximum(mid, 1e-300)).sum(axis=1)
+            too_much = total > budgets
+            low = np.where(too_much, mid, low)
+            high = np.where(too_much, high, mid)
+            if np.all(high - low <= self.tolerance * np.maximum(high, 1e-300)):
+                break
+
+        spend = spend_at(np.maximum(high, 1e-300))
+        # 数值误差修正：按比例缩放到预算以内
+        totals = spend.sum(axis=1)
+        spend *= np.where(totals > budgets, budgets / np.maximum(totals, 1e-12), 1.0)[:, None]
+        leads = np.where(mask, capacity * (1 - np.exp(-spend / scale)), 0.0)
+        return {
+            "spend": spend,
+            "leads": leads,
+            "conversions": rates * leads,
+            "marginal_return": np.where(mask, rates / cpl * np.exp(-spend / scale), 0.0)
+        }
+
+    def allocate_campaigns(self, campaigns: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        批量分配多个活动的预算
+        :param campaigns: 每项含budget与channels(channel_inputs格式)
+        """
+        if not campaigns:
+            return []
+        width = max(len(c["channels"]) for c in campaigns)
+        shape = (len(campaigns), max(width, 1))
+        rates, cpl, capacity = np.zeros(shape), np.ones(shape), np.ones(shape)
+        mask = np.zeros(shape, dtype=bool)
+        for i, campaign in enumerate(campaigns):
+            for j, channel in enumerate(campaign["channels"]):
+                rates[i, j] = channel["conversion_rate"]
+                cpl[i, j] = channel["cost_per_lead"]
+                capacity[i, j] = channel["lead_capacity"]
+                mask[i, j] = True
+        budgets = np.array([c["budget"] for c in campaigns], dtype=float)
+        result = self.allocate_batch(rates, cpl, capacity, budgets, mask)
+
+        allocations = []
+        for i, campaign in enumerate(campaigns):
+            allocations.append([
+                {
+                    "channel": channel["channel"],
+                    "budget": round(float(result["spend"][i, j]), 2),
+                    "expected_leads": round(float(result["leads"][i, j]), 1),
+                    "expected_conversions": round(float(result["conversions"][i, j]), 2),
+                    "marginal_return": float(result["marginal_return"][i, j])
+                } for j, channel in enumerate(campaign["channels"])
+            ])
+        return allocations
+
+    def allocate(self, channels: List[Dict[str, Any]], budget: float) -> List[Dict[str, Any]]:
+        """单个活动的预算分配"""
+        return self.allocate_campaigns([{"channels": channels, "budget": budget}])[0]
+
+
+def greedy_allocate(channels: List[Dict[str, Any]], budget: float, step: float) -> Dict[str, float]:
+    """
+    贪心边际收益分配(参考解法)
+    每次把一个预算步长投给当前边际转化最高的渠道
+    """
+    spend = {c["channel"]: 0.0 for c in channels}
+
+    def gain(channel, current):
+        args = (channel["conversion_rate"], channel["cost_per_lead"], channel["lead_capacity"])
+        return float(expected_conversions(current + step, *args) - expected_conversions(current, *args))
+
+    heap = [(-gain(c, 0.0), i) for i, c in enumerate(channels)]
+    heapq.heapify(heap)
+    remaining = budget
+    while heap and remaining >= step:
+        _, i = heapq.heappop(heap)
+        channel = channels[i]
+        spend[channel["channel"]] += step
+        remaining -= step
+        heapq.heappush(heap, (-gain(channel, spend[channel["channel"]]), i))
+    return spend
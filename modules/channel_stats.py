@@ -0,0 +1,155 @@
+"""
+渠道统计显著性模块
+批量计算渠道/客户类型转化率的置信区间与提升检验，避免小样本渠道"胜出"
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# 95%双侧置信水平对应的z值
+Z_95 = 1.959963984540054
+
+
+def normal_cdf(x):
+    """标准正态分布函数 (Abramowitz-Stegun 7.1.26 近似，误差<1.5e-7)"""
+    x = np.asarray(x, dtype=float)
+    t_x = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * t_x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-t_x * t_x)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def wilson_interval(successes, trials, z: float = Z_95):
+    """
+    Wilson得分区间
+    :param successes: 转化数数组
+    :param trials: 线索数数组
+    :return: (下界, 上界)，线索数为0时为(0, 1)
+    """
+    successes = np.asarray(successes, dtype=float)
+    trials = np.asarray(trials, dtype=float)
+    n = np.maximum(trials, 1.0)
+    p = successes / n
+    z2 = z * z
+    denominator = 1.0 + z2 / n
+    center = (p + z2 / (2 * n)) / denominator
+    margin = z * np.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / denominator
+    low = np.where(trials > 0, np.clip(center - margin, 0.0, 1.0), 0.0)
+    high = np.where(trials > 0, np.clip(center + margin, 0.0, 1.0), 1.0)
+    return low, high
+
+
+def beta_posterior(successes, trials, prior_alpha: float = 1.0, prior_beta: float = 1.0, z: float = Z_95):
+    """
+    Beta-Binomial共轭后验
+    :return: (后验均值, 后验方差, 可信区间下界, 可信区间上界)，区间取正态近似
+    """
+    alpha = np.asarray(successes, dtype=float) + prior_alpha
+    beta = np.asarray(trials, dtype=float) - np.asarray(successes, dtype=float) + prior_beta
+    total = alpha + beta
+    mean = alpha / total
+    var = alpha * beta / (total * total * (total + 1))
+    std = np.sqrt(var)
+    return mean, var, np.clip(mean - z * std, 0.0, 1.0), np.clip(mean + z * std, 0.0, 1.0)
+
+
+def uplift_test(successes, trials):
+    """
+    每个分组相对其余分组合并后的提升检验(双比例z检验)
+    :return: (提升幅度, z值, 双侧p值)
+    """
+    successes = np.asarray(successes, dtype=float)
+    trials = np.asarray(trials, dtype=float)
+    rest_successes = successes.sum() - successes
+    rest_trials = trials.sum() - trials
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = successes / trials
+        rest_rate = rest_successes / rest_trials
+        pooled = (successes + rest_successes) / (trials + rest_trials)
+        se = np.sqrt(pooled * (1 - pooled) * (1 / trials + 1 / rest_trials))
+        z_score = (rate - rest_rate) / se
+    valid = (trials > 0) & (rest_trials > 0) & (se > 0)
+    uplift = np.where(valid, rate - rest_rate, 0.0)
+    z_score = np.where(valid, z_score, 0.0)
+    p_value = np.where(valid, 2 * (1 - normal_cdf(np.abs(z_score))), 1.0)
+    return uplift, z_score, p_value
+
+
+def benjamini_hochberg(p_value):
+    """
+    Benjamini-Hochberg校正，控制多重比较下的错误发现率
+    :return: 与p_value同序的校正后q值
+    """
+    p_value = np.asarray(p_value, dtype=float)
+    m = len(p_value)
+    if not m:
+        return p_value
+    order = np.argsort(p_value)
+    scaled = p_value[order] * m / np.arange(1, m + 1)
+    # 自大到小取累计最小值，保证q值随p值单调
+    q_sorted = np.minimum(np.minimum.accumulate(scaled[::-1])[::-1], 1.0)
+    q_value = np.empty(m)
+    q_value[order] = q_sorted
+    return q_value
+
+
+def compare_segments(names: Sequence[str], successes, trials,
+                     alpha: float = 0.05, min_trials: int = 10) -> List[Dict]:
+    """
+    一次批量计算所有分组的区间估计与显著性
+    :param names: 分组名称(渠道或客户类型)
+    :param alpha: 错误发现率(BH校正后q值的显著性水平)
+    :param min_trials: 参与显著性判断的最小线索数
+    :return: 每个分组的统计结果，direction为"高"/"低"/None
+    """
+    trials = np.asarray(trials, dtype=float)
+    # 归因口径不同可能导致转化数超过线索数，按线索数截断
+    successes = np.minimum(np.asarray(successes, dtype=float), trials)
+    if not len(names):
+        return []
+
+    rate = successes / np.maximum(trials, 1.0)
+    wilson_low, wilson_high = wilson_interval(successes, trials)
+    post_mean, post_var, _, _ = beta_posterior(successes, trials)
+    uplift, z_score, p_value = uplift_test(successes, trials)
+
+    # 后验概率：该分组转化率高于其余分组合并后的转化率
+    rest_mean, rest_var, _, _ = beta_posterior(successes.sum() - successes, trials.sum() - trials)
+    prob_better = normal_cdf((post_mean - rest_mean) / np.sqrt(post_var + rest_var))
+
+    # 分组可达数千个，逐个按alpha判断会把约alpha比例的无差异分组误判为显著，
+    # 因此只在达到最小线索数的分组内做BH校正后再判断
+    eligible = trials >= min_trials
+    q_value = np.ones(len(names))
+    q_value[eligible] = benjamini_hochberg(p_value[eligible])
+    significant = eligible & (q_value < alpha)
+    direction = np.where(significant & (uplift > 0), 1, np.where(significant & (uplift < 0), -1, 0))
+
+    return [
+        {
+            "segment": name,
+            "leads": int(trials[i]),
+            "conversions": int(successes[i]),
+            "rate": float(rate[i]),
+            "wilson_low": float(wilson_low[i]),
+            "wilson_high": float(wilson_high[i]),
+            "posterior_mean": float(post_mean[i]),
+            "prob_better": float(prob_better[i]),
+            "uplift": float(uplift[i]),
+            "z_score": float(z_score[i]),
+            "p_value": float(p_value[i]),
+            "q_value": float(q_value[i]),
+            "significant": bool(significant[i]),
+            "direction": {1: "高", -1: "低"}.get(int(direction[i]))
+        } for i, name in enumerate(names)
+    ]
+
+
+def compare_stats(stats: Dict[str, Dict[str, int]], **kwargs) -> List[Dict]:
+    """对{分组: {"leads", "conversions"}}形式的聚合结果做批量比较"""
+    names = list(stats)
+    successes = np.fromiter((stats[n]["conversions"] for n in names), dtype=float, count=len(names))
+    trials = np.fromiter((stats[n]["leads"] for n in names), dtype=float, count=len(names))
+    return compare_segments(names, successes, trials, **kwargs)
@@ -0,0 +1,294 @@
+"""
+竞品情报库模块
+基于SQLite持久化竞品签单案例与营销活动，增量写入、SimHash近似去重，
+按渠道/客户/方案建立索引，应对建议与成功率统计直接由SQL查询得出
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Iterable, List, Optional, Sequence
+
+from modules.text_features import hamming_distance, normalize_text, simhash
+
+# 默认使用内存数据库，需要跨活动积累情报时传入db_path或设置COMPETITOR_DB_PATH
+DEFAULT_DB_PATH = ":memory:"
+# 同一客户下SimHash汉明距离不超过该值的案例视为同一案例
+DEFAULT_NEAR_DUPLICATE_DISTANCE = 12
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _signed64(value: int) -> int:
+    """SQLite INTEGER为有符号64位"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _unsigned64(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def _numbers(text: str) -> List[str]:
+    """文本中的数值(如降低成本30%中的30)，按大小排序"""
+    return sorted(_NUMBER.findall(normalize_text(text)), key=float)
+
+
+def _id_filter(ids: Optional[Sequence[int]]) -> tuple:
+    """限定记录id的查询条件，ids为None时不限定"""
+    if ids is None:
+        return [], []
+    return ["id IN (SELECT value FROM json_each(?))"], [json.dumps(list(ids))]
+
+
+def _where(conditions: List[str]) -> str:
+    return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+
+class CompetitorIntelStore:
+    def __init__(self, db_path: Optional[str] = None, max_distance: int = DEFAULT_NEAR_DUPLICATE_DISTANCE):
+        """
+        :param db_path: 数据库文件路径，默认读取环境变量COMPETITOR_DB_PATH，未设置时为内存数据库
+        :param max_distance: 近似重复判定的SimHash汉明距离上限
+        """
+        self.db_path = db_path or os.environ.get("COMPETITOR_DB_PATH", DEFAULT_DB_PATH)
+        self.max_distance = max_distance
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS cases (
+                    id INTEGER PRIMARY KEY,
+                    competitor TEXT NOT NULL DEFAULT '',
+                    client TEXT NOT NULL,
+                    client_key TEXT NOT NULL,
+                    solution TEXT NOT NULL,
+                    solution_key TEXT NOT NULL,
+                    value_prop TEXT NOT NULL DEFAULT '',
+                    simhash INTEGER NOT NULL,
+                    occurrences INTEGER NOT NULL DEFAULT 1,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_cases_client ON cases(client_key);
+                CREATE INDEX IF NOT EXISTS idx_cases_solution ON cases(solution_key, occurrences);
+                CREATE TABLE IF NOT EXISTS case_variants (
+                    fingerprint TEXT PRIMARY KEY,
+                    case_id INTEGER NOT NULL
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS activities (
+                    id INTEGER PRIMARY KEY,
+                    fingerprint TEXT NOT NULL UNIQUE,
+                    competitor TEXT NOT NULL DEFAULT '',
+                    name TEXT NOT NULL DEFAULT '',
+                    channel TEXT NOT NULL,
+                    content_type TEXT NOT NULL,
+                    success_rate REAL NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_activities_channel ON activities(channel, content_type, success_rate);
+            """)
+
+    @staticmethod
+    def _fingerprint(*parts: str) -> str:
+        key = "\x1f".join(normalize_text(part) for part in parts)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _upsert_case(self, case: Dict[str, Any], competitor: str, now: float) -> tuple:
+        """在当前事务内写入一条案例，返回(added/merged/unchanged, 案例id)"""
+        client, solution = case["client"], case["solution"]
+        value_prop = case.get("value_prop", "")
+        fingerprint = self._fingerprint(competitor, client, solution, value_prop)
+        row = self.conn.execute("SELECT case_id FROM case_variants WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        if row is not None:
+            return "unchanged", row["case_id"]
+
+        text = f"{client} {solution} {value_prop}"
+        signature = simhash(text)
+        client_key = normalize_text(client)
+        # 只在同一客户的案例中比对SimHash，候选集由client_key索引给出；
+        # SimHash区分不了"降低成本30%"与"降低成本50%"，数值不同的案例不合并
+        numbers = _numbers(text)
+        match = None
+        for row in self.conn.execute("SELECT id, simhash, client, solution, value_prop FROM cases "
+                                     "WHERE client_key = ?", (client_key,)):
+            distance = hamming_distance(signature, _unsigned64(row["simhash"]))
+            if distance <= self.max_distance and (match is None or distance < match[1]) \
+                    and _numbers(f"{row['client']} {row['solution']} {row['value_prop']}") == numbers:
+                match = (row["id"], distance)
+
+        if match is None:
+            case_id = self.conn.execute(
+                "INSERT INTO cases (competitor, client, client_key, solution, solution_key, value_prop, simhash, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (competitor, client, client_key, solution, normalize_text(solution), value_prop,
+                 _signed64(signature), now, now)
+            ).lastrowid
+            status = "added"
+        else:
+            case_id = match[0]
+            self.conn.execute(
+                "UPDATE cases SET occurrences = occurrences + 1, updated_at = ?, "
+                "value_prop = CASE WHEN value_prop = '' THEN ? ELSE value_prop END WHERE id = ?",
+                (now, value_prop, case_id)
+            )
+            status = "merged"
+        self.conn.execute("INSERT INTO case_variants (fingerprint, case_id) VALUES (?, ?)", (fingerprint, case_id))
+        return status, case_id
+
+    def upsert_cases(self, cases: Iterable[Dict[str, Any]], competitor: str = "",
+                     ids: Optional[List[int]] = None) -> Dict[str, int]:
+        """
+        增量写入签单案例(单个事务)
+        完全相同的案例忽略，近似重复的案例合并并累计出现次数
+        :param ids: 传入列表时追加每条输入对应的案例id，供查询限定在本次写入范围
+        :return: 新增/合并/未变化数量
+        """
+        stats = {"added": 0, "merged": 0, "unchanged": 0}
+        now = time.time()
+        with self._lock, self.conn:
+            # 立即获取写锁，多个连接并发写入时先查后写不会冲突
+            self.conn.execute("BEGIN IMMEDIATE")
+            for case in cases:
+                status, case_id = self._upsert_case(case, case.get("competitor", competitor), now)
+                stats[status] += 1
+                if ids is not None:
+                    ids.append(case_id)
+        return stats
+
+    def upsert_activities(self, activities: Iterable[Dict[str, Any]], competitor: str = "",
+                          ids: Optional[List[int]] = None) -> Dict[str, int]:
+        """
+        增量写入营销活动(单个事务)
+        同一竞品、活动名称、渠道与内容形式视为同一活动，重复写入时更新成功率
+        :param ids: 传入列表时追加每条输入对应的活动id
+        :return: 新增/更新数量
+        """
+        stats = {"added": 0, "updated": 0}
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            for activity in activities:
+                owner = activity.get("competitor", competitor)
+                name = activity.get("name", "")
+                fingerprint = self._fingerprint(owner, name, activity["channel"], activity["content_type"])
+                row = self.conn.execute(
+                    "UPDATE activities SET success_rate = ?, updated_at = ? WHERE fingerprint = ? RETURNING id",
+                    (activity.get("success_rate", 0), now, fingerprint)
+                ).fetchone()
+                if row is not None:
+                    activity_id = row["id"]
+                    stats["updated"] += 1
+                else:
+                    activity_id = self.conn.execute(
+                        "INSERT INTO activities (fingerprint, competitor, name, channel, content_type, success_rate, "
+                        "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (fingerprint, owner, name, activity["channel"], activity["content_type"],
+                         activity.get("success_rate", 0), now, now)
+                    ).lastrowid
+                    stats["added"] += 1
+                if ids is not None:
+                    ids.append(activity_id)
+        return stats
+
+    def case_studies(self, client: Optional[str] = None, solution: Optional[str] = None,
+                     limit: int = 50, case_ids: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """按客户/方案查询案例，出现次数多的排在前面；case_ids限定查询范围"""
+        conditions, params = _id_filter(case_ids)
+        if client is not None:
+            conditions.append("client_key = ?")
+            params.append(normalize_text(client))
+        if solution is not None:
+            conditions.append("solution_key = ?")
+            params.append(normalize_text(solution))
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT competitor, client, solution, value_prop, occurrences FROM cases {_where(conditions)} "
+                "ORDER BY occurrences DESC, id LIMIT ?", (*params, limit)
+            ).fetchall()
+        return [
+            {
+                "client": row["client"],
+                "solution": row["solution"],
+                "value_proposition": row["value_prop"],
+                "competitor": row["competitor"],
+                "occurrences": row["occurrences"]
+            } for row in rows
+        ]
+
+    def marketing_strategies(self, channel: Optional[str] = None, limit: int = 50,
+                             activity_ids: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """按渠道×内容形式聚合的营销策略及平均成功率"""
+        conditions, params = _id_filter(activity_ids)
+        if channel is not None:
+            conditions.append("channel = ?")
+            params.append(channel)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT channel, content_type, AVG(success_rate) AS success_rate, COUNT(*) AS activities "
+                f"FROM activities {_where(conditions)} GROUP BY channel, content_type "
+                "ORDER BY success_rate DESC, activities DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def channel_success_rates(self, activity_ids: Optional[Sequence[int]] = None) -> Dict[str, Dict[str, Any]]:
+        """各渠道竞品活动数、平均与最高成功率"""
+        conditions, params = _id_filter(activity_ids)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT channel, COUNT(*) AS activities, AVG(success_rate) AS avg_success_rate, "
+                f"MAX(success_rate) AS max_success_rate FROM activities {_where(conditions)} GROUP BY channel "
+                "ORDER BY avg_success_rate DESC", params
+            ).fetchall()
+        return {row["channel"]: {key: row[key] for key in ("activities", "avg_success_rate", "max_success_rate")}
+                for row in rows}
+
+    def top_solutions(self, limit: int = 3, case_ids: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """竞品签单最多的方案"""
+        conditions, params = _id_filter(case_ids)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT MIN(solution) AS solution, SUM(occurrences) AS wins, COUNT(DISTINCT client_key) AS clients "
+                f"FROM cases {_where(conditions)} GROUP BY solution_key ORDER BY wins DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def countermeasures(self, min_success_rate: float = 0.3, case_ids: Optional[Sequence[int]] = None,
+                        activity_ids: Optional[Sequence[int]] = None) -> List[str]:
+        """
+        生成应对建议
+        :param min_success_rate: 竞品渠道平均成功率达到该值时给出渠道应对
+        :param case_ids: 限定参与统计的案例，activity_ids同理；为None时统计全库
+        """
+        countermeasures = []
+        solutions = self.top_solutions(limit=1, case_ids=case_ids)
+        if solutions:
+            countermeasures.append("强化差异化价值主张")
+            countermeasures.append(f"针对竞品{solutions[0]['solution']}准备对比材料")
+        conditions, params = _id_filter(activity_ids)
+        with self._lock:
+            strong = self.conn.execute(
+                f"SELECT channel, AVG(success_rate) AS rate FROM activities {_where(conditions)} GROUP BY channel "
+                "ORDER BY rate DESC LIMIT 1", params
+            ).fetchone()
+        if strong is not None:
+            countermeasures.append("优化渠道组合策略")
+            if strong["rate"] >= min_success_rate:
+                countermeasures.append(f"加强{strong['channel']}渠道布局(竞品成功率{strong['rate']:.0%})")
+        return countermeasures
+
+    def count(self, table: str = "cases") -> int:
+        if table not in ("cases", "activities"):
+            raise ValueError(f"未知数据表: {table}")
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
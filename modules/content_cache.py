@@ -0,0 +1,131 @@
+"""
+内容生成缓存模块
+按(客户类型, 场景, 价值主张, 模板版本)缓存大模型生成的话术变体，
+跨活动复用相同场景的生成结果，并统计命中率与生成成本。
+并发的活动同时未命中同一场景时只由第一个调用方生成，其余等待其结果(single-flight)
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from modules.text_features import normalize_text
+
+
+class _InFlight:
+    """正在生成的缓存键，生成方写入或放弃后唤醒等待方"""
+    __slots__ = ("done", "entry")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry: Optional[Dict[str, Any]] = None
+
+
+class ContentCache:
+    def __init__(self, max_entries: int = 10000):
+        """
+        :param max_entries: 最大缓存条目数，超出时淘汰最久未使用的条目
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._in_flight: Dict[tuple, _InFlight] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "generated": 0,
+            "tokens_used": 0,
+            "tokens_saved": 0
+        }
+
+    @staticmethod
+    def make_key(client_type: str, scenario: str, value_proposition: str, template_version: str) -> tuple:
+        """缓存键：规范化后的客户类型、场景与价值主张，加上模板版本"""
+        return (normalize_text(client_type), normalize_text(scenario),
+                normalize_text(value_proposition), str(template_version))
+
+    def get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """查询缓存，命中时累计节省的token"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            self.stats["tokens_saved"] += entry["tokens_used"]
+            return entry
+
+    def claim(self, key: tuple) -> Tuple[Optional[Dict[str, Any]], Optional[_InFlight]]:
+        """
+        查询缓存并登记生成权
+        :return: 命中时返回(条目, None)；同一键正由其他调用方生成时返回(None, 等待句柄)，用wait取结果；
+                 否则调用方成为生成方，返回(None, None)，之后须调用put或release
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["tokens_saved"] += entry["tokens_used"]
+                return entry, None
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                self.stats["coalesced"] += 1
+                return None, in_flight
+            self._in_flight[key] = _InFlight()
+            self.stats["misses"] += 1
+            return None, None
+
+    def wait(self, handle: _InFlight, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """等待生成方的结果，生成失败或超时返回None"""
+        if not handle.done.wait(timeout) or handle.entry is None:
+            return None
+        with self._lock:
+            self.stats["tokens_saved"] += handle.entry["tokens_used"]
+        return handle.entry
+
+    def release(self, key: tuple):
+        """放弃生成权(生成失败)，等待方得到None"""
+        with self._lock:
+            in_flight = self._in_flight.pop(key, None)
+        if in_flight is not None:
+            in_flight.done.set()
+
+    def put(self, key: tuple, variants, tokens_used: int = 0) -> Dict[str, Any]:
+        """写入一次生成结果，并唤醒等待该键的调用方"""
+        entry = {"variants": list(variants), "tokens_used": tokens_used}
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self.stats["generated"] += 1
+            self.stats["tokens_used"] += tokens_used
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            in_flight = self._in_flight.pop(key, None)
+        if in_flight is not None:
+            in_flight.entry = entry
+            in_flight.done.set()
+        return entry
+
+    def report(self) -> Dict[str, Any]:
+        """命中率与成本统计"""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return dict(self.stats, entries=len(self._entries),
+                        hit_rate=self.stats["hits"] / lookups if lookups else 0.0)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_default_cache = None
+
+
+def get_default_cache() -> ContentCache:
+    """进程内共享的话术缓存，多个活动复用"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ContentCache()
+    return _default_cache
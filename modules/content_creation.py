@@ -0,0 +1,243 @@
+"""
+工业内容创造与武装模块
+实现方案/内容生成和销售话术提词功能
+"""
+
+import json
+
+from modules.tracing import traced
+
+
+class ContentCreation:
+    def __init__(self, rule_engine=None, orchestrator=None, prompt_manager=None, max_workers=8, content_cache=None):
+        from modules.content_cache import get_default_cache
+        from modules.services import get_services
+        from modules.strategy_rules import get_default_engine
+        
+        self.marketing_plan = None
+        # 与Planning共享的客户策略规则
+        self.rule_engine = rule_engine or get_default_engine()
+        # 大模型调度器与提示词管理器默认使用进程内共享实例，内容生成按max_workers并发
+        self.orchestrator = orchestrator or get_services().orchestrator
+        self.prompt_manager = prompt_manager or get_services().prompt_manager
+        self.max_workers = max_workers
+        # 话术变体缓存，默认在进程内的多个活动间共享
+        self.content_cache = get_default_cache() if content_cache is None else content_cache
+        self.technical_materials = []
+        self.sales_scripts = []
+    
+    @traced()
+    def generate_technical_materials(self, marketing_plan):
+        """
+        工业方案/内容生成器
+        输入: 工业营销行动计划
+        输出: 定制化工业技术物料
+        """
+        self.marketing_plan = marketing_plan
+        prompt_manager = self.prompt_manager
+        
+        # 先渲染全部客户类型的提示词，再并发分发
+        strategies = marketing_plan.get("client_strategies", {}).get("strategies", [])
+        styles = []
+        prompts = []
+        for strategy in strategies:
+            # 规划阶段检索到的历史经验一并作为痛点参考
+            pain_points = self.marketing_plan.get("client_needs", {}).get("explicit_needs", []) + strategy.get("lessons", [])
+            style = self._content_style(strategy["type"])
+            context = {
+                "client_type": strategy["type"],
+                "value_proposition": strategy.get("value_proposition", ""),
+                "pain_points": ", ".join(pain_points),
+                "key_benefits": style["key_benefits"],
+                "style_preference": style["style_preference"]
+            }
+            styles.append(style)
+            prompts.append(prompt_manager.render_template("content_creation", context))
+        
+        responses = self.orchestrator.dispatch_batch("content_creation", prompts, max_workers=self.max_workers)
+        
+        # 按原顺序组装，失败项逐项降级
+        materials = []
+        formats = []
+        for strategy, style, response in zip(strategies, styles, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                if prompt_manager.validate_response_format(response["response"], "markdown"):
+                    materials.append({
+                        "type": f"{strategy['type']}定制内容",
+                        "title": f"{strategy['type']}技术方案",
+                        "content": response["response"],
+                        "optimized": True
+                    })
+                    formats.append(style["format"])
+                else:
+                    raise ValueError("响应格式无效")
+                    
+            except Exception as e:
+                print(f"内容生成失败，使用模板内容: {str(e)}")
+                # 降级方案：使用模板内容
+                materials.append({
+                    "type": f"{strategy['type']}基础内容",
+                    "title": f"{strategy['type']}技术方案",
+                    "content": "标准技术方案内容",
+                    "optimized": False
+                })
+                formats.append("PDF")
+        
+        self.technical_materials = {
+            "materials": materials,
+            "formats": list(set(formats))
+        }
+        
+        return self.technical_materials
+    
+    def _content_style(self, segment):
+        """取细分客户的内容风格，未配置规则时使用通用风格"""
+        rule = self.rule_engine.rule_for_segment(segment)
+        if rule is not None and "content_style" in rule:
+            return rule["content_style"]
+        return {"key_benefits": "成本效益", "style_preference": "简洁实用", "format": "Excel"}
+    
+    def _value_proposition(self, segment):
+        """取规划阶段给出的细分客户价值主张"""
+        for proposition in self.marketing_plan.get("client_strategies", {}).get("value_propositions", []):
+            if proposition.get("type") == segment:
+                return proposition.get("value", "")
+        return ""
+    
+    @traced()
+    def generate_sales_scripts(self, variant_count=3):
+        """
+        工业销售话术提词器
+        输出: 场景化工业话术库
+        """
+        if not self.marketing_plan:
+            raise ValueError("需要先生成技术物料")
+        
+        prompt_manager = self.prompt_manager
+        cache = self.content_cache
+        template_version = prompt_manager.templates["sales_script"]["version"]
+        
+        # 收集场景，同一客户类型的同一场景只保留一次
+        scenarios = {}
+        
+        def add_scenario(client_type, script):
+            value_proposition = self._value_proposition(client_type)
+            key = cache.make_key(client_type, script["type"], value_proposition, template_version)
+            scenarios.setdefault(key, {
+                "client_type": client_type,
+                "type": script["type"],
+                "script": script["script"],
+                "value_proposition": value_proposition
+            })
+        
+        # 根据客户类型生成话术
+        for strategy in self.marketing_plan.get("client_strategies", {}).get("strategies", []):
+            rule = self.rule_engine.rule_for_segment(strategy["type"])
+            if rule is not None:
+                for script in rule["scripts"]:
+                    add_scenario(strategy["type"], script)
+        
+        # 根据定价方案补充话术
+        for plan in self.marketing_plan.get("pricing_plans", {}).get("plans", []):
+            if plan["name"] == "高级方案":
+                add_scenario("通用", {
+                    "type": "增值服务",
+                    "script": "选择高级方案可享受专属客户经理和优先技术支持..."
+                })
+        
+        # 缓存命中的场景直接复用；其他活动正在生成的场景等待其结果，其余并发生成
+        pending = []
+        waiting = {}
+        for key, scenario in scenarios.items():
+            entry, handle = cache.claim(key)
+            if entry is not None:
+                scenario.update(variants=entry["variants"], cached=True)
+            elif handle is not None:
+                waiting[key] = handle
+            else:
+                pending.append(key)
+        
+        finished = set()
+        try:
+            prompts = [
+                prompt_manager.render_template("sales_script", {
+                    "client_type": scenarios[key]["client_type"],
+                    "scenario": scenarios[key]["type"],
+                    "value_proposition": scenarios[key]["value_proposition"],
+                    "reference_script": scenarios[key]["script"],
+                    "variant_count": str(variant_count)
+                }) for key in pending
+            ]
+            responses = self.orchestrator.dispatch_batch("sales_script", prompts, max_workers=self.max_workers)
+            
+            for key, response in zip(pending, responses):
+                scenario = scenarios[key]
+                variants = self._parse_variants(response)
+                if variants:
+                    cache.put(key, variants, response.get("tokens_used", 0))
+                else:
+                    # 降级方案：使用规则中的参考话术，不写入缓存
+                    cache.release(key)
+                    variants = [scenario["script"]]
+                finished.add(key)
+                scenario.update(variants=variants, cached=False)
+        finally:
+            # 异常退出时放弃未完成的生成权，避免等待方一直阻塞
+            for key in pending:
+                if key not in finished:
+                    cache.release(key)
+        
+        for key, handle in waiting.items():
+            scenario = scenarios[key]
+            entry = cache.wait(handle)
+            if entry is not None:
+                scenario.update(variants=entry["variants"], cached=True)
+            else:
+                scenario.update(variants=[scenario["script"]], cached=False)
+        
+        self.sales_scripts = {
+            "scenarios": list(scenarios.values()),
+            "scripts": [variant for scenario in scenarios.values() for variant in scenario["variants"]],
+            "cache_stats": cache.report()
+        }
+        
+        return self.sales_scripts
+    
+    def _parse_variants(self, response):
+        """解析话术变体，响应失败或格式无效时返回空列表"""
+        if isinstance(response, Exception):
+            print(f"话术生成失败，使用参考话术: {str(response)}")
+            return []
+        if not self.prompt_manager.validate_response_format(response["response"], "json"):
+            return []
+        data = json.loads(response["response"])
+        variants = data.get("variants", []) if isinstance(data, dict) else data
+        if not isinstance(variants, list):
+            return []
+        return [str(variant) for variant in variants if str(variant).strip()]
+    
+    @traced()
+    def package_marketing_kit(self):
+        """
+        整合生成工业"营销弹药包"
+        按场景分类封装
+        """
+        return {
+            "technical_materials": self.technical_materials,
+            "sales_scripts": self.sales_scripts
+        }
+    
+    @traced()
+    def export_marketing_kit(self, output_dir, name="marketing_kit", formats=None):
+        """
+        导出营销弹药包文件
+        默认导出HTML，以及技术物料标注的PDF/Excel格式
+        """
+        from modules.kit_export import FORMAT_LABELS, export_kit
+        
+        if formats is None:
+            labels = (self.technical_materials or {}).get("formats", [])
+            formats = ["html"] + sorted({FORMAT_LABELS[label] for label in labels if label in FORMAT_LABELS})
+        return export_kit(self.package_marketing_kit(), output_dir, name, formats)
\ No newline at end of file
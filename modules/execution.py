@@ -0,0 +1,165 @@
+"""
+工业执行、互动与追踪模块
+实现多渠道发布、客户互动跟进和销售过程推进功能
+"""
+
+from modules.records import (Channel, ChannelFeedback, InterestChange, Interaction, NextAction, PotentialClient,
+                             Priority, Stage, StageProgress)
+from modules.tracing import annotate, traced
+
+# 渠道 -> (反馈, 效果, 意向客户名称, 联系人, 关注点)
+CHANNEL_OUTCOMES = {
+    Channel.TRADE_SHOW: ("展位咨询量: 25人", Priority.HIGH, "XX制造企业", "张经理", "技术合规方案"),
+    Channel.VERTICAL_PLATFORM: ("点击量: 320次", Priority.MEDIUM, "YY科技公司", "李总监", "ROI分析"),
+    Channel.INTERNATIONAL_SHOW: ("国际客户咨询: 15家", Priority.HIGH, "ZZ国际集团", "John Smith",
+                                 "全球技术标准"),
+}
+
+# (关注点关键词, 下一步动作, 截止日期, 优先级)，按顺序取第一条匹配
+FOLLOW_UP_RULES = (
+    ("技术合规", "安排技术团队演示", "2025-11-02", Priority.HIGH),
+    ("ROI", "发送详细ROI分析报告", "2025-10-28", Priority.MEDIUM),
+    ("全球技术", "安排国际团队视频会议", "2025-10-30", Priority.HIGH),
+)
+
+
+class Execution:
+    def __init__(self, scheduler=None):
+        """
+        :param scheduler: 跟进动作调度器(FollowUpScheduler)，指定时下一步行动入队并在到期后自动跟进
+        """
+        self.scheduler = scheduler
+        self.marketing_kit = None
+        self.client_entities = {}
+        self.channel_feedbacks = []
+        self.interaction_records = []
+        self.sales_progress = []
+    
+    @traced()
+    def publish_to_channels(self, marketing_kit):
+        """
+        工业多渠道发布
+        输入: 工业营销弹药包
+        输出: 渠道反馈与意向客户
+        """
+        self.marketing_kit = marketing_kit
+        feedbacks = []
+        potential_clients = []
+        
+        # 获取技术物料和渠道策略
+        materials = marketing_kit.get("technical_materials", {}).get("materials", [])
+        channel_strategies = marketing_kit.get("channel_strategies", {}).get("channel_mix", [])
+        
+        # 执行渠道发布(模拟各渠道的反馈与意向客户)
+        for strategy in channel_strategies:
+            for channel in strategy["channels"]:
+                outcome = CHANNEL_OUTCOMES.get(channel)
+                if outcome is None:
+                    continue
+                response, effectiveness, name, contact, interest = outcome
+                feedbacks.append(ChannelFeedback(Channel(channel), response, effectiveness))
+                potential_clients.append(PotentialClient(name, contact, interest, Channel(channel), strategy["type"]))
+        
+        self.channel_feedbacks = {
+            "feedbacks": feedbacks,
+            "potential_clients": potential_clients
+        }
+        
+        return self.channel_feedbacks
+    
+    @traced()
+    def resolve_clients(self, potential_clients):
+        """
+        跨渠道意向客户实体消解
+        输入: 各渠道与线索库产生的意向客户(同一企业可能以不同写法多次出现)
+        输出: 去重后的意向客户(每个企业保留首次出现的记录)，客户名称到实体的映射记录在client_entities
+        """
+        from modules.entity_resolution import resolve_entities
+        
+        resolution = resolve_entities(potential_clients)
+        self.client_entities = resolution.entity_keys(potential_clients)
+        annotate(clients=len(potential_clients), entities=len(resolution))
+        return resolution.unique(potential_clients)
+    
+    @traced()
+    def interact_and_follow_up(self, potential_clients):
+        """
+        工业客户互动与跟进
+        输入: 意向客户列表
+        输出: 结构化跟进记录与下次动作
+        """
+        records = []
+        next_actions = []
+        
+        # 使用营销弹药包中的话术进行互动
+        sales_scripts = self.marketing_kit.get("sales_scripts", {}).get("scenarios", [])
+        
+        for client in potential_clients:
+            # 记录初次接触
+            interest = client["interest"]
+            records.append(Interaction(client["name"], client["contact"], "2025-10-26",
+                                       f"初次接触，讨论{interest}", "初步意向"))
+            
+            # 规划下一步行动(按兴趣关键词匹配)
+            for keyword, action, deadline, priority in FOLLOW_UP_RULES:
+                if keyword in interest:
+                    next_actions.append(NextAction(client["name"], action, deadline, priority))
+                    break
+        
+        if self.scheduler is not None:
+            self.scheduler.schedule_many(next_actions)
+        
+        self.interaction_records = {
+            "records": records,
+            "next_actions": next_actions
+        }
+        
+        return self.interaction_records
+    
+    @traced()
+    def track_sales_progress(self, interaction_records):
+        """
+        工业销售过程推进
+        输入: 跟进记录
+        输出: 客户意向度变化与阶段推进记录
+        """
+        interest_changes = []
+        stage_progress = []
+        
+        # 是否已安排技术演示对所有记录相同，只需判断一次
+        next_actions = interaction_records.get("next_actions", [])
+        demo_scheduled = any("技术团队演示" in action["action"] for action in next_actions)
+        
+        # 分析跟进记录，跟踪销售进展
+        for record in interaction_records.get("records", []):
+            client_name = record["client"]
+            
+            # 模拟意向度变化 (1-10, 10为最高)
+            interest_level = 5  # 初始意向度
+            if demo_scheduled:
+                interest_level = 7
+            if "ROI分析报告" in record["interaction"]:
+                interest_level = 6
+            if "视频会议" in record["interaction"]:
+                interest_level = 8
+            
+            trend = "上升" if interest_level > 5 else "稳定"
+            interest_changes.append(InterestChange(client_name, interest_level, trend))
+            
+            # 跟踪销售阶段
+            if interest_level >= 8:
+                stage = Stage.SOLUTION_CONFIRMED
+            elif interest_level >= 6:
+                stage = Stage.NEEDS_ANALYSIS
+            else:
+                stage = Stage.INITIAL_CONTACT
+            
+            next_milestone = Stage.CONTRACT if stage is Stage.SOLUTION_CONFIRMED else Stage.SOLUTION_CONFIRMED
+            stage_progress.append(StageProgress(client_name, stage, next_milestone))
+        
+        self.sales_progress = {
+            "interest_changes": interest_changes,
+            "stage_progress": stage_progress
+        }
+        
+        return self.sales_progress
\ No newline at end of file
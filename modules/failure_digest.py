@@ -0,0 +1,99 @@
+"""
+失败分析数据摘要模块
+将销售全流程数据预聚合为固定规模的统计摘要，控制大模型提示词长度
+"""
+
+import heapq
+from typing import Dict, Any
+
+from modules.channel_stats import compare_stats
+from modules.rolling_metrics import CONVERTED_STAGES
+
+
+def _round(value: float) -> float:
+    return round(float(value), 3)
+
+
+def build_failure_digest(metrics, top_k: int = 5, max_flags: int = 5) -> Dict[str, Any]:
+    """
+    生成失败分析摘要
+    :param metrics: RollingMetrics增量聚合结果
+    :param top_k: 渠道与阶段最多保留的条目数
+    :param max_flags: 异常标记最多保留的条数
+    :return: 规模只取决于top_k/max_flags的摘要字典
+    """
+    channel_stats = compare_stats(metrics.channel_performance())
+
+    top_channels = [
+        {
+            "channel": s["segment"],
+            "leads": s["leads"],
+            "conversions": s["conversions"],
+            "rate": _round(s["rate"]),
+            "ci95": [_round(s["wilson_low"]), _round(s["wilson_high"])]
+        } for s in heapq.nlargest(top_k, channel_stats, key=lambda s: s["leads"])
+    ]
+
+    # 阶段直方图：保留人数最多的top_k个阶段，其余合并
+    stage_items = heapq.nlargest(top_k, metrics.stage_counts.items(), key=lambda x: x[1])
+    stage_histogram = dict(stage_items)
+    omitted = sum(metrics.stage_counts.values()) - sum(stage_histogram.values())
+    if omitted:
+        stage_histogram["其他"] = omitted
+
+    # 异常标记，severity越大越优先
+    flags = []
+    for s in channel_stats:
+        if s["direction"] == "低":
+            flags.append((abs(s["z_score"]), {
+                "type": "低效渠道",
+                "target": s["segment"],
+                "evidence": f"转化率{s['rate']:.0%}，低于其他渠道{-s['uplift']:.0%} (p={s['p_value']:.3f})"
+            }))
+
+    stuck_total = sum(count for stage, count in metrics.stage_counts.items()
+                      if stage not in CONVERTED_STAGES)
+    if stuck_total:
+        stage, count = max(((stage, count) for stage, count in metrics.stage_counts.items()
+                            if stage not in CONVERTED_STAGES), key=lambda x: x[1])
+        share = count / max(1, sum(metrics.stage_counts.values()))
+        if share >= 0.5:
+            flags.append((share * 10, {
+                "type": "漏斗阻塞",
+                "target": stage,
+                "evidence": f"{count}个客户({share:.0%})停滞在该阶段"
+            }))
+
+    for channel, stats in metrics.channel_stats.items():
+        if stats["low_effectiveness"]:
+            share = stats["low_effectiveness"] / max(1, stats["leads"])
+            flags.append((share * 5, {
+                "type": "内容低效",
+                "target": channel,
+                "evidence": f"{stats['low_effectiveness']}条低效反馈({share:.0%})"
+            }))
+
+    weekly_rates = metrics.window_rates("channel")
+    overall = {s["segment"]: s["rate"] for s in channel_stats}
+    for channel, rates in weekly_rates.items():
+        if overall.get(channel, 0) > 0 and rates["weekly"] < overall[channel] * 0.5:
+            flags.append((overall[channel] - rates["weekly"], {
+                "type": "近期下滑",
+                "target": channel,
+                "evidence": f"近7天转化率{rates['weekly']:.0%}，累计{overall[channel]:.0%}"
+            }))
+
+    anomalies = [flag for _, flag in heapq.nlargest(max_flags, flags, key=lambda x: x[0])]
+
+    return {
+        "totals": {
+            "clients": metrics.total_clients,
+            "converted": metrics.converted_clients,
+            "conversion_rate": _round(metrics.conversion_rate),
+            "channels": len(channel_stats)
+        },
+        "top_channels": top_channels,
+        "stage_histogram": stage_histogram,
+        "anomalies": anomalies,
+        "omitted_anomalies": max(0, len(flags) - len(anomalies))
+    }
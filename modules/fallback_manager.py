@@ -6,10 +6,18 @@
 import time
 from typing import Callable, Any
 
+from modules.tracing import span
+
 class FallbackManager:
     def __init__(self, max_retries: int = 3):
         self.max_retries = max_retries
         self.retry_delays = [1, 3, 5]  # 指数退避延迟(秒)
+    
+    def _backoff(self, attempt: int):
+        """按重试次数退避等待，超出延迟表时不等待"""
+        if attempt < len(self.retry_delays):
+            with span("fallback.sleep", "sleep", attempt=attempt, seconds=self.retry_delays[attempt]):
+                time.sleep(self.retry_delays[attempt])
         
     def execute_with_fallback(self, 
                             primary_func: Callable, 
@@ -30,8 +38,7 @@ class FallbackManager:
                 return result
             except Exception as e:
                 last_error = e
-                if attempt < len(self.retry_delays):
-                    time.sleep(self.retry_delays[attempt])
+                self._backoff(attempt)
                 continue
         
         # 主函数失败，尝试降级方案
@@ -42,8 +49,7 @@ class FallbackManager:
                     return result
                 except Exception as e:
                     last_error = e
-                    if attempt < len(self.retry_delays):
-                        time.sleep(self.retry_delays[attempt])
+                    self._backoff(attempt)
                     continue
         
         # 所有尝试都失败
@@ -60,8 +66,7 @@ class FallbackManager:
                     return func(*args, **kwargs)
                 except Exception as e:
                     last_error = e
-                    if attempt < len(self.retry_delays):
-                        time.sleep(self.retry_delays[attempt])
+                    self._backoff(attempt)
                     continue
             raise Exception(f"函数{func.__name__}执行失败。最后错误: {str(last_error)}")
         return wrapper
\ No newline at end of file
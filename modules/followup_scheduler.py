@@ -0,0 +1,381 @@
+"""
+跟进动作调度模块
+interact_and_follow_up产生的下一步行动按截止时间入队，到期后以受控速率调用大模型生成跟进话术。
+待办动作持久化在SQLite中，内存里只保留一个整数最小堆：每个动作压缩为一个整数键
+(到期秒数, 优先级, 动作ID)，插入/弹出均为O(log n)，百万级待办动作约占数十MB；
+进程重启时从数据库重建堆(heapify为O(n))，上次未完成的发送重新排队
+"""
+
+import heapq
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from modules.records import NextAction, Priority
+from modules.services import data_path
+from modules.tracing import traced
+
+# 默认数据库文件名，与知识库同在本地数据目录(见modules.services.data_path)
+DEFAULT_DB_NAME = "followup_scheduler.db"
+
+PENDING, DISPATCHING, DONE, FAILED, CANCELLED = "pending", "dispatching", "done", "failed", "cancelled"
+
+# 同一到期时间内高优先级先发
+PRIORITY_RANK = {Priority.HIGH: 0, Priority.MEDIUM: 1, Priority.LOW: 2}
+
+# 整数堆键的位布局: 到期秒数 | 优先级(2位) | 动作ID(40位)
+_ID_BITS = 40
+_RANK_BITS = 2
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+def _pack(due: int, rank: int, action_id: int) -> int:
+    return (((due << _RANK_BITS) | rank) << _ID_BITS) | action_id
+
+
+def _unpack_due(key: int) -> int:
+    return key >> (_ID_BITS + _RANK_BITS)
+
+
+def _chunks(action_ids: List[int], size: int = 500):
+    """SQLite单条语句的参数个数有限，IN查询按块拆分"""
+    for start in range(0, len(action_ids), size):
+        chunk = action_ids[start:start + size]
+        yield chunk, ",".join("?" * len(chunk))
+
+
+def deadline_timestamp(deadline: Any) -> int:
+    """截止时间转为Unix秒数，支持时间戳、date/datetime与"YYYY-MM-DD[ HH:MM]"字符串(本地时间)"""
+    if isinstance(deadline, (int, float)):
+        return int(deadline)
+    if isinstance(deadline, datetime):
+        return int(deadline.timestamp())
+    if isinstance(deadline, date):
+        return int(time.mktime(deadline.timetuple()))
+    text = str(deadline).strip()
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return int(time.mktime(time.strptime(text, fmt)))
+        except ValueError:
+            continue
+    raise ValueError(f"无法解析的截止时间: {deadline}")
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        令牌桶限速
+        :param rate: 每秒补充的令牌数，即长期平均调用速率
+        :param burst: 桶容量(允许的突发调用数)，默认max(1, rate)
+        """
+        if rate <= 0:
+            raise ValueError("rate必须大于0")
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """取一个令牌，不足时等待；返回等待秒数"""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # 先预留令牌(可为负)，并发调用者各自等待到自己的令牌补齐
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+class FollowUpScheduler:
+    def __init__(self, db_path: Optional[str] = None, orchestrator=None, prompt_manager=None,
+                 rate_per_sec: float = 2.0, burst: Optional[int] = None, max_attempts: int = 3,
+                 retry_delay: float = 300.0, lead_time: float = 0.0, clock: Callable[[], float] = time.time):
+        """
+        :param db_path: 数据库文件路径，默认读取环境变量FOLLOWUP_DB_PATH，未设置时为本地数据目录下的followup_scheduler.db
+        :param rate_per_sec: 跟进话术生成的平均调用速率上限
+        :param burst: 允许的突发调用数
+        :param max_attempts: 单个动作的最大发送次数，失败后按指数退避重新排队
+        :param retry_delay: 首次重试的延迟(秒)
+        :param lead_time: 提前于截止时间多少秒到期
+        :param clock: 当前时间(Unix秒)，测试时可替换
+        """
+        from modules.services import get_services
+
+        self.db_path = db_path or os.environ.get("FOLLOWUP_DB_PATH") or data_path(DEFAULT_DB_NAME)
+        self.orchestrator = orchestrator or get_services().orchestrator
+        self.prompt_manager = prompt_manager or get_services().prompt_manager
+        self.limiter = TokenBucket(rate_per_sec, burst)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lead_time = lead_time
+        self.clock = clock
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._heap: List[int] = []
+        self._cancelled = set()
+        self._next_id = 1
+        self._worker: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.stats = {"scheduled": 0, "dispatched": 0, "succeeded": 0, "retried": 0, "failed": 0}
+        self._init_schema()
+        self.recovered = self._load()
+
+    def _init_schema(self):
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS follow_ups (
+                    id INTEGER PRIMARY KEY,
+                    client TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    deadline TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    due INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    finished_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_follow_ups_status ON follow_ups(status);
+            """)
+
+    def _load(self) -> int:
+        """从数据库重建待办堆，返回上次进程退出时仍在发送、重新排队的动作数"""
+        with self._lock, self.conn:
+            recovered = self.conn.execute(
+                "UPDATE follow_ups SET status = ? WHERE status = ?", (PENDING, DISPATCHING)
+            ).rowcount
+            self._next_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM follow_ups").fetchone()[0]
+            cursor = self.conn.execute("SELECT due, rank, id FROM follow_ups WHERE status = ?", (PENDING,))
+            self._heap = [_pack(due, rank, action_id) for due, rank, action_id in cursor]
+        heapq.heapify(self._heap)
+        return recovered
+
+    def __len__(self) -> int:
+        """待发送动作数"""
+        return len(self._heap) - len(self._cancelled)
+
+    def schedule(self, action: Any) -> int:
+        """加入单个跟进动作(NextAction或同结构字典)，返回动作ID"""
+        return self.schedule_many([action])[0]
+
+    def schedule_many(self, actions: Iterable[Any]) -> List[int]:
+        """批量加入跟进动作，单个事务写入，返回动作ID列表"""
+        now = time.time()
+        rows = []
+        with self._lock:
+            first_id = self._next_id
+            for action_id, action in enumerate(actions, first_id):
+                priority = Priority.coerce(action["priority"])
+                rank = PRIORITY_RANK.get(priority, len(PRIORITY_RANK))
+                due = max(0, deadline_timestamp(action["deadline"]) - int(self.lead_time))
+                rows.append((action_id, action["client"], action["action"], str(action["deadline"]),
+                             str(priority), rank, due, PENDING, now))
+            if not rows:
+                return []
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO follow_ups (id, client, action, deadline, priority, rank, due, status, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+            self._next_id = first_id + len(rows)
+            keys = [_pack(row[6], row[5], row[0]) for row in rows]
+            # 批量远大于堆时整体heapify(O(n))比逐个push(O(k log n))更快
+            if len(keys) > len(self._heap):
+                self._heap.extend(keys)
+                heapq.heapify(self._heap)
+            else:
+                for key in keys:
+                    heapq.heappush(self._heap, key)
+            self.stats["scheduled"] += len(rows)
+        return [row[0] for row in rows]
+
+    def cancel(self, action_id: int) -> bool:
+        """取消待发送动作(堆中惰性删除)，返回是否取消成功"""
+        with self._lock, self.conn:
+            cancelled = self.conn.execute(
+                "UPDATE follow_ups SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+                (CANCELLED, time.time(), action_id, PENDING)
+            ).rowcount
+            if cancelled:
+                self._cancelled.add(action_id)
+        return bool(cancelled)
+
+    def next_due(self) -> Optional[int]:
+        """最早到期时间(Unix秒)，无待办时返回None"""
+        with self._lock:
+            while self._heap and (self._heap[0] & _ID_MASK) in self._cancelled:
+                self._cancelled.discard(heapq.heappop(self._heap) & _ID_MASK)
+            return _unpack_due(self._heap[0]) if self._heap else None
+
+    def pop_due(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[Tuple[int, NextAction]]:
+        """
+        弹出已到期的动作并标记为发送中
+        按到期时间先后、同一时间按优先级返回
+        :return: [(动作ID, NextAction)]
+        """
+        now = self.clock() if now is None else now
+        action_ids = []
+        with self._lock:
+            heap = self._heap
+            while heap and _unpack_due(heap[0]) <= now and (limit is None or len(action_ids) < limit):
+                action_id = heapq.heappop(heap) & _ID_MASK
+                if action_id in self._cancelled:
+                    self._cancelled.discard(action_id)
+                    continue
+                action_ids.append(action_id)
+            if not action_ids:
+                return []
+            rows = {}
+            with self.conn:
+                for chunk, placeholders in _chunks(action_ids):
+                    self.conn.execute(
+                        f"UPDATE follow_ups SET status = ?, attempts = attempts + 1 WHERE id IN ({placeholders})",
+                        (DISPATCHING, *chunk)
+                    )
+                    rows.update((row[0], row[1:]) for row in self.conn.execute(
+                        f"SELECT id, client, action, deadline, priority FROM follow_ups WHERE id IN ({placeholders})",
+                        chunk
+                    ))
+        due_actions = []
+        for action_id in action_ids:
+            client, action, deadline, priority = rows[action_id]
+            due_actions.append((action_id, NextAction(client, action, deadline, Priority.coerce(priority))))
+        return due_actions
+
+    def build_prompt(self, action: NextAction) -> str:
+        """跟进话术提示词，复用销售话术模板"""
+        return self.prompt_manager.render_template("sales_script", {
+            "client_type": action.client,
+            "scenario": action.action,
+            "value_proposition": f"在{action.deadline}前完成{action.action}",
+            "reference_script": "",
+            "variant_count": "1"
+        })
+
+    def _outreach(self, action: NextAction) -> Tuple[bool, str]:
+        self.limiter.acquire()
+        try:
+            result = self.orchestrator.dispatch_request("sales_script", self.build_prompt(action))
+            return True, result["response"]
+        except Exception as e:
+            return False, str(e)
+
+    @traced("followup.run_due", "followup")
+    def run_due(self, now: Optional[float] = None, limit: Optional[int] = None, batch_size: int = 500,
+                max_workers: int = 4) -> Dict[str, int]:
+        """
+        发送到期动作的跟进话术
+        调用经令牌桶限速后并发分发；失败的动作按指数退避重新排队，超过最大次数后标记失败
+        :param limit: 本次最多发送的动作数，默认发送全部到期动作
+        :return: 本次发送、成功、重试与失败的数量
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        now = self.clock() if now is None else now
+        summary = {"dispatched": 0, "succeeded": 0, "retried": 0, "failed": 0}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while limit is None or summary["dispatched"] < limit:
+                size = batch_size if limit is None else min(batch_size, limit - summary["dispatched"])
+                batch = self.pop_due(now, size)
+                if not batch:
+                    break
+                outcomes = list(pool.map(lambda item: self._outreach(item[1]), batch))
+                self._finish_batch(batch, outcomes, now, summary)
+        with self._lock:
+            for key, value in summary.items():
+                self.stats[key] += value
+        return summary
+
+    def _finish_batch(self, batch, outcomes, now, summary):
+        finished_at = time.time()
+        done, failed, retry = [], [], []
+        with self._lock:
+            attempts = {}
+            for chunk, placeholders in _chunks([action_id for action_id, _ in batch]):
+                attempts.update(self.conn.execute(
+                    f"SELECT id, attempts FROM follow_ups WHERE id IN ({placeholders})", chunk))
+            for (action_id, action), (ok, text) in zip(batch, outcomes):
+                if ok:
+                    done.append((DONE, text, finished_at, action_id))
+                elif attempts[action_id] < self.max_attempts:
+                    due = int(now + self.retry_delay * 2 ** (attempts[action_id] - 1))
+                    rank = PRIORITY_RANK.get(action.priority, len(PRIORITY_RANK))
+                    retry.append((PENDING, text, due, action_id))
+                    heapq.heappush(self._heap, _pack(due, rank, action_id))
+                else:
+                    failed.append((FAILED, text, finished_at, action_id))
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE follow_ups SET status = ?, result = ?, finished_at = ? WHERE id = ?", done)
+                self.conn.executemany(
+                    "UPDATE follow_ups SET status = ?, error = ?, finished_at = ? WHERE id = ?", failed)
+                self.conn.executemany("UPDATE follow_ups SET status = ?, error = ?, due = ? WHERE id = ?", retry)
+        summary["dispatched"] += len(batch)
+        summary["succeeded"] += len(done)
+        summary["retried"] += len(retry)
+        summary["failed"] += len(failed)
+
+    def run_forever(self, stop_event: threading.Event, poll_interval: float = 1.0):
+        """后台循环：发送到期动作，无到期动作时等待至下一个到期时间(不超过poll_interval)"""
+        while not stop_event.is_set():
+            try:
+                self.run_due()
+            except Exception as e:
+                # 单轮失败(如数据库被锁)不终止后台循环，下一轮重试
+                print(f"跟进动作发送失败: {str(e)}")
+            next_due = self.next_due()
+            wait = poll_interval if next_due is None else min(poll_interval, max(0.0, next_due - self.clock()))
+            stop_event.wait(wait)
+
+    def start(self, poll_interval: float = 1.0) -> threading.Thread:
+        """在后台线程中运行run_forever，已在运行时直接返回该线程"""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._stop_event = threading.Event()
+                self._worker = threading.Thread(target=self.run_forever, args=(self._stop_event, poll_interval),
+                                                name="followup-scheduler", daemon=True)
+                self._worker.start()
+            return self._worker
+
+    def stop(self, timeout: Optional[float] = None):
+        """通知后台线程退出，并等待正在发送的一轮结束"""
+        with self._lock:
+            worker, self._worker = self._worker, None
+        self._stop_event.set()
+        if worker is not None:
+            worker.join(timeout)
+
+    def get(self, action_id: int) -> Optional[Dict[str, Any]]:
+        """查询动作状态与结果"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT id, client, action, deadline, priority, due, status, attempts, result, error "
+                "FROM follow_ups WHERE id = ?", (action_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("id", "client", "action", "deadline", "priority", "due", "status", "attempts",
+                         "result", "error"), row))
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM follow_ups GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self):
+        self.stop()
+        self.conn.close()
@@ -0,0 +1,165 @@
+"""
+工业营销自动化系统主程序
+实现从战略洞察到执行追踪的全流程自动化
+"""
+
+from typing import Dict, Any, Callable, Optional
+
+from modules.tracing import span
+
+# 工作流阶段(按执行顺序)
+STAGES = ("strategy_insight", "planning", "content_creation", "execution", "analysis")
+
+# 示例活动数据，用于命令行演示与压测
+SAMPLE_CAMPAIGN = {
+    "client_data": {
+        "pain_points": ["设备维护成本高", "生产效率低"],
+        "operational_data": {"downtime": 15, "energy_consumption": 1200},
+        "critical_issues": ["安全合规"]
+    },
+    "competitor_data": {
+        "win_cases": [
+            {"client": "A公司", "solution": "智能维护系统", "value_prop": "降低维护成本30%"}
+        ],
+        "marketing_activities": [
+            {"channel": "行业展会", "content_type": "技术演示", "success_rate": 0.4}
+        ]
+    },
+    "market_data": {
+        "customer_segments": [
+            {"name": "制造业国企", "market_size": 500, "growth_rate": 0.15}
+        ],
+        "regional_data": [
+            {"name": "华东", "demand_level": 8, "competition_index": 3}
+        ]
+    }
+}
+
+
+class IndustrialMarketingSystem:
+    def __init__(self, knowledge_store=None, competitor_store=None, scheduler=None):
+        """
+        :param knowledge_store: 知识库，复盘阶段写入、战略洞察与计划阶段检索，未指定时创建默认库(本地数据目录)
+        :param competitor_store: 战略洞察阶段写入的竞品情报库
+        :param scheduler: 跟进动作调度器(FollowUpScheduler)，指定时执行阶段的下一步行动入队，由调度器到期发送
+        """
+        from modules.knowledge_store import KnowledgeStore
+
+        # 各阶段共用同一个知识库，复盘写入的经验在后续活动中可被检索到
+        self.knowledge_store = knowledge_store if knowledge_store is not None else KnowledgeStore()
+        self.competitor_store = competitor_store
+        self.scheduler = scheduler
+        self.modules = {
+            "strategy_insight": None,
+            "planning": None,
+            "content_creation": None,
+            "execution": None,
+            "analysis": None
+        }
+        self.campaign: Dict[str, Any] = {}
+
+    def strategy_insight(self):
+        """第一步：工业战略洞察与定向"""
+        from modules.strategy_insight import StrategyInsight
+
+        insight = self.modules["strategy_insight"] = StrategyInsight(knowledge_store=self.knowledge_store,
+                                                                       competitor_store=self.competitor_store)
+        insight.process_client_needs(self.campaign.get("client_data", {}))
+        insight.analyze_competition(self.campaign.get("competitor_data", {}))
+        insight.evaluate_market_opportunities(self.campaign.get("market_data", {}))
+        return insight.generate_strategy_brief()
+
+    def planning(self, strategy_brief):
+        """第二步：工业策略与计划制定"""
+        from modules.planning import Planning
+
+        planning = self.modules["planning"] = Planning(knowledge_store=self.knowledge_store)
+        planning.match_client_strategies(strategy_brief)
+        planning.calculate_pricing_strategies()
+        planning.develop_channel_strategies(total_budget=self.campaign.get("total_budget"))
+        return planning.generate_marketing_plan()
+
+    def content_creation(self, marketing_plan):
+        """第三步：工业内容创造与武装"""
+        from modules.content_creation import ContentCreation
+
+        content = self.modules["content_creation"] = ContentCreation()
+        content.generate_technical_materials(marketing_plan)
+        content.generate_sales_scripts()
+        return content.package_marketing_kit()
+
+    def execution(self, marketing_kit, marketing_plan=None):
+        """第四步：工业执行、互动与追踪"""
+        from modules.execution import Execution
+
+        execution = self.modules["execution"] = Execution(scheduler=self.scheduler)
+        # 弹药包只含物料与话术，发布渠道取自计划阶段的渠道组合
+        kit = dict(marketing_kit)
+        kit.setdefault("channel_strategies", (marketing_plan or {}).get("channel_strategies", {}))
+        execution.publish_to_channels(kit)
+        potential_clients = execution.channel_feedbacks["potential_clients"]
+        execution.interact_and_follow_up(execution.resolve_clients(potential_clients))
+        execution.track_sales_progress(execution.interaction_records)
+        return {
+            "potential_clients": potential_clients,
+            "client_entities": execution.client_entities,
+            "channel_feedbacks": execution.channel_feedbacks["feedbacks"],
+            "sales_progress": execution.sales_progress
+        }
+
+    def analysis(self, execution_results, marketing_plan=None):
+        """第五步：工业复盘、归因与进化"""
+        from modules.analysis import Analysis
+
+        analysis = self.modules["analysis"] = Analysis(knowledge_store=self.knowledge_store)
+        sales_data = dict(execution_results, client_strategies=(marketing_plan or {}).get("client_strategies", {}))
+        return {
+            "performance": analysis.analyze_performance(sales_data),
+            "success_factors": analysis.identify_success_factors(),
+            "failure_causes": analysis.diagnose_failure_causes(),
+            "knowledge_update": analysis.optimize_knowledge_base()
+        }
+
+    def run_campaign(self, campaign: Dict[str, Any],
+                     progress: Optional[Callable[[str, str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        执行单个营销活动的完整工作流
+        :param campaign: 活动数据(client_data/competitor_data/market_data，可选total_budget)
+        :param progress: 阶段进度回调 progress(阶段, 状态, 附加信息)，状态为started/completed
+        :return: 各阶段产出
+        """
+        report = progress or (lambda stage, status, detail: None)
+        self.campaign = campaign
+        results: Dict[str, Any] = {}
+
+        def run_stage(stage, func, *args):
+            report(stage, "started", {})
+            with span(stage, "stage"):
+                results[stage] = func(*args)
+            report(stage, "completed", {"keys": list(results[stage].keys())})
+            return results[stage]
+
+        with span("workflow", "workflow"):
+            strategy_brief = run_stage("strategy_insight", self.strategy_insight)
+            marketing_plan = run_stage("planning", self.planning, strategy_brief)
+            marketing_kit = run_stage("content_creation", self.content_creation, marketing_plan)
+            execution_results = run_stage("execution", self.execution, marketing_kit, marketing_plan)
+            run_stage("analysis", self.analysis, execution_results, marketing_plan)
+        return results
+
+    def run_workflow(self, campaign: Optional[Dict[str, Any]] = None):
+        """执行完整的工业营销工作流程"""
+        print("工业营销自动化系统启动...")
+
+        def report(stage, status, detail):
+            if status == "started":
+                print(f"[{STAGES.index(stage) + 1}/{len(STAGES)}] {stage} 开始")
+
+        results = self.run_campaign(campaign or SAMPLE_CAMPAIGN, report)
+
+        print("工业营销工作流程执行完成")
+        return results
+
+if __name__ == "__main__":
+    system = IndustrialMarketingSystem()
+    system.run_workflow()
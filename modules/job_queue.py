@@ -0,0 +1,192 @@
+"""
+任务队列模块
+基于SQLite的本地持久化任务队列，记录任务状态、结果与阶段事件，进程重启后可恢复
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional
+
+DEFAULT_DB_PATH = "job_queue.db"
+# 进程在任务执行中退出的次数达到该值后不再重新排队，避免导致崩溃的任务无限重试
+DEFAULT_MAX_ATTEMPTS = 3
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+FINISHED_STATUSES = (SUCCEEDED, FAILED)
+
+
+def _json_default(value):
+    """numpy数组/标量、集合与流程记录的JSON序列化"""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+
+class JobQueue:
+    def __init__(self, db_path: Optional[str] = None, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        """
+        :param db_path: 数据库文件路径，默认读取环境变量JOB_QUEUE_DB_PATH
+        :param max_attempts: 单个任务的最大执行次数，恢复时达到该值的任务标记为失败
+        """
+        self.db_path = db_path or os.environ.get("JOB_QUEUE_DB_PATH", DEFAULT_DB_PATH)
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+                CREATE TABLE IF NOT EXISTS job_events (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    data TEXT NOT NULL,
+                    attempt INTEGER NOT NULL DEFAULT 0,
+                    stale INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (job_id, seq)
+                ) WITHOUT ROWID;
+            """)
+            # 旧版数据库的事件表补充执行次数与过期标记列
+            columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(job_events)")}
+            for column in ("attempt", "stale"):
+                if column not in columns:
+                    self.conn.execute(f"ALTER TABLE job_events ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+
+    def submit(self, payload: Dict[str, Any]) -> str:
+        """提交任务，返回任务ID"""
+        job_id = uuid.uuid4().hex
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO jobs (id, status, payload, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, QUEUED, dumps(payload), time.time())
+            )
+        return job_id
+
+    def claim(self) -> Optional[tuple]:
+        """
+        领取最早排队的任务并标记为运行中
+        :return: (任务ID, 任务数据)，队列为空时返回None
+        """
+        with self._lock, self.conn:
+            row = self.conn.execute(
+                "SELECT id, payload FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (RUNNING, time.time(), row["id"])
+            )
+        return row["id"], json.loads(row["payload"])
+
+    def _insert_event(self, job_id: str, data: Dict[str, Any]) -> int:
+        """在当前事务内追加事件，记录任务当前的执行次数；序号不因过期事件而复用，Last-Event-ID续传不受影响"""
+        seq = self.conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) + 1 FROM job_events WHERE job_id = ?", (job_id,)
+        ).fetchone()[0]
+        self.conn.execute(
+            "INSERT INTO job_events (job_id, seq, created_at, data, attempt) "
+            "VALUES (?, ?, ?, ?, COALESCE((SELECT attempts FROM jobs WHERE id = ?), 0))",
+            (job_id, seq, time.time(), dumps(data), job_id)
+        )
+        return seq
+
+    def add_event(self, job_id: str, data: Dict[str, Any]) -> int:
+        """追加任务事件，返回事件序号(从1开始)"""
+        with self._lock, self.conn:
+            return self._insert_event(job_id, data)
+
+    def events(self, job_id: str, after_seq: int = 0) -> List[Dict[str, Any]]:
+        """读取序号大于after_seq的事件(不含中断执行留下的过期事件)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT seq, created_at, data, attempt FROM job_events WHERE job_id = ? AND seq > ? AND stale = 0 "
+                "ORDER BY seq", (job_id, after_seq)
+            ).fetchall()
+        return [dict(json.loads(row["data"]), seq=row["seq"], created_at=row["created_at"], attempt=row["attempt"])
+                for row in rows]
+
+    def _finish(self, job_id: str, status: str, result: Optional[str], error: Optional[str]):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, result, error, time.time(), job_id)
+            )
+
+    def complete(self, job_id: str, result: Any):
+        self._finish(job_id, SUCCEEDED, dumps(result), None)
+
+    def fail(self, job_id: str, error: str):
+        self._finish(job_id, FAILED, None, error)
+
+    def get(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        """查询任务状态(及结果)"""
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = {key: row[key] for key in ("id", "status", "error", "attempts", "created_at", "started_at", "finished_at")}
+        if include_result:
+            job["result"] = json.loads(row["result"]) if row["result"] else None
+        return job
+
+    def recover(self) -> int:
+        """
+        处理上次进程退出时仍在运行的任务，返回重新排队的数量
+        中断执行产生的阶段事件标记为过期；执行次数已达max_attempts的任务标记为失败，不再排队
+        """
+        requeued = 0
+        with self._lock, self.conn:
+            rows = self.conn.execute("SELECT id, attempts FROM jobs WHERE status = ?", (RUNNING,)).fetchall()
+            for row in rows:
+                job_id, attempts = row["id"], row["attempts"]
+                self.conn.execute("UPDATE job_events SET stale = 1 WHERE job_id = ? AND attempt = ?",
+                                  (job_id, attempts))
+                if attempts >= self.max_attempts:
+                    error = f"执行{attempts}次均因进程中断未完成，不再重试"
+                    print(f"任务{job_id}{error}")
+                    self.conn.execute(
+                        "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                        (FAILED, error, time.time(), job_id)
+                    )
+                    self._insert_event(job_id, {"event": FAILED, "error": error})
+                else:
+                    self.conn.execute("UPDATE jobs SET status = ?, started_at = NULL WHERE id = ?", (QUEUED, job_id))
+                    self._insert_event(job_id, {"event": "requeued"})
+                    requeued += 1
+        return requeued
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,337 @@
+"""
+营销弹药包导出模块
+将package_marketing_kit的结果渲染为HTML/XLSX/PDF文件，逐段写入磁盘，
+批量导出时使用进程池并行渲染
+"""
+
+import html
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Sequence
+from xml.sax.saxutils import escape
+
+EXPORT_FORMATS = ("html", "xlsx", "pdf")
+# 技术物料的格式标签 -> 导出格式
+FORMAT_LABELS = {"PDF": "pdf", "Excel": "xlsx", "HTML": "html"}
+# 文件名中不允许的字符：路径分隔符、控制字符与Windows保留字符
+_UNSAFE_FILENAME = re.compile(r'[\x00-\x1f<>:"/\\|?*]+')
+# 文件名(不含扩展名)的UTF-8字节上限，常见文件系统单个文件名上限为255字节
+_MAX_FILENAME_BYTES = 200
+
+
+def safe_filename(name: Any, default: str) -> str:
+    """
+    清理为只能落在导出目录内的文件名：路径分隔符等替换为下划线，去掉首尾的点与空格(排除..)；
+    清理后为空时使用默认名
+    """
+    cleaned = _UNSAFE_FILENAME.sub("_", str(name)).strip(" .")
+    cleaned = cleaned.encode("utf-8")[:_MAX_FILENAME_BYTES].decode("utf-8", "ignore").rstrip(" .")
+    return cleaned or default
+
+
+def _materials(kit: Dict[str, Any]) -> List[Dict[str, Any]]:
+    materials = kit.get("technical_materials") or {}
+    return materials.get("materials", []) if isinstance(materials, dict) else list(materials)
+
+
+def _scenarios(kit: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return (kit.get("sales_scripts") or {}).get("scenarios", [])
+
+
+def _variants(scenario: Dict[str, Any]) -> List[str]:
+    return scenario.get("variants") or [scenario.get("script", "")]
+
+
+# ---- HTML(沿用原型页面的布局与样式) ----
+
+HTML_STYLE = """
+        body { font-family: "Microsoft YaHei", sans-serif; margin: 0; background: #f5f7fa; color: #333; }
+        header { background: #1e3a8a; color: #fff; padding: 20px 40px; }
+        .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
+        section { background: #fff; border-radius: 8px; padding: 20px; margin-bottom: 20px; }
+        .workflow { display: flex; flex-wrap: wrap; gap: 20px; }
+        .step { flex: 1 1 320px; border: 1px solid #ddd; border-radius: 8px; padding: 15px; }
+        .step h3 { color: #1e3a8a; margin-top: 0; }
+        .chat-container { margin-top: 20px; border: 1px solid #ddd; border-radius: 5px; padding: 10px; max-height: 300px; overflow-y: auto; }
+        .chat-message { margin: 5px; padding: 8px 12px; border-radius: 15px; max-width: 70%; white-space: pre-wrap; }
+        .user-message { background: #e3f2fd; margin-left: auto; }
+        .bot-message { background: #f1f1f1; margin-right: auto; }
+        .tag { display: inline-block; padding: 2px 8px; border-radius: 10px; background: #e3f2fd; font-size: 12px; }
+"""
+
+
+def write_html(kit: Dict[str, Any], path: str, title: str = "工业营销弹药包"):
+    """按原型的header/container/workflow/step结构逐段写出HTML"""
+    esc = html.escape
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<!DOCTYPE html>\n<html lang="zh-CN">\n<head>\n    <meta charset="UTF-8">\n'
+                '    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+                f"    <title>{esc(title)}</title>\n    <style>{HTML_STYLE}    </style>\n</head>\n<body>\n")
+        f.write(f"    <header>\n        <h1>{esc(title)}</h1>\n        <p>技术物料与场景化销售话术</p>\n    </header>\n")
+        f.write('    <div class="container">\n        <section>\n            <h2>技术物料</h2>\n'
+                '            <div class="workflow">\n')
+        for material in _materials(kit):
+            tag = "已优化" if material.get("optimized") else "模板内容"
+            f.write('                <div class="step">\n'
+                    f"                    <h3>{esc(material.get('title', ''))}</h3>\n"
+                    f"                    <span class=\"tag\">{esc(material.get('type', ''))} · {tag}</span>\n"
+                    '                    <div class="chat-container">\n'
+                    f"                        <div class=\"bot-message chat-message\">{esc(str(material.get('content', '')))}</div>\n"
+                    "                    </div>\n                </div>\n")
+        f.write("            </div>\n        </section>\n")
+        f.write('        <section class="demo-area">\n            <h2>销售话术</h2>\n')
+        for scenario in _scenarios(kit):
+            f.write('            <div class="chat-container">\n'
+                    f"                <div class=\"user-message chat-message\">{esc(scenario.get('client_type', '通用'))} · "
+                    f"{esc(scenario.get('type', ''))}</div>\n")
+            for variant in _variants(scenario):
+                f.write(f"                <div class=\"bot-message chat-message\">{esc(variant)}</div>\n")
+            f.write("            </div>\n")
+        f.write("        </section>\n    </div>\n</body>\n</html>\n")
+
+
+# ---- XLSX(直接写OOXML，工作表行数据流式写入压缩包) ----
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+{sheets}
+</Types>"""
+_SHEET_TYPE = ('<Override PartName="/xl/worksheets/sheet{index}.xml" '
+               'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>')
+_ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _column_name(index: int) -> str:
+    name = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        name = chr(65 + rem) + name
+    return name
+
+
+def _cell(ref: str, value: Any) -> str:
+    if isinstance(value, bool) or value is None:
+        value = "" if value is None else str(value)
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    text = escape(_XML_INVALID.sub("", str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def write_xlsx(sheets: Dict[str, Iterable[Sequence[Any]]], path: str):
+    """
+    写出多工作表XLSX
+    :param sheets: 工作表名 -> 行迭代器，行在写入时逐条消费
+    """
+    names = list(sheets)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES.format(
+            sheets="\n".join(_SHEET_TYPE.format(index=i + 1) for i in range(len(names)))))
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        archive.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + "".join(f'<sheet name="{escape(name[:31])}" sheetId="{i + 1}" r:id="rId{i + 1}"/>'
+                      for i, name in enumerate(names))
+            + "</sheets></workbook>"))
+        archive.writestr("xl/_rels/workbook.xml.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(f'<Relationship Id="rId{i + 1}" '
+                      'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                      f'Target="worksheets/sheet{i + 1}.xml"/>' for i in range(len(names)))
+            + "</Relationships>"))
+        for i, name in enumerate(names):
+            with archive.open(f"xl/worksheets/sheet{i + 1}.xml", "w", force_zip64=True) as sheet:
+                sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                            b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+                for r, row in enumerate(sheets[name], start=1):
+                    cells = "".join(_cell(f"{_column_name(c)}{r}", value) for c, value in enumerate(row))
+                    sheet.write(f'<row r="{r}">{cells}</row>'.encode("utf-8"))
+                sheet.write(b"</sheetData></worksheet>")
+
+
+def kit_sheets(kit: Dict[str, Any]) -> Dict[str, Iterator[Sequence[Any]]]:
+    """弹药包的工作表视图：技术物料与销售话术各一张表"""
+    def material_rows():
+        yield ("类型", "标题", "是否优化", "内容")
+        for material in _materials(kit):
+            yield (material.get("type", ""), material.get("title", ""),
+                   "是" if material.get("optimized") else "否", material.get("content", ""))
+
+    def script_rows():
+        yield ("客户类型", "场景", "变体序号", "话术")
+        for scenario in _scenarios(kit):
+            for i, variant in enumerate(_variants(scenario), start=1):
+                yield (scenario.get("client_type", "通用"), scenario.get("type", ""), i, variant)
+
+    return {"技术物料": material_rows(), "销售话术": script_rows()}
+
+
+# ---- PDF(内置中文字体STSong-Light，按页写出) ----
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+MARGIN = 50
+
+
+def _wrap(text: str, size: float, width: float) -> Iterator[str]:
+    for paragraph in str(text).splitlines() or [""]:
+        line, used = "", 0.0
+        for ch in paragraph:
+            w = size if ord(ch) > 0x2E7F else size / 2
+            if used + w > width and line:
+                yield line
+                line, used = "", 0.0
+            line += ch
+            used += w
+        yield line
+
+
+def _pdf_text(text: str) -> str:
+    """UniGB-UCS2-H编码：UCS-2大端十六进制，超出基本平面的字符替换为问号"""
+    return "<" + "".join(f"{ord(ch) if ord(ch) < 0x10000 else 0x3F:04X}" for ch in text) + ">"
+
+
+class _PdfWriter:
+    """顺序写出PDF对象并记录偏移，页树对象最后写入"""
+
+    CATALOG, PAGES, FONT, CID_FONT, DESCRIPTOR = 1, 2, 3, 4, 5
+
+    def __init__(self, f):
+        self.f = f
+        self.offsets: Dict[int, int] = {}
+        self.pages: List[int] = []
+        self.next_id = 6
+        self.f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def write_object(self, number: int, body: bytes):
+        self.offsets[number] = self.f.tell()
+        self.f.write(f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+
+    def add_page(self, content: str):
+        stream = content.encode("latin-1")
+        content_id, page_id = self.next_id, self.next_id + 1
+        self.next_id += 2
+        self.write_object(content_id, f"<< /Length {len(stream)} >>\nstream\n".encode("ascii") + stream + b"\nendstream")
+        self.write_object(page_id, (
+            f"<< /Type /Page /Parent {self.PAGES} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 {self.FONT} 0 R >> >> /Contents {content_id} 0 R >>").encode("ascii"))
+        self.pages.append(page_id)
+
+    def close(self):
+        self.write_object(self.CATALOG, f"<< /Type /Catalog /Pages {self.PAGES} 0 R >>".encode("ascii"))
+        self.write_object(self.FONT, (
+            f"<< /Type /Font /Subtype /Type0 /BaseFont /STSong-Light /Encoding /UniGB-UCS2-H "
+            f"/DescendantFonts [{self.CID_FONT} 0 R] >>").encode("ascii"))
+        self.write_object(self.CID_FONT, (
+            "<< /Type /Font /Subtype /CIDFontType0 /BaseFont /STSong-Light "
+            "/CIDSystemInfo << /Registry (Adobe) /Ordering (GB1) /Supplement 4 >> "
+            f"/FontDescriptor {self.DESCRIPTOR} 0 R /DW 1000 /W [1 95 500] >>").encode("ascii"))
+        self.write_object(self.DESCRIPTOR, (
+            "<< /Type /FontDescriptor /FontName /STSong-Light /Flags 6 /FontBBox [-25 -254 1000 880] "
+            "/ItalicAngle 0 /Ascent 880 /Descent -120 /CapHeight 880 /StemV 93 >>").encode("ascii"))
+        kids = " ".join(f"{page} 0 R" for page in self.pages)
+        self.write_object(self.PAGES, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.pages)} >>".encode("ascii"))
+
+        xref_offset = self.f.tell()
+        size = self.next_id
+        self.f.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode("ascii"))
+        for number in range(1, size):
+            self.f.write(f"{self.offsets[number]:010d} 00000 n \n".encode("ascii"))
+        self.f.write(f"trailer\n<< /Size {size} /Root {self.CATALOG} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("ascii"))
+
+
+def kit_lines(kit: Dict[str, Any], title: str) -> Iterator[tuple]:
+    """弹药包的排版行：(字号, 文本)"""
+    yield 18, title
+    yield 14, "技术物料"
+    for material in _materials(kit):
+        yield 12, f"{material.get('title', '')}({material.get('type', '')})"
+        yield 10, str(material.get("content", ""))
+    yield 14, "销售话术"
+    for scenario in _scenarios(kit):
+        yield 12, f"{scenario.get('client_type', '通用')} · {scenario.get('type', '')}"
+        for i, variant in enumerate(_variants(scenario), start=1):
+            yield 10, f"{i}. {variant}"
+
+
+def write_pdf(lines: Iterable[tuple], path: str):
+    """逐页排版并写出，内存中只保留当前页"""
+    width = PAGE_WIDTH - 2 * MARGIN
+    with open(path, "wb") as f:
+        writer = _PdfWriter(f)
+        ops: List[str] = []
+        y = PAGE_HEIGHT - MARGIN
+        for size, text in lines:
+            for line in _wrap(text, size, width):
+                leading = size * 1.5
+                if y - leading < MARGIN:
+                    writer.add_page("\n".join(ops))
+                    ops, y = [], PAGE_HEIGHT - MARGIN
+                y -= leading
+                ops.append(f"BT /F1 {size} Tf {MARGIN} {y:.1f} Td {_pdf_text(line)} Tj ET")
+        writer.add_page("\n".join(ops))
+        writer.close()
+
+
+# ---- 导出入口 ----
+
+def export_kit(kit: Dict[str, Any], output_dir: str, name: str = "marketing_kit",
+               formats: Iterable[str] = EXPORT_FORMATS, title: str = "工业营销弹药包") -> Dict[str, str]:
+    """
+    导出单个弹药包
+    :return: 导出格式 -> 文件路径
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    name = safe_filename(name, "marketing_kit")
+    paths = {}
+    for fmt in dict.fromkeys(formats):
+        path = os.path.join(output_dir, f"{name}.{fmt}")
+        if fmt == "html":
+            write_html(kit, path, title)
+        elif fmt == "xlsx":
+            write_xlsx(kit_sheets(kit), path)
+        elif fmt == "pdf":
+            write_pdf(kit_lines(kit, title), path)
+        else:
+            raise ValueError(f"不支持的导出格式: {fmt}")
+        paths[fmt] = path
+    return paths
+
+
+def _export_job(args):
+    return export_kit(*args)
+
+
+def export_kits(kits: Iterable[Dict[str, Any]], output_dir: str, formats: Iterable[str] = EXPORT_FORMATS,
+                max_workers: Optional[int] = None, chunksize: int = 16) -> List[Dict[str, str]]:
+    """
+    进程池批量导出，结果按输入顺序返回
+    :param kits: 弹药包列表，含name字段时清理后用作文件名，与前面的文件名重复时追加序号
+    :param max_workers: 进程数，默认等于CPU核数；为1时在当前进程内顺序导出
+    """
+    formats = tuple(formats)
+    jobs = []
+    seen = set()
+    for i, kit in enumerate(kits):
+        name = safe_filename(kit.get("name", ""), f"kit_{i:05d}")
+        # 各进程并行写入，同名会互相覆盖；按不区分大小写比较，兼顾大小写不敏感的文件系统
+        while name.lower() in seen:
+            name = f"{name}_{i:05d}"
+        seen.add(name.lower())
+        jobs.append((kit, output_dir, name, formats))
+    if max_workers == 1 or len(jobs) <= 1:
+        return [_export_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_export_job, jobs, chunksize=chunksize))
@@ -0,0 +1,196 @@
+"""
+营销知识库存储模块
+基于SQLite FTS5持久化策略、模板与经验条目，支持标签/全文检索与插入去重
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Iterable, List, Optional
+
+from modules.services import data_path
+from modules.text_features import normalize_text, tokenize
+
+# 默认数据库文件名，位于本地数据目录(见modules.services.data_path)，跨进程保留
+DEFAULT_DB_NAME = "knowledge_base.db"
+
+
+class KnowledgeStore:
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        :param db_path: 数据库文件路径，默认读取环境变量KNOWLEDGE_DB_PATH，未设置时为本地数据目录下的knowledge_base.db
+        """
+        self.db_path = db_path or os.environ.get("KNOWLEDGE_DB_PATH") or data_path(DEFAULT_DB_NAME)
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    id INTEGER PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    tags TEXT NOT NULL DEFAULT '[]',
+                    meta TEXT NOT NULL DEFAULT '{}',
+                    fingerprint TEXT NOT NULL UNIQUE,
+                    occurrences INTEGER NOT NULL DEFAULT 1,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_entries_kind ON entries(kind, occurrences);
+                CREATE TABLE IF NOT EXISTS entry_tags (
+                    tag TEXT NOT NULL,
+                    entry_id INTEGER NOT NULL,
+                    PRIMARY KEY (tag, entry_id)
+                ) WITHOUT ROWID;
+                CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(terms);
+            """)
+
+    @staticmethod
+    def fingerprint(kind: str, title: str, content: str) -> str:
+        """去重指纹：规范化后的类型+标题+内容"""
+        key = "\x1f".join([kind, normalize_text(title), normalize_text(content)])
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _index_terms(self, title: str, content: str, tags: Iterable[str]) -> str:
+        return " ".join(tokenize(" ".join([title, content, *tags])))
+
+    def _add(self, kind: str, title: str, content: str, tags: Iterable[str], meta: Dict[str, Any]) -> tuple:
+        """在当前事务内插入或合并一条记录，返回(条目id, 是否新增)"""
+        tags = list(dict.fromkeys(tags))
+        fingerprint = self.fingerprint(kind, title, content)
+        now = time.time()
+        row = self.conn.execute(
+            "SELECT id, tags FROM entries WHERE fingerprint = ?", (fingerprint,)
+        ).fetchone()
+
+        if row is None:
+            cursor = self.conn.execute(
+                "INSERT INTO entries (kind, title, content, tags, meta, fingerprint, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, title, content, json.dumps(tags, ensure_ascii=False),
+                 json.dumps(meta, ensure_ascii=False), fingerprint, now, now)
+            )
+            entry_id = cursor.lastrowid
+            created = True
+            merged_tags = tags
+        else:
+            # 重复条目：累计出现次数并合并标签
+            entry_id = row["id"]
+            created = False
+            merged_tags = list(dict.fromkeys(json.loads(row["tags"]) + tags))
+            self.conn.execute(
+                "UPDATE entries SET occurrences = occurrences + 1, tags = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(merged_tags, ensure_ascii=False), now, entry_id)
+            )
+            self.conn.execute("DELETE FROM entries_fts WHERE rowid = ?", (entry_id,))
+
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO entry_tags (tag, entry_id) VALUES (?, ?)",
+            [(tag, entry_id) for tag in merged_tags]
+        )
+        self.conn.execute(
+            "INSERT INTO entries_fts (rowid, terms) VALUES (?, ?)",
+            (entry_id, self._index_terms(title, content, merged_tags))
+        )
+        return entry_id, created
+
+    def add_entry(self, kind: str, title: str, content: str,
+                  tags: Iterable[str] = (), meta: Optional[Dict[str, Any]] = None) -> tuple:
+        """
+        写入一条知识，内容相同的条目只保留一份
+        :return: (条目id, 是否新增)
+        """
+        with self._lock, self.conn:
+            # 其他进程可能同时写入同一知识库，事务开始即占用写锁以保证指纹去重
+            self.conn.execute("BEGIN IMMEDIATE")
+            return self._add(kind, title, content, tags, meta or {})
+
+    def add_entries(self, kind: str, entries: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        批量写入(单个事务)
+        :param entries: 含title/content/tags/meta字段的条目
+        :return: 新增与去重数量
+        """
+        added = deduplicated = 0
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            for entry in entries:
+                _, created = self._add(kind, entry["title"], entry["content"],
+                                       entry.get("tags", ()), entry.get("meta", {}))
+                if created:
+                    added += 1
+                else:
+                    deduplicated += 1
+        return {"added": added, "deduplicated": deduplicated}
+
+    def _to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        result = {
+            "id": row["id"],
+            "kind": row["kind"],
+            "title": row["title"],
+            "content": row["content"],
+            "tags": json.loads(row["tags"]),
+            "meta": json.loads(row["meta"]),
+            "occurrences": row["occurrences"]
+        }
+        if "score" in row.keys():
+            result["score"] = -row["score"]
+        return result
+
+    def search(self, query: str, kind: Optional[str] = None,
+               tags: Iterable[str] = (), top_k: int = 5) -> List[Dict[str, Any]]:
+        """
+        全文检索，按BM25相关度返回top_k条
+        :param kind: 限定条目类型(strategy/template/experience)
+        :param tags: 限定包含任一标签
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return self.find_by_tag(*tags, kind=kind, top_k=top_k) if tags else []
+
+        match = " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        sql = ("SELECT e.*, bm25(entries_fts) AS score FROM entries_fts "
+               "JOIN entries e ON e.id = entries_fts.rowid WHERE entries_fts MATCH ?")
+        params: list = [match]
+        if kind:
+            sql += " AND e.kind = ?"
+            params.append(kind)
+        tags = list(tags)
+        if tags:
+            sql += f" AND e.id IN (SELECT entry_id FROM entry_tags WHERE tag IN ({','.join('?' * len(tags))}))"
+            params.extend(tags)
+        sql += " ORDER BY score, e.occurrences DESC LIMIT ?"
+        params.append(top_k)
+
+        with self._lock:
+            return [self._to_dict(row) for row in self.conn.execute(sql, params)]
+
+    def find_by_tag(self, *tags: str, kind: Optional[str] = None, top_k: int = 20) -> List[Dict[str, Any]]:
+        """按标签查找，出现次数多的条目优先"""
+        sql = ("SELECT DISTINCT e.* FROM entry_tags t JOIN entries e ON e.id = t.entry_id "
+               f"WHERE t.tag IN ({','.join('?' * len(tags))})")
+        params: list = list(tags)
+        if kind:
+            sql += " AND e.kind = ?"
+            params.append(kind)
+        sql += " ORDER BY e.occurrences DESC, e.updated_at DESC LIMIT ?"
+        params.append(top_k)
+        with self._lock:
+            return [self._to_dict(row) for row in self.conn.execute(sql, params)]
+
+    def count(self, kind: Optional[str] = None) -> int:
+        with self._lock:
+            if kind:
+                return self.conn.execute("SELECT COUNT(*) FROM entries WHERE kind = ?", (kind,)).fetchone()[0]
+            return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,191 @@
+"""
+大模型调度器模块
+实现多模型调度和智能任务分发
+"""
+
+from typing import Dict, Any, Optional, List, Union
+import threading
+import time
+import hashlib
+import json
+
+from modules.tracing import propagate, span, traced
+
+
+class ProviderError(Exception):
+    """提供商调用失败(可重试)"""
+
+    def __init__(self, message: str, status: int = 500, retry_after: float = 0.0):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class RateLimitError(ProviderError):
+    """提供商限流(HTTP 429)"""
+
+    def __init__(self, message: str = "请求过于频繁", retry_after: float = 1.0):
+        super().__init__(message, status=429, retry_after=retry_after)
+
+
+# 默认提供商：未显式指定provider的调度器均使用它，便于压测时整体替换为模拟提供商
+_default_provider = None
+
+
+def set_default_provider(provider):
+    """设置进程内默认提供商，传入None恢复内置模拟响应"""
+    global _default_provider
+    _default_provider = provider
+
+
+def get_default_provider():
+    return _default_provider
+
+
+class LLMOrchestrator:
+    def __init__(self, provider=None, max_retries: int = 2, max_cache_entries: int = 4096):
+        """
+        :param provider: 提供商实现，需提供complete(prompt, task_type=..., model=...)方法；
+                         未指定时每次调用使用当前的默认提供商
+        :param max_retries: 提供商返回可重试错误(限流/服务端错误)时的最大重试次数
+        :param max_cache_entries: 响应缓存条数上限，调度器在进程内共享时避免缓存无限增长
+        """
+        self.provider = provider
+        self.max_retries = max_retries
+        self.max_cache_entries = max_cache_entries
+        # 提供商配置 (实际使用时替换XXX为真实值)
+        self.providers = {
+            "wenxin": {
+                "api_key": "XXX",
+                "endpoint": "https://aip.baidubce.com/xxx",
+                "models": ["ERNIE-Bot", "ERNIE-Bot-turbo"],
+                "priority": 1
+            },
+            "openai": {
+                "api_key": "XXX",
+                "endpoint": "https://api.openai.com/v1",
+                "models": ["gpt-4", "gpt-3.5-turbo"],
+                "priority": 2
+            }
+        }
+        
+        # 缓存配置
+        self.cache_enabled = True
+        self.cache: Dict[str, Any] = {}
+        
+        # 性能统计
+        self.stats = {
+            "total_requests": 0,
+            "successful_requests": 0,
+            "total_tokens": 0,
+            "retries": 0
+        }
+        # 并发分发时保护缓存与统计
+        self._lock = threading.Lock()
+
+    def _get_cache_key(self, provider: str, model: str, prompt: str) -> str:
+        """生成缓存键"""
+        key_str = f"{provider}:{model}:{prompt}"
+        return hashlib.md5(key_str.encode()).hexdigest()
+
+    def _call_provider_api(self, provider: str, model: str, prompt: str, **kwargs) -> Any:
+        """调用具体提供商API (未配置提供商时为模拟实现)"""
+        provider_impl = self.provider if self.provider is not None else get_default_provider()
+        if provider_impl is not None:
+            return provider_impl.complete(prompt, model=model, **kwargs)
+        # 模拟返回结果
+        return {
+            "response": f"这是{provider} {model}对提示词'{prompt[:20]}...'的模拟响应",
+            "tokens_used": 100,
+            "success": True
+        }
+
+    @traced("llm.dispatch", "llm")
+    def dispatch_request(self, task_type: str, prompt: str, **kwargs) -> Dict[str, Any]:
+        """
+        智能任务分发
+        :param task_type: 任务类型 (strategy/creation/analysis等)
+        :param prompt: 提示词
+        :return: 响应结果
+        """
+        start_time = time.time()
+        with self._lock:
+            self.stats["total_requests"] += 1
+        
+        # 1. 检查缓存
+        cache_key = self._get_cache_key("wenxin", "ERNIE-Bot", prompt)
+        if self.cache_enabled and cache_key in self.cache:
+            # 标记缓存命中(返回副本，不改动缓存条目)，耗时统计等调用方据此区分
+            return dict(self.cache[cache_key], cached=True)
+        
+        # 2. 根据任务类型选择模型
+        provider_config = self.providers["wenxin"]  # 默认使用文心
+        
+        # 3. 调用API(限流与服务端错误按提供商给出的等待时间重试)
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    with span("llm.call", "llm", task_type=task_type, attempt=attempt):
+                        result = self._call_provider_api(
+                            provider="wenxin",
+                            model="ERNIE-Bot",
+                            prompt=prompt,
+                            task_type=task_type,
+                            **kwargs
+                        )
+                    break
+                except ProviderError as e:
+                    if attempt == self.max_retries:
+                        raise
+                    with self._lock:
+                        self.stats["retries"] += 1
+                    with span("llm.retry_wait", "sleep", seconds=e.retry_after):
+                        time.sleep(e.retry_after)
+            
+            if result["success"]:
+                with self._lock:
+                    self.stats["successful_requests"] += 1
+                    self.stats["total_tokens"] += result.get("tokens_used", 0)
+                    
+                    # 缓存结果(超出上限时淘汰最早写入的条目)
+                    if self.cache_enabled:
+                        self.cache[cache_key] = result
+                        if len(self.cache) > self.max_cache_entries:
+                            del self.cache[next(iter(self.cache))]
+                
+                return result
+            else:
+                raise Exception("API调用返回失败")
+                
+        except Exception as e:
+            # TODO: 实现降级逻辑
+            raise Exception(f"API调用失败: {str(e)}")
+        finally:
+            elapsed = time.time() - start_time
+            print(f"请求完成，耗时: {elapsed:.2f}s")
+
+    def dispatch_batch(self, task_type: str, prompts: List[str], max_workers: int = 8,
+                       **kwargs) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        批量并发分发
+        相同提示词只请求一次；结果按输入顺序返回，失败项返回异常对象，由调用方逐项降级
+        :param max_workers: 并发线程数上限
+        """
+        # 线程池仅在批量分发时加载，单次调用路径不引入concurrent.futures的导入开销
+        from concurrent.futures import ThreadPoolExecutor
+        
+        unique = list(dict.fromkeys(prompts))
+        if not unique:
+            return []
+        
+        # 工作线程中的调用挂在当前区间之下
+        @propagate
+        def call(prompt):
+            try:
+                return self.dispatch_request(task_type, prompt, **kwargs)
+            except Exception as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique)))) as pool:
+            results = dict(zip(unique, pool.map(call, unique)))
+        return [results[prompt] for prompt in prompts]
\ No newline at end of file
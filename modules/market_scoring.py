@@ -0,0 +1,123 @@
+"""
+市场机会评分模块
+基于NumPy一次性计算区域机会指数、行业加权评级、客户细分优先级与区域×行业热力图
+"""
+
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+# 评分权重：行业评级中增长潜力/盈利能力的权重，热力图中区域/行业的权重
+DEFAULT_SCORING_WEIGHTS: Dict[str, float] = {
+    "growth_potential": 0.6,
+    "profitability": 0.4,
+    "region": 0.5,
+    "industry": 0.5
+}
+
+
+def _column(items: List[Dict[str, Any]], key: str) -> np.ndarray:
+    return np.fromiter((item[key] for item in items), dtype=float, count=len(items))
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """得分最高的k个下标(降序)，argpartition避免全量排序"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=int)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def _normalize(values: np.ndarray) -> np.ndarray:
+    if not len(values):
+        return values
+    low, high = values.min(), values.max()
+    return np.ones_like(values) if high == low else (values - low) / (high - low)
+
+
+class MarketScoringEngine:
+    def __init__(self, weights: Optional[Dict[str, float]] = None, priority_growth: float = 0.1,
+                 min_target_size: float = 1000, top_k: int = 5):
+        """
+        :param weights: 评分权重，缺省项使用DEFAULT_SCORING_WEIGHTS
+        :param priority_growth: 增长率高于该值的客户细分列为高优先级
+        :param min_target_size: 目标客户细分的最小市场规模
+        :param top_k: 各维度返回的头部数量
+        """
+        self.weights = dict(DEFAULT_SCORING_WEIGHTS, **(weights or {}))
+        self.priority_growth = priority_growth
+        self.min_target_size = min_target_size
+        self.top_k = top_k
+
+    def score(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        工业市场机会评分
+        输入: 工业市场定向数据
+        输出: 客户画像、区域机会、行业评级、头部选择与热力图
+        """
+        segments = market_data.get("customer_segments", [])
+        regions = market_data.get("regional_data", [])
+        trends = market_data.get("industry_trends", [])
+
+        # 客户细分
+        size = _column(segments, "market_size")
+        growth = _column(segments, "growth_rate")
+        high_priority = growth > self.priority_growth
+        target = np.flatnonzero(high_priority & (size > self.min_target_size))
+        target = target[np.argsort(-(size[target] * growth[target]), kind="stable")]
+
+        # 区域机会指数 = 需求水平 / max(1, 竞争指数)
+        opportunity = _column(regions, "demand_level") / np.maximum(1.0, _column(regions, "competition_index"))
+
+        # 行业加权评级
+        rating = (_column(trends, "growth_potential") * self.weights["growth_potential"]
+                  + _column(trends, "profitability") * self.weights["profitability"])
+        rating_order = np.argsort(-rating, kind="stable")
+
+        # 区域×行业热力图：归一化后按权重做几何加权
+        heat_map = (_normalize(opportunity)[:, None] ** self.weights["region"]
+                    * _normalize(rating)[None, :] ** self.weights["industry"])
+
+        top_regions = _top_k(opportunity, self.top_k)
+        flat_top = _top_k(heat_map.ravel(), self.top_k) if heat_map.size else np.array([], dtype=int)
+
+        return {
+            "customer_profiles": [
+                {
+                    "segment": segment["name"],
+                    "size": segment["market_size"],
+                    "growth": segment["growth_rate"],
+                    "priority": "高" if high_priority[i] else "中"
+                } for i, segment in enumerate(segments)
+            ],
+            "regional_opportunities": [
+                {
+                    "region": region["name"],
+                    "demand": region["demand_level"],
+                    "competition": region["competition_index"],
+                    "opportunity": float(opportunity[i])
+                } for i, region in enumerate(regions)
+            ],
+            "industry_ratings": [
+                {
+                    "industry": trends[i]["industry"],
+                    "rating": float(rating[i]),
+                    "trend": trends[i]["key_trend"]
+                } for i in rating_order
+            ],
+            "target_segments": [segments[i]["name"] for i in target],
+            "top_regions": [regions[i]["name"] for i in top_regions],
+            "top_cells": [
+                {
+                    "region": regions[i // len(trends)]["name"],
+                    "industry": trends[i % len(trends)]["industry"],
+                    "score": float(heat_map.flat[i])
+                } for i in flat_top
+            ],
+            "heat_map": {
+                "regions": [region["name"] for region in regions],
+                "industries": [trend["industry"] for trend in trends],
+                "matrix": heat_map
+            }
+        }
@@ -0,0 +1,306 @@
+"""
+模拟大模型提供商模块
+按种子确定性地模拟首字延迟、生成速率、服务端错误与429限流，并为每个提示词模板返回
+格式合法的JSON/Markdown响应；可在进程内直接使用，也可作为本地HTTP桩服务运行
+用法: python -m modules.mock_provider --port 8900 --latency-ms 800 --rate-limit-rate 0.05
+"""
+
+import argparse
+import hashlib
+import http.client
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Callable, Optional
+
+from modules.llm_orchestrator import ProviderError, RateLimitError
+
+_CJK = re.compile(r"[一-鿿]")
+_VARIANT_COUNT = re.compile(r"生成(\d+)条")
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算token数：中文每字约1个token，其余字符约4个字符1个token"""
+    cjk = len(_CJK.findall(text))
+    return max(1, cjk + (len(text) - cjk) // 4)
+
+
+def _strategy_analysis(prompt: str, rng: random.Random) -> str:
+    feasibility = ["高", "中", "低"]
+    return json.dumps({
+        "opportunities": [
+            {
+                "name": f"市场机会{i + 1}",
+                "feasibility": rng.choice(feasibility),
+                "strategy": rng.choice(["聚焦头部客户", "渠道下沉", "联合解决方案", "以旧换新"])
+            } for i in range(3)
+        ]
+    }, ensure_ascii=False)
+
+
+def _content_creation(prompt: str, rng: random.Random) -> str:
+    benefits = rng.sample(["降低停机时间", "节能降耗", "快速部署", "合规认证", "远程运维", "全生命周期服务"], 2)
+    return ("# 工业智能化解决方案\n\n"
+            "## 核心优势\n"
+            + "".join(f"- {benefit}\n" for benefit in benefits)
+            + "\n## 成功案例\n"
+            + "".join(f"{i + 1}. 某制造企业实施后效率提升{rng.randint(10, 40)}%\n" for i in range(3)))
+
+
+def _failure_analysis(prompt: str, rng: random.Random) -> str:
+    causes = rng.sample(["渠道线索质量低", "方案报价偏高", "跟进周期过长", "技术演示不足"], 3)
+    return json.dumps({
+        "root_causes": [
+            {"cause": cause, "evidence": "统计摘要中的异常标记", "improvement": f"针对{cause}制定改进措施"}
+            for cause in causes
+        ]
+    }, ensure_ascii=False)
+
+
+def _sales_script(prompt: str, rng: random.Random) -> str:
+    match = _VARIANT_COUNT.search(prompt)
+    count = int(match.group(1)) if match else 3
+    return json.dumps({
+        "variants": [f"话术变体{i + 1}：我们的方案已服务XX家同行企业，平均{rng.randint(3, 12)}个月回本"
+                     for i in range(count)]
+    }, ensure_ascii=False)
+
+
+# 任务类型 -> 响应生成函数(与PromptEngineeringManager中模板的输出格式一致)
+RESPONSE_BUILDERS: Dict[str, Callable[[str, random.Random], str]] = {
+    "strategy_analysis": _strategy_analysis,
+    "content_creation": _content_creation,
+    "failure_analysis": _failure_analysis,
+    "sales_script": _sales_script
+}
+
+
+class SimulatedProvider:
+    def __init__(self, seed: int = 0, latency_ms: float = 800.0, latency_sigma: float = 0.5,
+                 latency_distribution: str = "lognormal", tokens_per_sec: float = 40.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: float = 1.0,
+                 time_scale: float = 1.0, sleep: Callable[[float], None] = time.sleep):
+        """
+        :param seed: 随机种子，相同种子与提示词序列得到相同的延迟、错误与响应
+        :param latency_ms: 首字延迟的中位数(lognormal)/均值(exponential/normal)/固定值(fixed)
+        :param latency_sigma: lognormal的对数标准差，normal时为相对标准差
+        :param tokens_per_sec: 生成速率，输出越长耗时越长
+        :param error_rate: 服务端错误(500)概率
+        :param rate_limit_rate: 限流(429)概率
+        :param retry_after: 限流时建议的重试等待(秒)
+        :param time_scale: 实际等待时间的缩放系数，0表示只统计不等待
+        """
+        if latency_distribution not in ("lognormal", "exponential", "normal", "fixed"):
+            raise ValueError(f"不支持的延迟分布: {latency_distribution}")
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.latency_distribution = latency_distribution
+        self.tokens_per_sec = tokens_per_sec
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.time_scale = time_scale
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._prompt_calls: Dict[str, int] = {}
+        self.stats = {
+            "calls": 0,
+            "errors": 0,
+            "rate_limited": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "simulated_seconds": 0.0
+        }
+
+    def _rng(self, prompt: str) -> random.Random:
+        """按(种子, 提示词, 该提示词的调用次数)派生随机数，结果与并发调度顺序无关"""
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()
+        with self._lock:
+            n = self._prompt_calls.get(digest, 0)
+            self._prompt_calls[digest] = n + 1
+        return random.Random(f"{self.seed}:{digest}:{n}")
+
+    def _first_token_seconds(self, rng: random.Random) -> float:
+        base = self.latency_ms / 1000
+        if self.latency_distribution == "lognormal":
+            return rng.lognormvariate(math.log(max(base, 1e-6)), self.latency_sigma)
+        if self.latency_distribution == "exponential":
+            return rng.expovariate(1 / base) if base > 0 else 0.0
+        if self.latency_distribution == "normal":
+            return max(0.0, rng.gauss(base, base * self.latency_sigma))
+        return base
+
+    def _wait(self, seconds: float):
+        with self._lock:
+            self.stats["simulated_seconds"] += seconds
+        if self.time_scale > 0:
+            self.sleep(seconds * self.time_scale)
+
+    def complete(self, prompt: str, task_type: str = "", model: str = "simulated", **kwargs) -> Dict[str, Any]:
+        """
+        生成一次模拟响应
+        :raises RateLimitError: 按rate_limit_rate概率限流
+        :raises ProviderError: 按error_rate概率返回服务端错误
+        """
+        rng = self._rng(prompt)
+        roll = rng.random()
+        with self._lock:
+            self.stats["calls"] += 1
+        if roll < self.rate_limit_rate:
+            with self._lock:
+                self.stats["rate_limited"] += 1
+            self._wait(0.01)
+            raise RateLimitError(retry_after=self.retry_after * self.time_scale)
+        if roll < self.rate_limit_rate + self.error_rate:
+            with self._lock:
+                self.stats["errors"] += 1
+            self._wait(self._first_token_seconds(rng))
+            raise ProviderError("模拟服务端错误", status=500, retry_after=0.5 * self.time_scale)
+
+        builder = RESPONSE_BUILDERS.get(task_type)
+        text = builder(prompt, rng) if builder else f"这是{model}对提示词'{prompt[:20]}...'的模拟响应"
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(text)
+        seconds = self._first_token_seconds(rng) + completion_tokens / self.tokens_per_sec
+        self._wait(seconds)
+        with self._lock:
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["completion_tokens"] += completion_tokens
+        return {
+            "response": text,
+            "tokens_used": prompt_tokens + completion_tokens,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            # 模拟延迟(不受time_scale影响)，便于在不实际等待时比较延迟
+            "latency_ms": round(seconds * 1000, 3),
+            "success": True
+        }
+
+
+# ---- 本地HTTP桩服务(OpenAI风格接口) ----
+
+def make_handler(provider: SimulatedProvider):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # 响应头与响应体分两次写出，keep-alive连接上需关闭Nagle以免与延迟确认叠加出40ms停顿
+        disable_nagle_algorithm = True
+
+        def _reply(self, status: int, data: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/v1/chat/completions":
+                self._reply(404, {"error": {"message": "接口不存在"}})
+                return
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            prompt = "".join(message.get("content", "") for message in request.get("messages", []))
+            try:
+                result = provider.complete(prompt, task_type=request.get("task_type", ""),
+                                           model=request.get("model", "simulated"))
+            except ProviderError as e:
+                headers = {"Retry-After": f"{e.retry_after:.3f}"} if e.status == 429 else None
+                self._reply(e.status, {"error": {"message": str(e)}}, headers)
+                return
+            self._reply(200, {
+                "model": request.get("model", "simulated"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": result["response"]}}],
+                "usage": {"prompt_tokens": result["prompt_tokens"], "completion_tokens": result["completion_tokens"],
+                          "total_tokens": result["tokens_used"]}
+            })
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 默认监听队列只有5，并发新建连接较多时会被重置
+    request_queue_size = 128
+
+
+def serve_http(provider: SimulatedProvider, host: str = "127.0.0.1", port: int = 8900) -> ThreadingHTTPServer:
+    """在后台线程启动HTTP桩服务，port为0时自动分配端口"""
+    server = StubServer((host, port), make_handler(provider))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class HTTPProvider:
+    def __init__(self, endpoint: str, pool=None):
+        """
+        通过HTTP调用OpenAI风格接口的提供商(可指向本地桩服务)
+        :param endpoint: 接口根地址，如http://127.0.0.1:8900/v1
+        :param pool: 连接池，默认使用服务容器中的共享连接池
+        """
+        from modules.services import get_services
+
+        self.endpoint = endpoint.rstrip("/")
+        self.pool = pool or get_services().http_pool
+
+    def complete(self, prompt: str, task_type: str = "", model: str = "simulated", **kwargs) -> Dict[str, Any]:
+        body = json.dumps({
+            "model": model,
+            "task_type": task_type,
+            "messages": [{"role": "user", "content": prompt}]
+        }, ensure_ascii=False).encode("utf-8")
+        try:
+            status, headers, payload = self.pool.request("POST", f"{self.endpoint}/chat/completions", body=body,
+                                                         headers={"Content-Type": "application/json"})
+        except (OSError, http.client.HTTPException) as e:
+            # 连接池不重发POST(服务端可能已执行)；连接断开/超时交给调度器按可重试错误处理，
+            # 否则复用连接被服务端关闭时调用会直接落入降级内容
+            raise ProviderError(f"连接失败: {e!r}", status=503) from e
+        if status == 429:
+            raise RateLimitError(retry_after=float(headers.get("retry-after", 1)))
+        if status >= 400:
+            raise ProviderError(f"HTTP {status}", status=status)
+        data = json.loads(payload)
+        usage = data.get("usage", {})
+        return {
+            "response": data["choices"][0]["message"]["content"],
+            "tokens_used": usage.get("total_tokens", 0),
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+            "success": True
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模拟大模型HTTP桩服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--latency-distribution", default="lognormal",
+                        choices=["lognormal", "exponential", "normal", "fixed"])
+    parser.add_argument("--tokens-per-sec", type=float, default=40.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    provider = SimulatedProvider(seed=args.seed, latency_ms=args.latency_ms,
+                                 latency_distribution=args.latency_distribution,
+                                 tokens_per_sec=args.tokens_per_sec, error_rate=args.error_rate,
+                                 rate_limit_rate=args.rate_limit_rate)
+    server = StubServer((args.host, args.port), make_handler(provider))
+    print(f"模拟大模型服务已启动: http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("服务已停止")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+客户需求批量挖掘模块
+基于列式运营数据一次计算行业基线，向量化推断隐性需求与紧急度评级
+"""
+
+from typing import Dict, Any, Optional, Sequence
+
+import numpy as np
+
+# 停机时长阈值(小时/月)，超过即视为设备可靠性问题
+DOWNTIME_THRESHOLD = 10
+# 能耗高于行业基线的容忍比例
+ENERGY_TOLERANCE = 0.0
+# 缺少同行业样本时使用的能耗基线
+DEFAULT_ENERGY_BASELINES: Dict[str, float] = {"通用": 1000.0}
+
+NEED_RELIABILITY = "提高设备可靠性"
+NEED_ENERGY = "节能优化方案"
+
+
+def industry_baselines(industries: Sequence[str], values) -> tuple:
+    """
+    按行业计算均值基线(忽略缺失值)
+    :return: (行业列表, 各行业基线数组, 每行对应的行业下标)
+    """
+    values = np.asarray(values, dtype=float)
+    names, inverse = np.unique(np.asarray(industries, dtype=object).astype(str), return_inverse=True)
+    present = ~np.isnan(values)
+    sums = np.bincount(inverse, weights=np.where(present, values, 0.0), minlength=len(names))
+    counts = np.bincount(inverse, weights=present.astype(float), minlength=len(names))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        baselines = sums / counts
+    fallback = DEFAULT_ENERGY_BASELINES["通用"]
+    baselines = np.where(counts > 0, baselines, [DEFAULT_ENERGY_BASELINES.get(n, fallback) for n in names])
+    return list(names), baselines, inverse
+
+
+def urgency_ratings(explicit_counts, critical) -> np.ndarray:
+    """
+    紧急度评级(1-10，10为最紧急)
+    有明确需求时取max(5, 需求数×2)，存在关键问题时为8
+    """
+    explicit_counts = np.asarray(explicit_counts, dtype=float)
+    urgency = np.where(explicit_counts > 0, np.maximum(5, explicit_counts * 2), 0)
+    urgency = np.where(np.asarray(critical, dtype=bool), 8, urgency)
+    return np.minimum(10, urgency).astype(int)
+
+
+def mine_needs_batch(operational_data: Dict[str, Any],
+                     energy_baselines: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    批量客户需求挖掘
+    :param operational_data: 列式数据，必需列client_id/industry/downtime/energy_consumption，
+                             可选列explicit_need_count/critical_issue
+    :param energy_baselines: 指定的行业能耗基线，未指定的行业按同批数据均值计算
+    :return: 列式结果，含各行隐性需求与紧急度
+    """
+    client_ids = list(operational_data["client_id"])
+    n = len(client_ids)
+    industries = operational_data.get("industry", ["通用"] * n)
+    downtime = np.asarray(operational_data.get("downtime", np.full(n, np.nan)), dtype=float)
+    energy = np.asarray(operational_data.get("energy_consumption", np.full(n, np.nan)), dtype=float)
+
+    names, baselines, inverse = industry_baselines(industries, energy)
+    for i, name in enumerate(names):
+        if energy_baselines and name in energy_baselines:
+            baselines[i] = energy_baselines[name]
+    row_baseline = baselines[inverse]
+
+    # 缺失值比较结果为False，不会产生需求
+    with np.errstate(invalid="ignore"):
+        reliability = downtime > DOWNTIME_THRESHOLD
+        energy_saving = energy > row_baseline * (1 + ENERGY_TOLERANCE)
+
+    urgency = urgency_ratings(
+        operational_data.get("explicit_need_count", np.zeros(n)),
+        operational_data.get("critical_issue", np.zeros(n, dtype=bool))
+    )
+
+    need_sets = {
+        (False, False): [],
+        (True, False): [NEED_RELIABILITY],
+        (False, True): [NEED_ENERGY],
+        (True, True): [NEED_RELIABILITY, NEED_ENERGY]
+    }
+    return {
+        "client_id": client_ids,
+        "implicit_needs": [list(need_sets[key]) for key in zip(reliability.tolist(), energy_saving.tolist())],
+        "reliability_flag": reliability,
+        "energy_flag": energy_saving,
+        "energy_baseline": row_baseline,
+        "urgency_rating": urgency,
+        "industry_baselines": dict(zip(names, baselines.tolist()))
+    }
@@ -0,0 +1,164 @@
+"""
+工业策略与计划制定模块
+实现客户策略匹配、定价策略计算和渠道策略制定功能
+"""
+
+from modules.tracing import traced
+
+
+class Planning:
+    def __init__(self, knowledge_store=None, rule_engine=None, pricing_engine=None):
+        from modules.pricing_engine import PricingEngine
+        from modules.strategy_rules import get_default_engine
+        
+        self.strategy_brief = None
+        # 数据驱动的客户策略规则
+        self.rule_engine = rule_engine or get_default_engine()
+        self.pricing_engine = pricing_engine or PricingEngine()
+        # 可选的知识库，用于检索历史经验
+        self.knowledge_store = knowledge_store
+        self.client_strategies = {}
+        self.pricing_plans = []
+        self.channel_strategies = []
+    
+    @traced()
+    def match_client_strategies(self, strategy_brief):
+        """
+        工业客户策略匹配
+        输入: 工业营销作战简报
+        输出: 定制化沟通策略与价值主张
+        """
+        self.strategy_brief = strategy_brief
+        strategies = []
+        value_propositions = []
+        
+        # 根据客户类型匹配策略(规则预编译，批量匹配)
+        target_clients = strategy_brief.get("target_clients", [])
+        for rule in self.rule_engine.match_many(target_clients):
+            if rule is None:
+                continue
+            strategies.append({"type": rule["segment"], **rule["strategy"]})
+            value_propositions.append({"type": rule["segment"], **rule["value_proposition"]})
+        
+        # 从知识库检索历史经验
+        if self.knowledge_store is not None:
+            for strategy in strategies:
+                lessons = self.knowledge_store.search(
+                    f"{strategy['type']} {strategy['approach']} {strategy['focus']}", top_k=3)
+                strategy["lessons"] = [lesson["title"] for lesson in lessons]
+        
+        # 根据紧急度调整策略
+        urgency = strategy_brief.get("urgency", 5)
+        if urgency > 7:
+            for strategy in strategies:
+                strategy["priority"] = "高"
+                strategy["timeline"] = "30天内"
+        
+        self.client_strategies = {
+            "strategies": strategies,
+            "value_propositions": value_propositions
+        }
+        
+        return self.client_strategies
+    
+    @traced()
+    def calculate_pricing_strategies(self):
+        """
+        工业定价策略计算
+        输出: 工业多版本报价方案与推荐理由
+        """
+        if not self.strategy_brief:
+            raise ValueError("需要先执行客户策略匹配")
+        
+        plans = []
+        recommendations = []
+        
+        # 为每个细分客户一次性求解最优方案与报价
+        segments = [strategy["type"] for strategy in self.client_strategies.get("strategies", [])] or ["通用"]
+        quotes = self.pricing_engine.optimize(
+            self.pricing_engine.profile_for(segment) for segment in dict.fromkeys(segments))
+        
+        for j, bundle in enumerate(self.pricing_engine.bundles):
+            bundle_quotes = [q["bundle_quotes"][j] for q in quotes if q["bundle_quotes"][j]["feasible"]]
+            plans.append({
+                "name": bundle["name"],
+                "price": round(sum(q["price"] for q in bundle_quotes) / len(bundle_quotes), -2) if bundle_quotes else None,
+                "features": list(bundle["features"]),
+                "target": bundle["target"],
+                "expected_margin": sum(q["expected_margin"] for q in bundle_quotes)
+            })
+        
+        # 根据各细分客户的最优报价给出推荐
+        for quote in quotes:
+            if not quote["feasible"]:
+                recommendations.append(f"{quote['segment']}客户在成本底线以上无可行报价，需重新核算成本")
+                continue
+            recommendations.append(
+                f"{quote['segment']}客户推荐{quote['bundle']}，报价{quote['price']:,.0f}元"
+                f"(折扣{quote['discount']:.0%})，预期毛利{quote['expected_margin']:,.0f}元"
+            )
+        
+        self.pricing_plans = {
+            "plans": plans,
+            "recommendations": recommendations,
+            "quotes": quotes
+        }
+        
+        return self.pricing_plans
+    
+    @traced()
+    def develop_channel_strategies(self, total_budget=None, channel_performance=None):
+        """
+        工业渠道策略制定
+        输入: 可选的总预算与Analysis输出的渠道表现(channel_performance)
+        输出: 工业渠道组合建议与内容形式(给定预算时附带各渠道投放额)
+        """
+        if not self.strategy_brief:
+            raise ValueError("需要先执行客户策略匹配")
+        
+        channel_mix = []
+        content_types = []
+        
+        # 根据客户类型推荐渠道
+        for strategy in self.client_strategies.get("strategies", []):
+            rule = self.rule_engine.rule_for_segment(strategy["type"])
+            if rule is None:
+                continue
+            channel_mix.append({
+                "type": strategy["type"],
+                "channels": list(rule["channels"]),
+                "priority": "高" if strategy.get("priority") == "高" else "中"
+            })
+            content_types.append({
+                "type": strategy["type"],
+                "formats": list(rule["content_formats"])
+            })
+        
+        self.channel_strategies = {
+            "channel_mix": channel_mix,
+            "content_types": content_types
+        }
+        
+        # 按历史转化率与获客成本在总预算内分配各渠道投放额
+        if total_budget and channel_mix:
+            from modules.budget_allocator import BudgetAllocator, channel_inputs
+            
+            channels = [channel for mix in channel_mix for channel in mix["channels"]]
+            allocation = BudgetAllocator().allocate(channel_inputs(channels, channel_performance), total_budget)
+            by_channel = {item["channel"]: item for item in allocation}
+            for mix in channel_mix:
+                mix["budget_allocation"] = [by_channel[channel] for channel in mix["channels"]]
+            self.channel_strategies["budget_allocation"] = allocation
+        
+        return self.channel_strategies
+    
+    @traced()
+    def generate_marketing_plan(self):
+        """
+        整合生成工业客户专属营销行动计划
+        """
+        return {
+            "client_strategies": self.client_strategies,
+            "pricing_plans": self.pricing_plans,
+            "channel_strategies": self.channel_strategies
+        }
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+定价优化引擎模块
+按细分客户的需求弹性曲线、成本底线与折扣规则，向量化搜索最优报价与方案组合
+"""
+
+from typing import Dict, Any, Iterable, List, Optional
+
+import numpy as np
+
+# 细分客户定价画像(价格单位: 元/项目，需求单位: 项目数/年)
+DEFAULT_SEGMENT_PROFILES: Dict[str, Dict[str, float]] = {
+    "国企": {"reference_price": 800000, "base_demand": 30, "elasticity": 1.6, "unit_cost": 380000, "min_margin": 0.2},
+    "民企": {"reference_price": 300000, "base_demand": 120, "elasticity": 2.4, "unit_cost": 150000, "min_margin": 0.15},
+    "外企": {"reference_price": 600000, "base_demand": 45, "elasticity": 1.9, "unit_cost": 300000, "min_margin": 0.2},
+    "通用": {"reference_price": 400000, "base_demand": 60, "elasticity": 2.0, "unit_cost": 200000, "min_margin": 0.15}
+}
+
+# 方案组合：成本倍数、支付意愿倍数与意向客户占比
+DEFAULT_BUNDLES: List[Dict[str, Any]] = [
+    {"name": "标准方案", "cost_multiplier": 1.0, "value_multiplier": 1.0, "demand_share": 1.0,
+     "features": ["核心功能"], "target": "预算有限客户"},
+    {"name": "高级方案", "cost_multiplier": 1.35, "value_multiplier": 1.6, "demand_share": 0.6,
+     "features": ["核心功能", "增值服务", "优先支持"], "target": "重视服务质量的客户"},
+    {"name": "定制方案", "cost_multiplier": 2.2, "value_multiplier": 3.0, "demand_share": 0.25,
+     "features": ["完全定制", "专属团队", "长期合作"], "target": "大型企业客户"}
+]
+
+# 批量折扣规则：(年采购项目数下限, 折扣率)，按下限升序
+DEFAULT_DISCOUNT_TIERS = [(0, 0.0), (20, 0.03), (50, 0.06), (100, 0.1)]
+
+
+class PricingEngine:
+    def __init__(self, bundles: Optional[List[Dict[str, Any]]] = None,
+                 discount_tiers: Optional[List[tuple]] = None,
+                 segment_profiles: Optional[Dict[str, Dict[str, float]]] = None,
+                 price_points: int = 1000, price_range: tuple = (0.5, 2.5)):
+        """
+        :param price_points: 每个方案搜索的价格点数量
+        :param price_range: 价格搜索区间(相对参考价×支付意愿倍数)
+        """
+        self.bundles = bundles or DEFAULT_BUNDLES
+        self.discount_tiers = discount_tiers or DEFAULT_DISCOUNT_TIERS
+        self.segment_profiles = segment_profiles or DEFAULT_SEGMENT_PROFILES
+        self.price_grid = np.linspace(price_range[0], price_range[1], price_points)
+
+        self._cost_multiplier = np.array([b["cost_multiplier"] for b in self.bundles])
+        self._value_multiplier = np.array([b["value_multiplier"] for b in self.bundles])
+        self._demand_share = np.array([b["demand_share"] for b in self.bundles])
+        self._tier_floors = np.array([floor for floor, _ in self.discount_tiers], dtype=float)
+        self._tier_rates = np.array([rate for _, rate in self.discount_tiers], dtype=float)
+
+    def profile_for(self, segment: str) -> Dict[str, Any]:
+        """取细分客户的定价画像，未配置时使用通用画像"""
+        return dict(self.segment_profiles.get(segment, self.segment_profiles["通用"]), segment=segment)
+
+    def optimize_arrays(self, reference_price, base_demand, elasticity, unit_cost, min_margin) -> Dict[str, np.ndarray]:
+        """
+        向量化求解: 所有细分客户(S) × 方案(B) × 价格点(P)一次计算
+        需求曲线 q = 基础需求 × 意向占比 × (价格/参考价)^(-弹性)
+        :return: 各数组形状为(S, B)的最优报价结果
+        """
+        ref = np.asarray(reference_price, dtype=float)[:, None, None]
+        demand = np.asarray(base_demand, dtype=float)[:, None, None]
+        elasticity = np.asarray(elasticity, dtype=float)[:, None, None]
+        cost = np.asarray(unit_cost, dtype=float)[:, None, None] * self._cost_multiplier[None, :, None]
+        floor = cost * (1 + np.asarray(min_margin, dtype=float)[:, None, None])
+
+        anchor = ref * self._value_multiplier[None, :, None]
+        list_price = anchor * self.price_grid[None, None, :]
+        volume = demand * self._demand_share[None, :, None] * (self.price_grid[None, None, :] ** -elasticity)
+
+        # 按预期采购量套用批量折扣
+        tier = np.searchsorted(self._tier_floors, volume, side="right") - 1
+        discount = self._tier_rates[tier]
+        net_price = list_price * (1 - discount)
+
+        margin = (net_price - cost) * volume
+        feasible = net_price >= floor
+        margin = np.where(feasible, margin, -np.inf)
+
+        best = margin.argmax(axis=2)[..., None]
+
+        def take(values):
+            return np.take_along_axis(np.broadcast_to(values, margin.shape), best, axis=2)[..., 0]
+
+        best_margin = take(margin)
+        best_net = take(net_price)
+        return {
+            "list_price": take(list_price),
+            "net_price": best_net,
+            "discount": take(discount),
+            "volume": take(volume),
+            "margin": best_margin,
+            "margin_rate": np.where(np.isfinite(best_margin), 1 - take(cost) / best_net, 0.0),
+            "feasible": np.isfinite(best_margin)
+        }
+
+    def optimize(self, profiles: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        为每个细分客户给出最优方案与报价
+        :param profiles: 定价画像列表(含segment字段)
+        """
+        profiles = list(profiles)
+        if not profiles:
+            return []
+        fields = ["reference_price", "base_demand", "elasticity", "unit_cost", "min_margin"]
+        result = self.optimize_arrays(*(np.array([p[f] for p in profiles], dtype=float) for f in fields))
+        best_bundle = np.where(result["feasible"], result["margin"], -np.inf).argmax(axis=1)
+
+        quotes = []
+        for i, profile in enumerate(profiles):
+            bundle_quotes = [
+                {
+                    "bundle": bundle["name"],
+                    "list_price": round(float(result["list_price"][i, j]), -2),
+                    "price": round(float(result["net_price"][i, j]), -2),
+                    "discount": float(result["discount"][i, j]),
+                    "expected_volume": round(float(result["volume"][i, j]), 1),
+                    "expected_margin": round(float(result["margin"][i, j]), -2) if result["feasible"][i, j] else None,
+                    "margin_rate": round(float(result["margin_rate"][i, j]), 3),
+                    "feasible": bool(result["feasible"][i, j])
+                } for j, bundle in enumerate(self.bundles)
+            ]
+            best = bundle_quotes[best_bundle[i]]
+            quotes.append(dict(best, segment=profile.get("segment", str(i)), bundle_quotes=bundle_quotes))
+        return quotes
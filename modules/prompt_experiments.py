@@ -0,0 +1,370 @@
+"""
+提示词A/B实验模块
+同一模板的多个版本在固定评测集上经调度器并发运行，输出按版本汇总的格式合法率、结构完整度、
+输出长度、延迟与token成本，并与基线版本做显著性对比。
+评分规则在创建实验时从基线版本的输出格式示例编译一次(期望格式、必需字段路径或小节标题)，
+所有版本按同一输出约定评分(下游解析依赖的是基线约定)；
+逐条响应只做解析，汇总全部用numpy按版本分组计算；调度器的响应缓存使未改动版本重跑几乎无开销，
+可在每次修改提示词后运行；缓存命中的调用沿用首次调用的延迟，不会因几乎零耗时而显得更快
+用法: python -m modules.prompt_experiments --template sales_script --candidate new_prompt.txt --cases 50
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from modules.channel_stats import uplift_test, wilson_interval
+from modules.mock_provider import estimate_tokens
+
+# 模板中的输出格式示例
+_FORMAT_EXAMPLE = re.compile(r"```(json|markdown)\s*\n(.*?)```", re.S)
+# 响应中的代码块(模型常把JSON包在```json ... ```中)
+_CODE_BLOCK = re.compile(r"```(?:json)?\s*\n?(.*?)```", re.S)
+_SUBHEADING = re.compile(r"^##\s*(.+?)\s*$", re.M)
+
+# 评测集：各模板变量的取值池，按种子组合出固定的评测用例
+EVAL_CONTEXTS: Dict[str, Dict[str, List[str]]] = {
+    "strategy_analysis": {
+        "industry_trends": ["智能制造渗透率提升", "双碳政策推动节能改造", "设备国产化替代加速", "工业互联网平台普及"],
+        "competition_data": ["竞品A主打低价", "竞品B在华东渠道强势", "竞品C推出订阅制服务"],
+        "customer_needs": ["降低设备停机时间", "满足安全合规", "缩短投资回收期", "远程运维"]
+    },
+    "content_creation": {
+        "client_type": ["国企", "民企", "外企"],
+        "value_proposition": ["降低维护成本30%", "提升产线效率20%", "一站式合规认证"],
+        "pain_points": ["设备维护成本高", "生产效率低", "安全合规压力大"],
+        "key_benefits": ["ROI与回本周期", "技术领先性", "本地化服务"],
+        "style_preference": ["技术严谨", "简洁直接", "案例驱动"]
+    },
+    "failure_analysis": {
+        "total_clients": ["120", "860", "3400"],
+        "conversion_rate": ["8%", "15%", "27%"],
+        "digest": ['{"top_channels": ["行业展会"], "anomalies": ["垂直平台转化率偏低"]}',
+                   '{"top_channels": ["国际展会"], "anomalies": ["方案确认阶段停滞"]}']
+    },
+    "sales_script": {
+        "client_type": ["国企", "民企", "外企"],
+        "scenario": ["首次拜访", "价格异议", "技术答疑", "竞品对比"],
+        "value_proposition": ["降低维护成本30%", "12个月回本"],
+        "reference_script": ["我们的方案已服务XX家同行企业", ""],
+        "variant_count": ["3", "5"]
+    }
+}
+
+
+def build_eval_set(template_name: str, variables: Sequence[str], size: int = 20, seed: int = 0) -> List[Dict[str, str]]:
+    """
+    按种子生成固定的评测用例(变量上下文)，相同参数总是得到相同用例
+    从各变量取值的全部组合中无放回抽样，用例互不重复；组合数少于size时只生成组合数条
+    """
+    pools = EVAL_CONTEXTS.get(template_name, {})
+    values = [pools.get(var) or [""] for var in variables]
+    total = 1
+    for pool in values:
+        total *= len(pool)
+    rng = random.Random(f"{template_name}:{seed}")
+    cases = []
+    # 组合编号按混合进制解码为各变量的取值下标
+    for index in rng.sample(range(total), min(size, total)):
+        case = {}
+        for var, pool in zip(variables, values):
+            index, position = divmod(index, len(pool))
+            case[var] = pool[position]
+        cases.append(case)
+    return cases
+
+
+def _json_paths(value: Any, prefix: str = "") -> Iterable[str]:
+    """JSON结构中的字段路径(列表元素记为[])，如opportunities[].name"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            path = f"{prefix}.{key}" if prefix else key
+            yield path
+            yield from _json_paths(item, path)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _json_paths(item, prefix + "[]")
+
+
+def _parse_json(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except (TypeError, ValueError):
+        pass
+    match = _CODE_BLOCK.search(text or "")
+    if match:
+        try:
+            return json.loads(match.group(1))
+        except ValueError:
+            pass
+    return None
+
+
+class ResponseScorer:
+    def __init__(self, template: str, prompt_manager=None):
+        """
+        从模板的输出格式示例编译评分规则：
+        JSON模板取示例中的全部字段路径作为必需字段，Markdown模板取示例中的二级标题作为必需小节
+        """
+        self.prompt_manager = prompt_manager
+        match = _FORMAT_EXAMPLE.search(template)
+        self.expected_format = match.group(1) if match else "text"
+        self.required: frozenset = frozenset()
+        if self.expected_format == "json":
+            example = _parse_json(match.group(2))
+            self.required = frozenset(_json_paths(example)) if example is not None else frozenset()
+        elif self.expected_format == "markdown":
+            self.required = frozenset(_SUBHEADING.findall(match.group(2)))
+
+    def _score_one(self, text: str):
+        if self.expected_format == "json":
+            parsed = _parse_json(text)
+            if parsed is None:
+                return False, 0.0
+            present = self.required.intersection(_json_paths(parsed))
+            return True, len(present) / len(self.required) if self.required else 1.0
+        if self.expected_format == "markdown":
+            valid = self.prompt_manager.validate_response_format(text, "markdown") if self.prompt_manager \
+                else bool(_SUBHEADING.search(text))
+            present = self.required.intersection(_SUBHEADING.findall(text))
+            return valid, len(present) / len(self.required) if self.required else 1.0
+        return bool(text), 1.0
+
+    def score(self, responses: Sequence[Optional[str]]) -> Dict[str, np.ndarray]:
+        """
+        批量评分，调用失败的响应为None
+        :return: valid(格式合法)、completeness(必需字段/小节覆盖率)、length(字符数)数组
+        """
+        valid = np.zeros(len(responses), dtype=bool)
+        completeness = np.zeros(len(responses))
+        for i, text in enumerate(responses):
+            if text is not None:
+                valid[i], completeness[i] = self._score_one(text)
+        length = np.fromiter((len(text) if text else 0 for text in responses), dtype=np.int64, count=len(responses))
+        return {"valid": valid, "completeness": completeness, "length": length}
+
+
+class PromptExperiment:
+    def __init__(self, template_name: str, versions: Optional[List[str]] = None,
+                 eval_set: Optional[List[Dict[str, str]]] = None, cases: int = 20, seed: int = 0,
+                 orchestrator=None, prompt_manager=None, max_workers: int = 8,
+                 price_per_1k_tokens: float = 0.012):
+        """
+        :param versions: 参与对比的模板版本，第一个为基线；默认取已登记的全部版本
+        :param eval_set: 评测用例(变量上下文列表)，默认按种子生成cases条
+        :param price_per_1k_tokens: 每千token价格(元)，用于估算成本
+        """
+        from modules.services import get_services
+
+        self.template_name = template_name
+        self.orchestrator = orchestrator or get_services().orchestrator
+        self.prompt_manager = prompt_manager or get_services().prompt_manager
+        self.versions = list(versions or self.prompt_manager.versions(template_name))
+        if not self.versions:
+            raise ValueError(f"模板'{template_name}'没有可对比的版本")
+        variables = self.prompt_manager.get_template(template_name)["variables"]
+        self.eval_set = eval_set if eval_set is not None else build_eval_set(template_name, variables, cases, seed)
+        self.max_workers = max_workers
+        self.price_per_1k_tokens = price_per_1k_tokens
+        # 输出约定取自基线版本，候选版本即使改写或删去格式示例也按同一约定评分
+        self.scorer = ResponseScorer(self.prompt_manager.get_template(template_name, self.versions[0])["template"],
+                                     self.prompt_manager)
+        # 提示词 -> 未命中缓存时测得的延迟，重跑命中缓存时沿用
+        self._latency: Dict[str, float] = {}
+
+    def _call(self, job):
+        version_index, context = job
+        prompt = self.prompt_manager.render_template(self.template_name, context,
+                                                     version=self.versions[version_index])
+        start = time.perf_counter()
+        try:
+            result = self.orchestrator.dispatch_request(self.template_name, prompt)
+        except Exception:
+            return None, (time.perf_counter() - start) * 1000, estimate_tokens(prompt), 0
+        wall_ms = (time.perf_counter() - start) * 1000
+        prompt_tokens = result.get("prompt_tokens") or estimate_tokens(prompt)
+        total_tokens = result.get("tokens_used") or prompt_tokens + estimate_tokens(result["response"])
+        # 提供商报告的延迟优先(模拟提供商不实际等待，缓存条目中保留原始延迟)；
+        # 缓存命中的耗时接近0，沿用本实验首次调用测得的延迟，未知时记为NaN不参与延迟统计
+        if "latency_ms" in result:
+            latency = result["latency_ms"]
+        elif result.get("cached"):
+            latency = self._latency.get(prompt, float("nan"))
+        else:
+            latency = self._latency[prompt] = wall_ms
+        return result["response"], latency, prompt_tokens, total_tokens
+
+    def run(self) -> Dict[str, Any]:
+        """并发运行全部版本 x 评测用例，返回对比报告"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        jobs = [(v, context) for v in range(len(self.versions)) for context in self.eval_set]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(jobs)))) as pool:
+            outputs = list(pool.map(self._call, jobs))
+
+        version_index = np.array([v for v, _ in jobs], dtype=np.int64)
+        responses = [output[0] for output in outputs]
+        latency = np.array([output[1] for output in outputs], dtype=float)
+        prompt_tokens = np.array([output[2] for output in outputs], dtype=float)
+        total_tokens = np.array([output[3] for output in outputs], dtype=float)
+        errors = np.array([response is None for response in responses])
+
+        scores = self.scorer.score(responses)
+        return self._report(version_index, scores["valid"], scores["completeness"], scores["length"], latency,
+                            prompt_tokens, total_tokens, errors)
+
+    def _report(self, version_index, valid, completeness, length, latency, prompt_tokens, total_tokens, errors):
+        groups = len(self.versions)
+        calls = np.bincount(version_index, minlength=groups)
+        n = np.maximum(calls, 1)
+
+        def mean(values):
+            return np.bincount(version_index, weights=values, minlength=groups) / n
+
+        def percentile(values, q):
+            result = []
+            for v in range(groups):
+                group = values[version_index == v]
+                group = group[~np.isnan(group)]
+                result.append(float(np.percentile(group, q)) if len(group) else None)
+            return result
+
+        valid_count = np.bincount(version_index, weights=valid, minlength=groups)
+        valid_rate = valid_count / n
+        valid_low, valid_high = wilson_interval(valid_count, calls)
+        completeness_mean = mean(completeness)
+        tokens_sum = np.bincount(version_index, weights=total_tokens, minlength=groups)
+        cost = tokens_sum / 1000 * self.price_per_1k_tokens
+        score = valid_rate * completeness_mean
+        latency_p50, latency_p95 = percentile(latency, 50), percentile(latency, 95)
+        length_p95 = percentile(length, 95)
+
+        results = [{
+            "version": version,
+            "calls": int(calls[v]),
+            "errors": int(np.bincount(version_index, weights=errors, minlength=groups)[v]),
+            "format_valid_rate": round(float(valid_rate[v]), 4),
+            "format_valid_ci": [round(float(valid_low[v]), 4), round(float(valid_high[v]), 4)],
+            "schema_completeness": round(float(completeness_mean[v]), 4),
+            "length_mean": round(float(mean(length)[v]), 1),
+            "length_p95": _round(length_p95[v], 1),
+            "latency_p50_ms": _round(latency_p50[v], 1),
+            "latency_p95_ms": _round(latency_p95[v], 1),
+            "prompt_tokens_mean": round(float(mean(prompt_tokens)[v]), 1),
+            "tokens_total": int(tokens_sum[v]),
+            "cost": round(float(cost[v]), 4),
+            "score": round(float(score[v]), 4)
+        } for v, version in enumerate(self.versions)]
+
+        # 各版本与基线的对比(格式合法率用双比例z检验)
+        comparison = []
+        for v in range(1, groups):
+            uplift, _, p_value = uplift_test(valid_count[[0, v]], calls[[0, v]])
+            comparison.append({
+                "version": self.versions[v],
+                "baseline": self.versions[0],
+                "format_valid_uplift": round(float(-uplift[0]), 4) + 0.0,
+                "p_value": round(float(p_value[0]), 4),
+                "schema_completeness_delta": round(float(completeness_mean[v] - completeness_mean[0]), 4),
+                "latency_p95_change": _change(latency_p95[0], latency_p95[v]),
+                "cost_change": _change(cost[0], cost[v]),
+                "score_delta": round(float(score[v] - score[0]), 4)
+            })
+
+        # 综合得分最高者胜出，得分相同取成本低、延迟低者(延迟未知的排在最后)
+        winner = min(range(groups), key=lambda v: (-round(float(score[v]), 4), float(cost[v]),
+                                                   math.inf if latency_p50[v] is None else latency_p50[v]))
+        return {
+            "template": self.template_name,
+            "cases": len(self.eval_set),
+            "baseline": self.versions[0],
+            "results": results,
+            "comparison": comparison,
+            "winner": self.versions[winner]
+        }
+
+
+def _round(value: Optional[float], digits: int) -> Optional[float]:
+    return None if value is None else round(value, digits)
+
+
+def _change(old: Optional[float], new: Optional[float]) -> Optional[float]:
+    return round(float(new / old - 1), 4) if old and new is not None else None
+
+
+def regressions(report: Dict[str, Any], max_score_drop: float = 0.02, alpha: float = 0.05) -> List[Dict[str, Any]]:
+    """相对基线综合得分下降超过max_score_drop，或格式合法率显著下降的版本"""
+    return [item for item in report["comparison"]
+            if item["score_delta"] < -max_score_drop
+            or (item["format_valid_uplift"] < 0 and item["p_value"] < alpha)]
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """对比报告的Markdown表格"""
+    columns = ["version", "format_valid_rate", "schema_completeness", "length_mean", "latency_p50_ms",
+               "latency_p95_ms", "prompt_tokens_mean", "cost", "score"]
+    lines = [f"# 提示词实验: {report['template']} ({report['cases']}条用例，基线{report['baseline']})", "",
+             "| " + " | ".join(columns) + " |", "|" + "---|" * len(columns)]
+    lines += ["| " + " | ".join(str(result[column]) for column in columns) + " |" for result in report["results"]]
+    lines += ["", f"胜出版本: {report['winner']}"]
+    return "\n".join(lines)
+
+
+def main():
+    import contextlib
+    import io
+
+    from modules.llm_orchestrator import set_default_provider
+    from modules.mock_provider import HTTPProvider, SimulatedProvider
+    from modules.services import get_services
+
+    parser = argparse.ArgumentParser(description="提示词A/B实验")
+    parser.add_argument("--template", required=True)
+    parser.add_argument("--versions", nargs="+", help="参与对比的已登记版本，第一个为基线")
+    parser.add_argument("--candidate", help="候选模板文件，作为新版本加入对比")
+    parser.add_argument("--candidate-version", default="candidate")
+    parser.add_argument("--cases", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--endpoint", help="OpenAI风格接口地址，默认使用模拟提供商")
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="报告JSON文件路径")
+    parser.add_argument("--fail-on-regression", action="store_true", help="存在回退版本时以状态码1退出")
+    args = parser.parse_args()
+
+    if args.endpoint:
+        set_default_provider(HTTPProvider(args.endpoint))
+    else:
+        set_default_provider(SimulatedProvider(seed=args.seed, latency_ms=args.latency_ms,
+                                               error_rate=args.error_rate, time_scale=0))
+    prompt_manager = get_services().prompt_manager
+    versions = args.versions or prompt_manager.versions(args.template)
+    if args.candidate:
+        with open(args.candidate, encoding="utf-8") as f:
+            prompt_manager.register_version(args.template, args.candidate_version, f.read())
+        versions = [*versions, args.candidate_version]
+
+    experiment = PromptExperiment(args.template, versions, cases=args.cases, seed=args.seed,
+                                  max_workers=args.workers)
+    # 调度器逐次打印的请求日志不混入报告
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = experiment.run()
+    report["regressions"] = regressions(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print(format_report(report))
+    if args.fail_on_regression and report["regressions"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+提示词工程管理模块
+实现动态提示词管理和优化
+"""
+
+from typing import Dict, List, Callable, Optional
+import json
+import re
+
+from modules.tracing import traced
+
+# 标题、二级小节与列表项之间允许空行，列表项可为-/*或编号(与模板中的输出格式示例一致)
+_MARKDOWN_SECTIONS = re.compile(r"#.+\n\s*##.+\n\s*(?:[-*]|\d+\.).+")
+_CREATIVE_TERMS = re.compile(r"创新|突破|独特")
+_VAGUE_TERMS = re.compile(r"模糊|不确定|可能")
+
+class PromptEngineeringManager:
+    def __init__(self):
+        self.templates: Dict[str, Dict] = {
+            "strategy_analysis": {
+                "version": "1.0",
+                "template": """作为工业营销专家，请分析以下数据：
+行业趋势: {industry_trends}
+竞争情报: {competition_data}
+客户需求: {customer_needs}
+
+请按照以下步骤思考：
+1. 识别3个关键市场机会
+2. 评估每个机会的可行性
+3. 推荐最佳市场进入策略
+
+输出格式：
+```json
+{
+    "opportunities": [
+        {
+            "name": "机会名称",
+            "feasibility": "高/中/低", 
+            "strategy": "推荐策略"
+        }
+    ]
+}```""",
+                "variables": ["industry_trends", "competition_data", "customer_needs"]
+            },
+            "content_creation": {
+                "version": "1.1",
+                "template": """作为工业内容专家，请为{client_type}客户创建营销内容：
+核心价值主张: {value_proposition}
+客户痛点: {pain_points}
+
+要求：
+1. 突出{key_benefits}
+2. 使用{style_preference}风格
+3. 包含3个具体案例
+
+输出格式：
+```markdown
+# 标题
+
+## 核心优势
+- 优势1
+- 优势2
+
+## 成功案例
+1. 案例1
+2. 案例2
+```""",
+                "variables": ["client_type", "value_proposition", "pain_points", 
+                             "key_benefits", "style_preference"]
+            },
+            "failure_analysis": {
+                "version": "1.0",
+                "template": """作为工业营销分析专家，请分析以下销售数据并找出根本原因：
+
+销售数据概览：
+- 总客户数: {total_clients}
+- 转化率: {conversion_rate}
+- 统计摘要(头部渠道、阶段分布、异常标记): {digest}
+
+请按照以下步骤分析：
+1. 识别3个最关键的问题
+2. 分析每个问题的根本原因
+3. 为每个问题提供具体改进建议
+
+输出格式：
+```json
+{
+    "root_causes": [
+        {
+            "cause": "问题描述",
+            "evidence": "数据支持", 
+            "improvement": "改进建议"
+        }
+    ]
+}```""",
+                "variables": ["total_clients", "conversion_rate", "digest"]
+            },
+            "sales_script": {
+                "version": "1.0",
+                "template": """作为工业销售培训专家，请为{client_type}客户编写"{scenario}"场景的销售话术：
+核心价值主张: {value_proposition}
+参考话术: {reference_script}
+
+要求：
+1. 生成{variant_count}条风格不同的话术变体
+2. 每条不超过80字，口语化且包含具体数据占位符
+3. 不得承诺无法兑现的条款
+
+输出格式：
+```json
+{
+    "variants": ["话术1", "话术2"]
+}```""",
+                "variables": ["client_type", "scenario", "value_proposition", "reference_script", "variant_count"]
+            }
+        }
+        
+        # 模板名称 -> 版本号 -> 模板定义；templates中保存的是各模板当前生效的版本
+        self.template_versions: Dict[str, Dict[str, Dict]] = {
+            name: {spec["version"]: spec} for name, spec in self.templates.items()
+        }
+        
+        self.evaluation_metrics = {
+            "relevance": 0,
+            "creativity": 0,
+            "clarity": 0
+        }
+
+    def register_version(self, template_name: str, version: str, template: str,
+                         variables: Optional[List[str]] = None, activate: bool = False) -> Dict:
+        """
+        登记模板的新版本(用于A/B对比)
+        :param variables: 模板变量，默认沿用当前生效版本的变量
+        :param activate: 是否立即设为生效版本
+        """
+        if template_name not in self.templates:
+            raise ValueError(f"模板'{template_name}'不存在")
+        spec = {
+            "version": version,
+            "template": template,
+            "variables": list(variables or self.templates[template_name]["variables"])
+        }
+        self.template_versions[template_name][version] = spec
+        if activate:
+            self.templates[template_name] = spec
+        return spec
+    
+    def activate_version(self, template_name: str, version: str):
+        """切换模板的生效版本"""
+        self.templates[template_name] = self.get_template(template_name, version)
+    
+    def versions(self, template_name: str) -> List[str]:
+        return list(self.template_versions.get(template_name, {}))
+    
+    def get_template(self, template_name: str, version: Optional[str] = None) -> Dict:
+        """取模板定义，version为空时取生效版本"""
+        if template_name not in self.templates:
+            raise ValueError(f"模板'{template_name}'不存在")
+        if version is None:
+            return self.templates[template_name]
+        spec = self.template_versions[template_name].get(version)
+        if spec is None:
+            raise ValueError(f"模板'{template_name}'没有版本{version}")
+        return spec
+    
+    @traced("prompt.render", "prompt")
+    def render_template(self, template_name: str, context: Dict[str, str], version: Optional[str] = None) -> str:
+        """渲染提示词模板(默认使用生效版本)"""
+        spec = self.get_template(template_name, version)
+        template = spec["template"]
+        
+        # 简单变量替换
+        for var in spec["variables"]:
+            template = template.replace(f"{{{var}}}", context.get(var, ""))
+            
+        return template
+    
+    def add_cot_instructions(self, prompt: str, steps: List[str]) -> str:
+        """添加思维链(CoT)指令"""
+        cot_part = "\n请按照以下步骤思考：\n" + "\n".join(f"{i+1}. {step}" for i, step in enumerate(steps))
+        return prompt + cot_part
+    
+    def validate_response_format(self, response: str, expected_format: str) -> bool:
+        """验证响应格式"""
+        if expected_format == "json":
+            try:
+                json.loads(response)
+                return True
+            except (TypeError, ValueError):
+                return False
+        elif expected_format == "markdown":
+            return bool(_MARKDOWN_SECTIONS.search(response))
+        return True
+    
+    def evaluate_prompt_quality(self, prompt: str) -> Dict[str, int]:
+        """评估提示词质量 (简化版)"""
+        # 实际实现应该更复杂
+        score = {
+            "relevance": min(len(prompt)//100, 10),
+            "creativity": min(len(_CREATIVE_TERMS.findall(prompt)), 10),
+            "clarity": 10 - min(len(_VAGUE_TERMS.findall(prompt)), 10)
+        }
+        return score
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+流程数据记录类型模块
+执行阶段产生的客户、互动、反馈与阶段推进记录使用__slots__数据类代替嵌套字典，
+阶段与渠道取值为字符串枚举(单例，可直接与原中文字符串比较和作为字典键)；
+记录实现只读映射接口(record["name"]、record.get("type"))，原先按字典读取的代码无需修改
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Dict, Iterator, Tuple
+
+
+class _StrEnum(str, Enum):
+    """取值即中文字符串，str()/格式化输出与原字符串一致"""
+
+    def __str__(self) -> str:
+        return self.value
+
+    __format__ = str.__format__
+
+    @classmethod
+    def coerce(cls, value):
+        """已知取值转为枚举成员，未知取值原样返回"""
+        try:
+            return cls(value)
+        except ValueError:
+            return value
+
+
+class Channel(_StrEnum):
+    TRADE_SHOW = "行业展会"
+    VERTICAL_PLATFORM = "垂直平台"
+    INTERNATIONAL_SHOW = "国际展会"
+
+
+class Stage(_StrEnum):
+    INITIAL_CONTACT = "初步接触"
+    NEEDS_ANALYSIS = "需求分析"
+    SOLUTION_CONFIRMED = "方案确认"
+    CONTRACT = "签订合同"
+
+
+class Priority(_StrEnum):
+    HIGH = "高"
+    MEDIUM = "中"
+    LOW = "低"
+
+
+class RecordMapping:
+    """
+    只读映射适配：_KEYS为(字典键, 属性名)序列，字典键与属性名不同时(如type)在此映射
+    """
+    __slots__ = ()
+    _KEYS: Tuple[Tuple[str, str], ...] = ()
+    _ATTRS: Dict[str, str] = {}
+    _GETTERS: Dict[str, attrgetter] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._ATTRS = dict(cls._KEYS)
+        cls._GETTERS = {name: attrgetter(attr) for name, attr in cls._KEYS}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            getter = self._GETTERS[key]
+        except KeyError:
+            raise KeyError(key) from None
+        return getter(self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        attr = self._ATTRS.get(key)
+        return default if attr is None else getattr(self, attr)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._ATTRS
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name, _ in self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def keys(self):
+        return [name for name, _ in self._KEYS]
+
+    def values(self):
+        return [getattr(self, attr) for _, attr in self._KEYS]
+
+    def items(self):
+        return [(name, getattr(self, attr)) for name, attr in self._KEYS]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转为原先的字典结构(枚举还原为字符串)"""
+        return {name: _plain(getattr(self, attr)) for name, attr in self._KEYS}
+
+
+def _plain(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _keys(*names: str) -> Tuple[Tuple[str, str], ...]:
+    return tuple((name, name) for name in names)
+
+
+@dataclass(slots=True)
+class PotentialClient(RecordMapping):
+    name: str
+    contact: str
+    interest: str
+    channel: Channel
+    client_type: str
+    _KEYS = (("name", "name"), ("contact", "contact"), ("interest", "interest"),
+             ("channel", "channel"), ("type", "client_type"))
+
+
+@dataclass(slots=True)
+class ChannelFeedback(RecordMapping):
+    channel: Channel
+    response: str
+    effectiveness: Priority
+    _KEYS = _keys("channel", "response", "effectiveness")
+
+
+@dataclass(slots=True)
+class Interaction(RecordMapping):
+    client: str
+    contact: str
+    date: str
+    interaction: str
+    outcome: str
+    _KEYS = _keys("client", "contact", "date", "interaction", "outcome")
+
+
+@dataclass(slots=True)
+class NextAction(RecordMapping):
+    client: str
+    action: str
+    deadline: str
+    priority: Priority
+    _KEYS = _keys("client", "action", "deadline", "priority")
+
+
+@dataclass(slots=True)
+class InterestChange(RecordMapping):
+    client: str
+    interest_level: int
+    trend: str
+    _KEYS = _keys("client", "interest_level", "trend")
+
+
+@dataclass(slots=True)
+class StageProgress(RecordMapping):
+    client: str
+    current_stage: Stage
+    next_milestone: Stage
+    _KEYS = _keys("client", "current_stage", "next_milestone")
+
+
+def to_dicts(value: Any) -> Any:
+    """把嵌套结构中的记录递归转为字典，用于序列化或与旧接口比较"""
+    if isinstance(value, RecordMapping):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: to_dicts(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_dicts(item) for item in value]
+    return _plain(value)
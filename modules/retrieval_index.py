@@ -0,0 +1,227 @@
+"""
+本地检索增强(RAG)索引模块
+基于哈希向量与BM25的混合检索，向量存放在内存映射文件中，支持增量追加
+"""
+
+import json
+import math
+import os
+import zlib
+from collections import Counter
+from typing import Dict, Any, Iterable, List, Optional
+
+import numpy as np
+
+from modules.text_features import tokenize
+
+
+def doc_text(item: Any) -> str:
+    """将结构化条目(字典/列表)展开为检索文本"""
+    if isinstance(item, dict):
+        return " ".join(doc_text(value) for value in item.values())
+    if isinstance(item, (list, tuple)):
+        return " ".join(doc_text(value) for value in item)
+    return str(item)
+
+
+class HybridRetrievalIndex:
+    def __init__(self, path: Optional[str] = None, dim: int = 512, alpha: float = 0.5,
+                 capacity_step: int = 1024, k1: float = 1.5, b: float = 0.75):
+        """
+        :param path: 索引文件前缀(生成.vec向量文件、.jsonl文档文件与.meta.json维度记录)，为空时仅驻留内存
+        :param dim: 哈希向量维度
+        :param alpha: 混合打分中向量相似度的权重，其余为BM25
+        :param capacity_step: 向量文件每次扩容的行数
+        """
+        self.path = path
+        self.dim = dim
+        self.alpha = alpha
+        self.capacity_step = capacity_step
+        self.k1 = k1
+        self.b = b
+
+        self.docs: List[Dict[str, Any]] = []
+        self.postings: Dict[str, List[tuple]] = {}
+        self.doc_lengths = np.zeros(capacity_step, dtype=np.float32)
+        self.doc_sources = np.zeros(capacity_step, dtype=np.int32)
+        self.source_codes: Dict[str, int] = {}
+        self.total_length = 0
+        self._feature_cache: Dict[str, tuple] = {}
+        # 词项 -> (倒排长度, 文档编号数组, 词频数组)，倒排表追加后按需重建
+        self._posting_arrays: Dict[str, tuple] = {}
+
+        self.capacity = 0
+        self.vectors = None
+        self._open()
+
+    # ---- 存储 ----
+
+    def _check_meta(self):
+        """
+        校验已有向量文件的维度：维度记录在.meta.json中，以不同dim打开同一文件会按错误形状读取向量
+        早于该记录的文件按文件大小能否整除行宽做基本校验
+        """
+        meta_path = self.path + ".meta.json"
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                stored_dim = json.load(f)["dim"]
+            if stored_dim != self.dim:
+                raise ValueError(f"索引{self.path}的向量维度为{stored_dim}，与dim={self.dim}不一致")
+            return
+        if os.path.exists(self.path + ".vec") and os.path.getsize(self.path + ".vec") % (self.dim * 4):
+            raise ValueError(f"索引{self.path}的向量文件大小与dim={self.dim}不匹配")
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim}, f)
+
+    def _open(self):
+        """打开(或新建)索引文件，已有文档时重建倒排表"""
+        stored = []
+        if self.path:
+            self._check_meta()
+        if self.path and os.path.exists(self.path + ".jsonl"):
+            with open(self.path + ".jsonl", encoding="utf-8") as f:
+                stored = [json.loads(line) for line in f if line.strip()]
+        self._ensure_capacity(max(len(stored), 1))
+        for doc in stored:
+            # 向量已在文件中，只重建倒排表
+            self._register(doc, write_vector=False)
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= self.capacity:
+            return
+        capacity = math.ceil(rows / self.capacity_step) * self.capacity_step
+        if self.path:
+            if self.vectors is not None:
+                self.vectors.flush()
+                self.vectors = None
+            size = capacity * self.dim * 4
+            mode = "r+b" if os.path.exists(self.path + ".vec") else "w+b"
+            with open(self.path + ".vec", mode) as f:
+                f.truncate(size)
+            self.vectors = np.memmap(self.path + ".vec", dtype=np.float32, mode="r+",
+                                     shape=(capacity, self.dim))
+        else:
+            vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+            if self.vectors is not None:
+                vectors[:self.capacity] = self.vectors
+            self.vectors = vectors
+        if capacity > len(self.doc_lengths):
+            self.doc_lengths = np.resize(self.doc_lengths, capacity)
+            self.doc_sources = np.resize(self.doc_sources, capacity)
+        self.capacity = capacity
+
+    # ---- 特征 ----
+
+    def _features(self, token: str) -> tuple:
+        """词项 -> (哈希桶, 符号)，使用crc32保证跨进程稳定"""
+        feature = self._feature_cache.get(token)
+        if feature is None:
+            h = zlib.crc32(token.encode("utf-8"))
+            feature = (h % self.dim, 1.0 if (h >> 31) & 1 else -1.0)
+            self._feature_cache[token] = feature
+        return feature
+
+    def embed(self, text: str) -> np.ndarray:
+        """哈希向量(CPU即可计算，无需模型)，L2归一化"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token, tf in Counter(tokenize(text)).items():
+            index, sign = self._features(token)
+            vector[index] += sign * (1.0 + math.log(tf))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _register(self, doc: Dict[str, Any], write_vector: bool = True):
+        """将文档登记到倒排表并写入向量"""
+        doc_id = len(self.docs)
+        self._ensure_capacity(doc_id + 1)
+        counts = Counter(tokenize(doc["text"]))
+        for term, tf in counts.items():
+            self.postings.setdefault(term, []).append((doc_id, tf))
+        length = sum(counts.values())
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+        self.doc_sources[doc_id] = self.source_codes.setdefault(doc["source"], len(self.source_codes))
+        if write_vector:
+            self.vectors[doc_id] = self.embed(doc["text"])
+        self.docs.append(doc)
+
+    def add(self, text: str, source: str = "", meta: Optional[Dict[str, Any]] = None) -> int:
+        """追加单条文档，返回文档编号"""
+        return self.add_many([{"text": text, "source": source, "meta": meta or {}}])[0]
+
+    def add_many(self, docs: Iterable[Dict[str, Any]]) -> List[int]:
+        """增量追加文档，已有内容无需重建"""
+        docs = [{"text": d["text"], "source": d.get("source", ""), "meta": d.get("meta", {})} for d in docs]
+        ids = []
+        for doc in docs:
+            ids.append(len(self.docs))
+            self._register(doc)
+        if self.path and docs:
+            with open(self.path + ".jsonl", "a", encoding="utf-8") as f:
+                for doc in docs:
+                    f.write(json.dumps(doc, ensure_ascii=False) + "\n")
+            self.vectors.flush()
+        return ids
+
+    def __len__(self):
+        return len(self.docs)
+
+    # ---- 检索 ----
+
+    def _bm25(self, terms: List[str]) -> np.ndarray:
+        n = len(self.docs)
+        scores = np.zeros(n, dtype=np.float32)
+        avg_length = self.total_length / max(1, n)
+        lengths = self.doc_lengths[:n]
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            cached = self._posting_arrays.get(term)
+            if cached is None or cached[0] != len(postings):
+                array = np.array(postings, dtype=np.int64)
+                cached = (len(postings), array[:, 0], array[:, 1].astype(np.float32))
+                self._posting_arrays[term] = cached
+            _, ids, tfs = cached
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths[ids] / max(avg_length, 1e-9))
+            scores[ids] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+        return scores
+
+    def search(self, query: str, top_k: int = 5, sources: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        混合检索
+        :param sources: 限定文档来源
+        :return: 按混合得分排序的top_k文档
+        """
+        n = len(self.docs)
+        terms = tokenize(query)
+        if not n or not terms:
+            return []
+
+        dense = self.vectors[:n] @ self.embed(query)
+        sparse = self._bm25(terms)
+        if sparse.max() > 0:
+            sparse = sparse / sparse.max()
+        scores = self.alpha * np.clip(dense, 0, None) + (1 - self.alpha) * sparse
+
+        if sources is not None:
+            codes = [self.source_codes[s] for s in sources if s in self.source_codes]
+            scores = np.where(np.isin(self.doc_sources[:n], codes), scores, -np.inf)
+
+        k = min(top_k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            dict(self.docs[i], score=float(scores[i]))
+            for i in top if np.isfinite(scores[i]) and scores[i] > 0
+        ]
+
+    @staticmethod
+    def format_snippets(hits: List[Dict[str, Any]], max_chars: int = 120) -> str:
+        """将检索结果格式化为可注入提示词的片段"""
+        lines = []
+        for i, hit in enumerate(hits, 1):
+            text = hit["text"] if len(hit["text"]) <= max_chars else hit["text"][:max_chars] + "..."
+            lines.append(f"{i}. [{hit['source']}] {text}")
+        return "\n".join(lines) or "无相关资料"
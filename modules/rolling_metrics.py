@@ -0,0 +1,245 @@
+"""
+滚动指标聚合模块
+实现渠道与客户类型维度的增量计数和日/周滑动窗口转化率
+"""
+
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Any, Iterable, Optional
+
+from modules.text_features import normalize_company_name
+
+# 视为已转化的销售阶段
+CONVERTED_STAGES = ("方案确认", "签订合同")
+
+
+def _event_day(event: Dict[str, Any], day: Optional[int] = None) -> int:
+    """取事件所属日期(序数)，事件未带日期时按当天计"""
+    if day is not None:
+        return day
+    raw = event.get("date")
+    if raw:
+        try:
+            return date.fromisoformat(str(raw)[:10]).toordinal()
+        except ValueError:
+            pass
+    return date.today().toordinal()
+
+
+class SlidingWindow:
+    """按天分桶的滑动窗口，只保留最近days天的线索数与转化数"""
+
+    def __init__(self, days: int = 7):
+        self.days = days
+        self.buckets: Dict[int, list] = {}
+        self.latest_day: Optional[int] = None
+
+    def add(self, day: int, leads: int = 0, conversions: int = 0):
+        """累加某天的线索数/转化数，超出窗口的旧桶随之淘汰"""
+        if self.latest_day is None or day > self.latest_day:
+            self.latest_day = day
+            cutoff = day - self.days
+            # 桶数量不超过days，淘汰成本为O(days)
+            for stale in [d for d in self.buckets if d <= cutoff]:
+                del self.buckets[stale]
+        if day <= self.latest_day - self.days:
+            return
+        bucket = self.buckets.setdefault(day, [0, 0])
+        bucket[0] += leads
+        bucket[1] += conversions
+
+    def totals(self, days: Optional[int] = None) -> tuple:
+        """最近days天(默认整个窗口)的(线索数, 转化数)"""
+        if self.latest_day is None:
+            return 0, 0
+        cutoff = self.latest_day - (days or self.days)
+        leads = conversions = 0
+        for day, (day_leads, day_conversions) in self.buckets.items():
+            if day > cutoff:
+                leads += day_leads
+                conversions += day_conversions
+        return leads, conversions
+
+    def rate(self, days: Optional[int] = None) -> float:
+        leads, conversions = self.totals(days)
+        # 转化与线索可能落在不同日期，窗口内比值截断到1
+        return min(1.0, conversions / max(1, leads))
+
+
+class RollingMetrics:
+    """
+    营销执行事件的增量聚合器
+    新的渠道反馈、意向客户和阶段推进事件到达时即时更新计数，
+    读取汇总指标的成本只与渠道/客户类型数量相关。
+    客户数与转化数按实体计：同一企业从多个渠道出现只计一次，实体由实体消解结果
+    (客户名称 -> 实体键)给出，未登记的名称按规范化名称归并
+    """
+
+    def __init__(self, window_days: int = 7):
+        self.window_days = window_days
+        self.reset()
+
+    def reset(self):
+        """清空全部计数"""
+        self.total_clients = 0
+        self.converted_clients = 0
+        self.channel_stats: Dict[str, Dict[str, int]] = {}
+        self.client_type_stats: Dict[str, Dict[str, int]] = {}
+        self.channel_windows: Dict[str, SlidingWindow] = {}
+        self.client_type_windows: Dict[str, SlidingWindow] = {}
+        self.stage_counts: Dict[str, int] = defaultdict(int)
+        # 客户名称 -> (来源渠道, 客户类型)，用于转化归因
+        self.client_index: Dict[str, tuple] = {}
+        # 客户名称 -> 实体键；已计数的实体
+        self.client_entities: Dict[str, str] = {}
+        self.entities: set = set()
+        # 实体键 -> 当前阶段
+        self.client_stage: Dict[str, str] = {}
+        # 数据源 -> (列表对象, 已消费条数)
+        self._cursors: Dict[str, tuple] = {}
+
+    def _channel(self, channel: str) -> Dict[str, int]:
+        if channel not in self.channel_stats:
+            self.channel_stats[channel] = {"leads": 0, "conversions": 0, "low_effectiveness": 0}
+            self.channel_windows[channel] = SlidingWindow(self.window_days)
+        return self.channel_stats[channel]
+
+    def _client_type(self, client_type: str) -> Dict[str, int]:
+        if client_type not in self.client_type_stats:
+            self.client_type_stats[client_type] = {"leads": 0, "conversions": 0}
+            self.client_type_windows[client_type] = SlidingWindow(self.window_days)
+        return self.client_type_stats[client_type]
+
+    def record_feedback(self, feedback: Dict[str, Any], day: Optional[int] = None):
+        """记录一条渠道反馈(计为该渠道的一条线索)"""
+        channel = feedback["channel"]
+        stats = self._channel(channel)
+        stats["leads"] += 1
+        if feedback.get("effectiveness") == "低":
+            stats["low_effectiveness"] += 1
+        self.channel_windows[channel].add(_event_day(feedback, day), leads=1)
+
+    def add_client_entities(self, client_entities: Dict[str, str]):
+        """登记实体消解结果(客户名称 -> 实体键)，需在对应客户事件之前登记"""
+        self.client_entities.update(client_entities)
+
+    def entity_of(self, name: str) -> str:
+        entity = self.client_entities.get(name)
+        if entity is None:
+            entity = self.client_entities[name] = normalize_company_name(name)
+        return entity
+
+    def record_client(self, client: Dict[str, Any], day: Optional[int] = None):
+        """
+        记录一个意向客户，并登记其来源渠道和客户类型；同一实体再次出现时不重复计数
+        名称为空白或只有标点的线索无法判断归属，每条单独计数
+        """
+        channel = client.get("channel")
+        client_type = client.get("type")
+        self.client_index.setdefault(client["name"], (channel, client_type))
+        entity = self.entity_of(client["name"])
+        if entity:
+            if entity in self.entities:
+                return
+            self.entities.add(entity)
+        self.total_clients += 1
+        if client_type:
+            self._client_type(client_type)["leads"] += 1
+            self.client_type_windows[client_type].add(_event_day(client, day), leads=1)
+
+    def record_stage(self, progress: Dict[str, Any], day: Optional[int] = None):
+        """记录客户的阶段推进，同一客户的新阶段覆盖旧阶段"""
+        client = progress["client"]
+        stage = progress["current_stage"]
+        entity = self.entity_of(client)
+        previous = self.client_stage.get(entity)
+        if previous == stage:
+            return
+        if previous is not None:
+            self.stage_counts[previous] -= 1
+            if not self.stage_counts[previous]:
+                del self.stage_counts[previous]
+        self.client_stage[entity] = stage
+        self.stage_counts[stage] += 1
+
+        was_converted = previous in CONVERTED_STAGES
+        is_converted = stage in CONVERTED_STAGES
+        if was_converted == is_converted:
+            return
+        delta = 1 if is_converted else -1
+        self.converted_clients += delta
+
+        channel, client_type = self.client_index.get(client, (None, None))
+        channels = [channel] if channel else [
+            # 缺少来源登记时退回名称匹配
+            name for name in self.channel_stats if name in client
+        ]
+        event_day = _event_day(progress, day)
+        for name in channels:
+            self._channel(name)["conversions"] += delta
+            if is_converted:
+                self.channel_windows[name].add(event_day, conversions=1)
+        if client_type:
+            self._client_type(client_type)["conversions"] += delta
+            if is_converted:
+                self.client_type_windows[client_type].add(event_day, conversions=1)
+
+    def _is_continuation(self, source: str, items: list) -> bool:
+        """判断数据源是否为上次消费列表的追加"""
+        seen, consumed = self._cursors.get(source, (None, 0))
+        return not consumed or (seen is items and len(items) >= consumed)
+
+    def _new_items(self, source: str, items: list) -> Iterable:
+        """返回数据源中尚未消费的尾部条目"""
+        _, consumed = self._cursors.get(source, (None, 0))
+        self._cursors[source] = (items, len(items))
+        return items[consumed:]
+
+    def ingest(self, sales_data: Dict[str, Any]):
+        """
+        按快照方式接入营销全流程数据
+        同一批列表持续追加时只处理新增条目；换成新的数据快照时重建计数
+        """
+        sources = {
+            "potential_clients": sales_data.get("potential_clients", []),
+            "channel_feedbacks": sales_data.get("channel_feedbacks", []),
+            "stage_progress": sales_data.get("sales_progress", {}).get("stage_progress", []),
+        }
+        if not all(self._is_continuation(source, items) for source, items in sources.items()):
+            self.reset()
+        self.add_client_entities(sales_data.get("client_entities") or {})
+
+        for client in self._new_items("potential_clients", sources["potential_clients"]):
+            self.record_client(client)
+        for feedback in self._new_items("channel_feedbacks", sources["channel_feedbacks"]):
+            self.record_feedback(feedback)
+        for progress in self._new_items("stage_progress", sources["stage_progress"]):
+            self.record_stage(progress)
+
+    @property
+    def conversion_rate(self) -> float:
+        return self.converted_clients / max(1, self.total_clients)
+
+    def channel_performance(self) -> Dict[str, Dict[str, int]]:
+        """各渠道线索数与转化数"""
+        return {
+            channel: {"leads": stats["leads"], "conversions": stats["conversions"]}
+            for channel, stats in self.channel_stats.items()
+        }
+
+    def low_effectiveness_channels(self) -> list:
+        """出现过低效反馈的渠道"""
+        return [channel for channel, stats in self.channel_stats.items() if stats["low_effectiveness"]]
+
+    def window_rates(self, dimension: str = "channel") -> Dict[str, Dict[str, float]]:
+        """
+        日/周滑动窗口转化率
+        :param dimension: channel(渠道) 或 client_type(客户类型)
+        """
+        windows = self.channel_windows if dimension == "channel" else self.client_type_windows
+        return {
+            key: {
+                "daily": round(window.rate(1), 4),
+                "weekly": round(window.rate(7), 4)
+            } for key, window in windows.items()
+        }
@@ -0,0 +1,286 @@
+"""
+营销活动HTTP服务模块
+基于asyncio的轻量HTTP服务：提交活动任务进入SQLite持久化队列，由有界工作池执行，
+通过Server-Sent Events推送阶段进度，按任务ID查询结果
+用法: python -m modules.service --port 8080 --workers 4
+
+接口:
+    POST /jobs               提交活动数据(JSON)，返回job_id
+    GET  /jobs/{id}          查询任务状态与结果
+    GET  /jobs/{id}/events   SSE阶段进度流(支持Last-Event-ID续传)
+    GET  /health             服务与队列状态
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional, Set
+
+from modules.job_queue import DEFAULT_MAX_ATTEMPTS, FINISHED_STATUSES, JobQueue, dumps
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+TERMINAL_EVENTS = ("succeeded", "failed")
+STATUS_TEXT = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def run_campaign(payload: Dict[str, Any], progress: Callable, knowledge_store=None,
+                 competitor_store=None, scheduler=None) -> Dict[str, Any]:
+    """默认任务执行器：完整营销工作流"""
+    from modules.industrial_marketing_system import IndustrialMarketingSystem
+
+    system = IndustrialMarketingSystem(knowledge_store=knowledge_store, competitor_store=competitor_store,
+                                       scheduler=scheduler)
+    return system.run_campaign(payload, progress)
+
+
+class CampaignService:
+    def __init__(self, queue: Optional[JobQueue] = None, workers: int = 4, runner: Optional[Callable] = None,
+                 host: str = "127.0.0.1", port: int = 8080, heartbeat: float = 15.0,
+                 knowledge_store=None, competitor_store=None, scheduler=None):
+        """
+        :param queue: 任务队列，默认使用JobQueue()
+        :param workers: 并发执行的任务数上限
+        :param runner: 任务执行器 runner(payload, progress)，progress(阶段, 状态, 附加信息)
+        :param heartbeat: SSE心跳间隔(秒)
+        :param knowledge_store: 各任务共用的知识库，默认KnowledgeStore()
+        :param competitor_store: 各任务共用的竞品情报库，默认CompetitorIntelStore()
+        :param scheduler: 跟进动作调度器(FollowUpScheduler)，指定时各任务的下一步行动入队，
+                          服务运行期间由后台线程到期发送，服务关闭时停止
+        """
+        self.queue = queue or JobQueue()
+        self.workers = workers
+        if runner is None:
+            from modules.competitor_intel import CompetitorIntelStore
+            from modules.knowledge_store import KnowledgeStore
+
+            # 存储由服务创建一次并注入每个任务，而不是每个任务在工作目录下各自打开默认库
+            self.knowledge_store = knowledge_store or KnowledgeStore()
+            self.competitor_store = competitor_store or CompetitorIntelStore()
+            runner = functools.partial(run_campaign, knowledge_store=self.knowledge_store,
+                                       competitor_store=self.competitor_store, scheduler=scheduler)
+        else:
+            self.knowledge_store, self.competitor_store = knowledge_store, competitor_store
+        self.scheduler = scheduler
+        self.runner = runner
+        self.host = host
+        self.port = port
+        self.heartbeat = heartbeat
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._listeners: Dict[str, Set[asyncio.Event]] = {}
+        self._server = None
+        self._tasks = []
+        self._loop = None
+        self._wakeup = None
+
+    # ---- 生命周期 ----
+
+    async def start(self):
+        """启动HTTP监听与工作协程；port为0时自动分配端口"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        recovered = self.queue.recover()
+        if recovered:
+            print(f"恢复未完成任务: {recovered}个")
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if self.scheduler is not None:
+            self.scheduler.start()
+        print(f"营销活动服务已启动: http://{self.host}:{self.port}")
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=True)
+        # 任务全部结束后再停止调度线程，最后入队的动作留在数据库中，下次启动时继续发送
+        if self.scheduler is not None:
+            self.scheduler.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    # ---- 任务执行 ----
+
+    def _notify(self, job_id: str):
+        for signal in self._listeners.get(job_id, ()):
+            signal.set()
+
+    def _publish(self, job_id: str, data: Dict[str, Any]):
+        """记录任务事件并唤醒订阅者(可在工作线程中调用)"""
+        self.queue.add_event(job_id, data)
+        self._loop.call_soon_threadsafe(self._notify, job_id)
+
+    async def _worker(self):
+        while True:
+            self._wakeup.clear()
+            claimed = self.queue.claim()
+            if claimed is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job_id, payload = claimed
+            self._publish(job_id, {"event": "started"})
+
+            def progress(stage, status, detail=None, job_id=job_id):
+                self._publish(job_id, {"event": "stage", "stage": stage, "status": status, "detail": detail or {}})
+
+            try:
+                result = await self._loop.run_in_executor(self._executor, self.runner, payload, progress)
+                self.queue.complete(job_id, result)
+                self._publish(job_id, {"event": "succeeded"})
+            except Exception as e:
+                print(f"任务执行失败 {job_id}: {str(e)}")
+                self.queue.fail(job_id, str(e))
+                self._publish(job_id, {"event": "failed", "error": str(e)})
+
+    # ---- HTTP ----
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            if len(request_line) < 2:
+                return
+            method, path = request_line[0].upper(), request_line[1].split("?", 1)[0]
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", 0) or 0)
+            if length > MAX_BODY_BYTES:
+                await self._send_json(writer, 413, {"error": "请求体过大"})
+                return
+            body = await reader.readexactly(length) if length else b""
+            await self._route(method, path, headers, body, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            print(f"请求处理失败: {str(e)}")
+            try:
+                await self._send_json(writer, 500, {"error": str(e)})
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, headers, body, writer):
+        parts = [part for part in path.split("/") if part]
+        if parts == ["health"]:
+            await self._send_json(writer, 200, {"status": "ok", "workers": self.workers, "jobs": self.queue.counts()})
+        elif parts == ["jobs"]:
+            if method != "POST":
+                await self._send_json(writer, 405, {"error": "仅支持POST"})
+                return
+            try:
+                payload = json.loads(body.decode("utf-8") or "{}")
+            except (UnicodeDecodeError, ValueError):
+                await self._send_json(writer, 400, {"error": "请求体不是有效的JSON"})
+                return
+            if not isinstance(payload, dict):
+                await self._send_json(writer, 400, {"error": "活动数据必须是JSON对象"})
+                return
+            job_id = self.queue.submit(payload)
+            self._publish(job_id, {"event": "queued"})
+            self._wakeup.set()
+            await self._send_json(writer, 202, {"job_id": job_id, "status": "queued",
+                                                "events": f"/jobs/{job_id}/events"})
+        elif len(parts) in (2, 3) and parts[0] == "jobs" and (len(parts) == 2 or parts[2] == "events"):
+            if method != "GET":
+                await self._send_json(writer, 405, {"error": "仅支持GET"})
+                return
+            job = self.queue.get(parts[1], include_result=len(parts) == 2)
+            if job is None:
+                await self._send_json(writer, 404, {"error": "任务不存在"})
+            elif len(parts) == 2:
+                await self._send_json(writer, 200, job)
+            else:
+                await self._stream_events(parts[1], int(headers.get("last-event-id", 0) or 0), writer)
+        else:
+            await self._send_json(writer, 404, {"error": "接口不存在"})
+
+    async def _send_json(self, writer, status: int, data: Any):
+        body = dumps(data).encode("utf-8")
+        writer.write((f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                      "Content-Type: application/json; charset=utf-8\r\n"
+                      f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _stream_events(self, job_id: str, last_seq: int, writer):
+        """推送任务事件，任务结束后关闭连接"""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream; charset=utf-8\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+        signal = asyncio.Event()
+        self._listeners.setdefault(job_id, set()).add(signal)
+        try:
+            while True:
+                signal.clear()
+                done = False
+                for event in self.queue.events(job_id, last_seq):
+                    last_seq = event["seq"]
+                    done = done or event["event"] in TERMINAL_EVENTS
+                    writer.write(f"id: {event['seq']}\nevent: {event['event']}\ndata: {dumps(event)}\n\n".encode("utf-8"))
+                await writer.drain()
+                if done:
+                    return
+                try:
+                    await asyncio.wait_for(signal.wait(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    # 结束事件缺失(如进程中断)时以任务状态为准
+                    if self.queue.get(job_id, include_result=False)["status"] in FINISHED_STATUSES:
+                        return
+                    writer.write(b": keepalive\n\n")
+        finally:
+            listeners = self._listeners.get(job_id)
+            if listeners is not None:
+                listeners.discard(signal)
+                if not listeners:
+                    del self._listeners[job_id]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="营销活动HTTP服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--db", default=None, help="任务队列数据库路径")
+    parser.add_argument("--knowledge-db", default=None, help="知识库数据库路径，默认读取KNOWLEDGE_DB_PATH，未设置时为本地数据目录下的knowledge_base.db")
+    parser.add_argument("--competitor-db", default=None, help="竞品情报库数据库路径，默认读取COMPETITOR_DB_PATH")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS, help="单个任务的最大执行次数")
+    parser.add_argument("--followup-db", default=None,
+                        help="跟进动作数据库路径，默认读取FOLLOWUP_DB_PATH，未设置时为本地数据目录下的followup_scheduler.db")
+    parser.add_argument("--followup-rate", type=float, default=2.0, help="跟进话术生成的每秒调用上限")
+    parser.add_argument("--no-followup", action="store_true", help="不调度下一步跟进动作")
+    args = parser.parse_args()
+
+    from modules.competitor_intel import CompetitorIntelStore
+    from modules.followup_scheduler import FollowUpScheduler
+    from modules.knowledge_store import KnowledgeStore
+
+    scheduler = None if args.no_followup else FollowUpScheduler(args.followup_db, rate_per_sec=args.followup_rate)
+    service = CampaignService(JobQueue(args.db, max_attempts=args.max_attempts), workers=args.workers,
+                              host=args.host, port=args.port, knowledge_store=KnowledgeStore(args.knowledge_db),
+                              competitor_store=CompetitorIntelStore(args.competitor_db), scheduler=scheduler)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("服务已停止")
+
+
+if __name__ == "__main__":
+    main()
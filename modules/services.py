@@ -0,0 +1,113 @@
+"""
+服务容器模块
+进程内共享的大模型调度器、提示词模板注册表与HTTP连接池，首次使用时创建；
+各阶段不再在每次调用时重复构造这些对象，调度器的响应缓存与统计也随之在活动间共享
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class ServiceContainer:
+    def __init__(self):
+        self._instances: Dict[str, Any] = {}
+        self._factories: Dict[str, Callable[[], Any]] = {
+            "orchestrator": self._create_orchestrator,
+            "prompt_manager": self._create_prompt_manager,
+            "http_pool": self._create_http_pool
+        }
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _create_orchestrator():
+        from modules.llm_orchestrator import LLMOrchestrator
+
+        return LLMOrchestrator()
+
+    @staticmethod
+    def _create_prompt_manager():
+        from modules.prompt_manager import PromptEngineeringManager
+
+        return PromptEngineeringManager()
+
+    @staticmethod
+    def _create_http_pool():
+        from modules.transport import ConnectionPool
+
+        return ConnectionPool()
+
+    def get(self, name: str) -> Any:
+        """获取(必要时创建)共享实例"""
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    if name not in self._factories:
+                        raise KeyError(f"未注册的服务: {name}")
+                    instance = self._instances[name] = self._factories[name]()
+        return instance
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """注册或替换服务工厂，已创建的同名实例会被丢弃"""
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    @property
+    def orchestrator(self):
+        return self.get("orchestrator")
+
+    @property
+    def prompt_manager(self):
+        return self.get("prompt_manager")
+
+    @property
+    def http_pool(self):
+        return self.get("http_pool")
+
+    def close(self):
+        with self._lock:
+            instances, self._instances = self._instances, {}
+        pool = instances.get("http_pool")
+        if pool is not None:
+            pool.close()
+
+
+# 本地数据目录名，位于用户数据目录(XDG_DATA_HOME，默认~/.local/share)下
+DATA_DIR_NAME = "industrial_marketing"
+
+
+def data_path(filename: str) -> str:
+    """
+    本地数据文件的默认路径(知识库、跟进动作等需要跨进程保留的数据)
+    目录取环境变量MARKETING_DATA_DIR，未设置时为用户数据目录下的industrial_marketing，不存在时创建
+    """
+    directory = os.environ.get("MARKETING_DATA_DIR") or os.path.join(
+        os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share"), DATA_DIR_NAME)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, filename)
+
+
+_services: Optional[ServiceContainer] = None
+_services_lock = threading.Lock()
+
+
+def get_services() -> ServiceContainer:
+    """进程内共享的服务容器"""
+    global _services
+    if _services is None:
+        with _services_lock:
+            if _services is None:
+                _services = ServiceContainer()
+    return _services
+
+
+def reset_services():
+    """关闭并丢弃共享服务(测试或重新配置时使用)"""
+    global _services
+    with _services_lock:
+        services, _services = _services, None
+    if services is not None:
+        services.close()
@@ -0,0 +1,278 @@
+"""
+工业战略洞察与定向模块
+实现客户需求挖掘、竞争情报洞察和市场机会研判功能
+"""
+
+import json
+import math
+
+from modules.tracing import traced
+
+
+class StrategyInsight:
+    def __init__(self, retrieval_index=None, knowledge_store=None, scoring_engine=None, competitor_store=None,
+                 orchestrator=None, prompt_manager=None):
+        from modules.market_scoring import MarketScoringEngine
+        from modules.services import get_services
+        
+        self.client_data = None
+        self.competitor_data = None
+        self.market_data = None
+        # 检索增强：本地混合索引与可选的知识库
+        self.retrieval_index = retrieval_index
+        self.knowledge_store = knowledge_store
+        self._indexed_docs = None
+        # 向量化市场评分引擎，权重可配置
+        self.scoring_engine = scoring_engine or MarketScoringEngine()
+        self._market_scores = None
+        # 竞品情报库，未指定时按需创建默认库(内存数据库)
+        self.competitor_store = competitor_store
+        self._competition_report = None
+        # 大模型调度器与提示词管理器，默认使用进程内共享实例
+        self.orchestrator = orchestrator or get_services().orchestrator
+        self.prompt_manager = prompt_manager or get_services().prompt_manager
+    
+    @traced()
+    def process_client_needs(self, client_data):
+        """
+        工业客户需求挖掘
+        输入: 企业工业属性数据
+        输出: 工业客户需求清单
+        """
+        from modules.needs_mining import DEFAULT_ENERGY_BASELINES, mine_needs_batch, urgency_ratings
+        
+        self.client_data = client_data
+        
+        # 分析硬性需求（明确表达的需求）
+        explicit_needs = []
+        if "pain_points" in client_data:
+            explicit_needs = client_data["pain_points"]
+        
+        # 挖掘隐性需求（未明确表达但可能存在的需求）
+        implicit_needs = []
+        if "operational_data" in client_data:
+            # 根据运营数据推断潜在需求，与批量接口共用同一套判定
+            ops_data = client_data["operational_data"]
+            industry = client_data.get("industry", "通用")
+            baseline = client_data.get("industry_average", ops_data.get("industry_average"))
+            if baseline is None:
+                baseline = DEFAULT_ENERGY_BASELINES.get(industry, DEFAULT_ENERGY_BASELINES["通用"])
+            result = mine_needs_batch({
+                "client_id": [client_data.get("id")],
+                "industry": [industry],
+                "downtime": [ops_data.get("downtime", math.nan)],
+                "energy_consumption": [ops_data.get("energy_consumption", math.nan)]
+            }, energy_baselines={industry: baseline})
+            implicit_needs = result["implicit_needs"][0]
+        
+        # 计算紧急度评级（1-10，10为最紧急）
+        urgency_rating = int(urgency_ratings(
+            [len(explicit_needs)], [bool(client_data.get("critical_issues"))]
+        )[0])
+        
+        return {
+            "explicit_needs": explicit_needs,
+            "implicit_needs": implicit_needs,
+            "urgency_rating": urgency_rating
+        }
+    
+    @traced()
+    def process_client_needs_batch(self, operational_data, energy_baselines=None):
+        """
+        批量工业客户需求挖掘
+        输入: 列式运营数据(client_id/industry/downtime/energy_consumption，
+              可选explicit_need_count/critical_issue)
+        输出: 各客户隐性需求、紧急度评级与行业基线
+        """
+        from modules.needs_mining import mine_needs_batch
+        
+        return mine_needs_batch(operational_data, energy_baselines)
+    
+    @traced()
+    def process_telemetry(self, telemetry_path, window_days=30, energy_baselines=None, chunk_rows=1 << 20):
+        """
+        基于设备遥测数据集的批量需求挖掘
+        输入: 遥测数据集目录(TelemetryWriter格式)
+        输出: 批量需求挖掘结果，附站点滚动统计
+        """
+        from modules.telemetry_loader import TelemetryReader
+        
+        features = TelemetryReader(telemetry_path, chunk_rows=chunk_rows).summarize(window_days)
+        result = self.process_client_needs_batch(features, energy_baselines)
+        result["telemetry"] = features
+        return result
+    
+    @traced()
+    def analyze_competition(self, competitor_data, include_history=False):
+        """
+        工业竞争情报洞察
+        输入: 工业竞品与行业数据
+        输出: 工业竞品动态报告
+        :param include_history: 为True时报告覆盖情报库中的全部历史情报，默认只覆盖本次输入的数据
+        """
+        self.competitor_data = competitor_data
+        
+        # 增量写入竞品情报库(精确重复忽略，近似重复合并)
+        if self.competitor_store is None:
+            from modules.competitor_intel import CompetitorIntelStore
+            self.competitor_store = CompetitorIntelStore()
+        store = self.competitor_store
+        case_ids, activity_ids = [], []
+        ingested = {
+            "cases": store.upsert_cases(competitor_data.get("win_cases", []), ids=case_ids),
+            "activities": store.upsert_activities(competitor_data.get("marketing_activities", []), ids=activity_ids)
+        }
+        if include_history:
+            case_ids = activity_ids = None
+        
+        # 案例、营销策略与应对建议均为索引查询，不再全量重建
+        report = {
+            "case_studies": store.case_studies(case_ids=case_ids),
+            "marketing_strategies": store.marketing_strategies(activity_ids=activity_ids),
+            "channel_success_rates": store.channel_success_rates(activity_ids=activity_ids),
+            "countermeasures": store.countermeasures(case_ids=case_ids, activity_ids=activity_ids),
+            "ingested": ingested
+        }
+        self._competition_report = (competitor_data, report)
+        return report
+    
+    @traced()
+    def evaluate_market_opportunities(self, market_data):
+        """
+        工业市场机会研判
+        输入: 工业市场定向数据
+        输出: 工业市场机会热力图
+        """
+        self.market_data = market_data
+        
+        prompt_manager = self.prompt_manager
+        
+        # 只注入与客户需求最相关的资料片段，而不是整份原始数据
+        context = self._retrieve_context(market_data)
+        
+        prompt = prompt_manager.render_template("strategy_analysis", context)
+        
+        # 调用大模型API
+        try:
+            response = self.orchestrator.dispatch_request(
+                task_type="strategy_analysis",
+                prompt=prompt
+            )
+            
+            # 解析大模型响应
+            if prompt_manager.validate_response_format(response["response"], "json"):
+                return json.loads(response["response"])
+            else:
+                raise ValueError("大模型返回格式无效")
+                
+        except Exception as e:
+            print(f"大模型调用失败，使用备用逻辑: {str(e)}")
+            # 降级方案：使用原逻辑
+            return self._fallback_market_analysis(market_data)
+    
+    def _retrieve_context(self, market_data, top_k=3):
+        """
+        检索增强上下文
+        增量登记行业趋势、案例与竞品签单资料，按客户需求检索top_k片段
+        """
+        from modules.retrieval_index import HybridRetrievalIndex, doc_text
+        
+        if self.retrieval_index is None:
+            self.retrieval_index = HybridRetrievalIndex()
+        if self._indexed_docs is None:
+            self._indexed_docs = {(doc["source"], doc["text"]) for doc in self.retrieval_index.docs}
+        
+        segments = [segment.get("name", "") for segment in market_data.get("customer_segments", [])]
+        pain_points = (self.client_data or {}).get("pain_points", [])
+        query = " ".join(segments + pain_points) or doc_text(market_data.get("industry_trends", []))
+        
+        sources = {
+            "industry_trend": market_data.get("industry_trends", []),
+            "competition": [market_data["competition_data"]] if market_data.get("competition_data") else [],
+            "case_study": market_data.get("case_studies", []),
+            "competitor_case": (self.competitor_data or {}).get("win_cases", [])
+        }
+        if self.knowledge_store is not None:
+            sources["knowledge"] = [f"{entry['title']}: {entry['content']}"
+                                    for entry in self.knowledge_store.search(query, top_k=top_k)]
+        
+        new_docs = []
+        for source, items in sources.items():
+            for item in items:
+                key = (source, doc_text(item))
+                if key not in self._indexed_docs:
+                    self._indexed_docs.add(key)
+                    new_docs.append({"text": key[1], "source": source})
+        self.retrieval_index.add_many(new_docs)
+        
+        index = self.retrieval_index
+        return {
+            "industry_trends": index.format_snippets(
+                index.search(query, top_k, sources=["industry_trend"])),
+            "competition_data": index.format_snippets(
+                index.search(query, top_k, sources=["competition", "competitor_case", "case_study"])),
+            "customer_needs": "; ".join(segments + pain_points) + "\n" + index.format_snippets(
+                index.search(query, top_k, sources=["knowledge"]))
+        }
+    
+    def _fallback_market_analysis(self, market_data):
+        """备用市场分析逻辑(向量化评分，同一份数据只计算一次)"""
+        if self._market_scores is None or self._market_scores[0] is not market_data:
+            self._market_scores = (market_data, self.scoring_engine.score(market_data))
+        return self._market_scores[1]
+    
+    @traced()
+    def generate_strategy_brief(self):
+        """
+        工业AI策略引擎
+        整合前三项分析结果，生成营销作战简报
+        """
+        if not all([self.client_data, self.competitor_data, self.market_data]):
+            raise ValueError("缺少必要的分析数据")
+        
+        # 市场机会研判只调用一次；大模型结果缺少评分字段时使用向量化评分
+        market_opps = self.evaluate_market_opportunities(self.market_data)
+        if "customer_profiles" not in market_opps or "regional_opportunities" not in market_opps:
+            market_opps = self._fallback_market_analysis(self.market_data)
+        
+        # 确定目标客户
+        if "target_segments" in market_opps:
+            target_clients = list(market_opps["target_segments"])
+        else:
+            target_clients = [profile["segment"] for profile in market_opps["customer_profiles"]
+                              if profile["priority"] == "高" and profile["size"] > 1000]
+        
+        # 制定核心策略
+        core_strategies = []
+        client_needs = self.process_client_needs(self.client_data)
+        if client_needs["explicit_needs"]:
+            core_strategies.append(f"针对明确需求：{', '.join(client_needs['explicit_needs'])}")
+        if client_needs["implicit_needs"]:
+            core_strategies.append(f"挖掘潜在需求：{', '.join(client_needs['implicit_needs'])}")
+        
+        # 分析风险与机会
+        risks_and_opportunities = []
+        # 沿用已生成的竞品报告，同一份数据不重复写入情报库
+        if self._competition_report is not None and self._competition_report[0] is self.competitor_data:
+            competition = self._competition_report[1]
+        else:
+            competition = self.analyze_competition(self.competitor_data)
+        if competition["countermeasures"]:
+            risks_and_opportunities.append(f"竞争应对：{', '.join(competition['countermeasures'])}")
+        
+        if market_opps["regional_opportunities"]:
+            if market_opps.get("top_regions"):
+                # 评分引擎已给出排序，直接取头部区域
+                best_region = next(r for r in market_opps["regional_opportunities"]
+                                   if r["region"] == market_opps["top_regions"][0])
+            else:
+                best_region = max(market_opps["regional_opportunities"], key=lambda x: x["opportunity"])
+            risks_and_opportunities.append(f"最佳区域机会：{best_region['region']} (机会指数:{best_region['opportunity']:.1f})")
+        
+        return {
+            "target_clients": target_clients,
+            "core_strategies": core_strategies,
+            "risks_and_opportunities": risks_and_opportunities,
+            "urgency": client_needs["urgency_rating"],
+            "market_heat_map": market_opps.get("heat_map")
+        }
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+客户策略规则引擎模块
+策略规则以数据声明，预编译为关键词字典树，批量匹配客户类型
+"""
+
+import json
+from typing import Dict, Any, Iterable, List, Optional
+
+# 默认规则：按列表顺序确定优先级，排在前面的规则优先命中
+DEFAULT_STRATEGY_RULES: List[Dict[str, Any]] = [
+    {
+        "segment": "国企",
+        "keywords": ["国企", "央企", "国有"],
+        "strategy": {"approach": "技术合规导向", "focus": "长期合作关系"},
+        "value_proposition": {"value": "符合国家标准的解决方案", "differentiator": "政府认证资质"},
+        "channels": ["行业展会", "政府对接会", "行业协会"],
+        "content_formats": ["白皮书", "技术标准文档", "合规报告"],
+        "content_style": {"key_benefits": "技术优势", "style_preference": "专业严谨", "format": "PDF"},
+        "scripts": [
+            {"type": "技术沟通", "script": "我们的方案完全符合国家标准GB/T XXXXX，已获得XX认证..."},
+            {"type": "价格谈判", "script": "考虑到长期合作和政府项目特点，我们可以提供..."}
+        ]
+    },
+    {
+        "segment": "民企",
+        "keywords": ["民企", "民营", "私企"],
+        "strategy": {"approach": "ROI导向", "focus": "快速见效"},
+        "value_proposition": {"value": "成本效益优化方案", "differentiator": "快速实施能力"},
+        "channels": ["垂直平台", "私域社群", "线上研讨会"],
+        "content_formats": ["案例研究", "ROI计算器", "快速实施指南"],
+        "content_style": {"key_benefits": "成本效益", "style_preference": "简洁实用", "format": "Excel"},
+        "scripts": [
+            {"type": "ROI展示", "script": "根据我们的计算，实施后6个月内即可收回成本，年节省XX万元..."},
+            {"type": "快速实施", "script": "我们承诺30天内完成部署，不影响您的正常生产..."}
+        ]
+    },
+    {
+        "segment": "外企",
+        "keywords": ["外企", "外资", "合资"],
+        "strategy": {"approach": "全球化标准", "focus": "技术创新"},
+        "value_proposition": {"value": "国际认证的技术方案", "differentiator": "全球服务网络"},
+        "channels": ["国际展会", "英文技术社区", "全球合作伙伴网络"],
+        "content_formats": ["英文技术文档", "全球案例库", "多语言视频"],
+        "content_style": {"key_benefits": "成本效益", "style_preference": "简洁实用", "format": "Excel"},
+        "scripts": [
+            {"type": "全球标准", "script": "我们的技术已通过ISO XXXXX认证，在全球XX个国家成功应用..."},
+            {"type": "本地支持", "script": "我们在本地有XX名认证工程师，提供7×24小时支持..."}
+        ]
+    }
+]
+
+_RULE = "$rule"
+
+
+class StrategyRuleEngine:
+    def __init__(self, rules: Optional[Iterable[Dict[str, Any]]] = None):
+        """
+        :param rules: 规则列表，默认使用DEFAULT_STRATEGY_RULES
+        """
+        self.rules: List[Dict[str, Any]] = []
+        self.segments: Dict[str, Dict[str, Any]] = {}
+        self._trie: Dict[str, Any] = {}
+        self._max_keyword_length = 0
+        self._memo: Dict[str, Optional[int]] = {}
+        for rule in (DEFAULT_STRATEGY_RULES if rules is None else rules):
+            self.add_rule(rule)
+
+    @classmethod
+    def from_json(cls, path: str) -> "StrategyRuleEngine":
+        """从JSON规则文件加载，新增细分客户无需修改代码"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def add_rule(self, rule: Dict[str, Any]):
+        """追加规则并编译其关键词(优先级低于已有规则)"""
+        priority = len(self.rules)
+        self.rules.append(rule)
+        self.segments.setdefault(rule["segment"], rule)
+        for keyword in rule.get("keywords", [rule["segment"]]):
+            node = self._trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node.setdefault(_RULE, priority)
+            self._max_keyword_length = max(self._max_keyword_length, len(keyword))
+        self._memo.clear()
+
+    def _scan(self, client_type: str) -> Optional[int]:
+        """在字典树上扫描客户类型字符串，返回命中的最高优先级规则编号"""
+        best = None
+        for start in range(len(client_type)):
+            node = self._trie
+            for char in client_type[start:start + self._max_keyword_length]:
+                node = node.get(char)
+                if node is None:
+                    break
+                priority = node.get(_RULE)
+                if priority is not None and (best is None or priority < best):
+                    best = priority
+        return best
+
+    def match(self, client_type: str) -> Optional[Dict[str, Any]]:
+        """匹配单个客户类型，结果按客户类型缓存"""
+        if client_type not in self._memo:
+            self._memo[client_type] = self._scan(client_type)
+        priority = self._memo[client_type]
+        return None if priority is None else self.rules[priority]
+
+    def match_many(self, client_types: Iterable[str]) -> List[Optional[Dict[str, Any]]]:
+        """批量匹配"""
+        return [self.match(client_type) for client_type in client_types]
+
+    def rule_for_segment(self, segment: str) -> Optional[Dict[str, Any]]:
+        """按细分客户名称(策略中的type字段)取规则"""
+        return self.segments.get(segment)
+
+
+_default_engine = None
+
+
+def get_default_engine() -> StrategyRuleEngine:
+    """进程内共享的默认规则引擎"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = StrategyRuleEngine()
+    return _default_engine
@@ -0,0 +1,175 @@
+"""
+设备遥测数据加载模块
+列式二进制遥测文件按块内存映射读取，逐块累计各站点日级停机与能耗，
+再计算滚动窗口统计，输出可直接用于批量需求挖掘的站点特征
+"""
+
+import json
+import os
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+MANIFEST = "manifest.json"
+SECONDS_PER_DAY = 86400
+
+# 列名 -> 存储类型(小端定长)，每列一个.bin文件
+TELEMETRY_COLUMNS: Dict[str, str] = {
+    "site": "<i4",
+    "timestamp": "<i8",
+    "downtime": "<f4",
+    "energy": "<f4"
+}
+
+
+def _read_manifest(path: str) -> Dict[str, Any]:
+    with open(os.path.join(path, MANIFEST), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TelemetryWriter:
+    def __init__(self, path: str, sites: Optional[List[Dict[str, Any]]] = None):
+        """
+        遥测数据集写入(追加模式)
+        :param path: 数据集目录
+        :param sites: 站点列表，每项含id与industry，记录中的site为其下标
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, MANIFEST)):
+            manifest = _read_manifest(path)
+            self.sites = manifest["sites"] + list(sites or [])[len(manifest["sites"]):]
+            self.rows = manifest["rows"]
+            self.time_range = manifest["time_range"]
+        else:
+            self.sites = list(sites or [])
+            self.rows = 0
+            self.time_range = None
+        self._files = {name: open(os.path.join(path, f"{name}.bin"), "ab") for name in TELEMETRY_COLUMNS}
+
+    def append(self, site, timestamp, downtime, energy):
+        """追加一批记录(等长数组)"""
+        columns = {"site": site, "timestamp": timestamp, "downtime": downtime, "energy": energy}
+        arrays = {name: np.asarray(columns[name], dtype=dtype) for name, dtype in TELEMETRY_COLUMNS.items()}
+        n = len(arrays["timestamp"])
+        if any(len(array) != n for array in arrays.values()):
+            raise ValueError("遥测列长度不一致")
+        if not n:
+            return
+        for name, array in arrays.items():
+            array.tofile(self._files[name])
+        low, high = int(arrays["timestamp"].min()), int(arrays["timestamp"].max())
+        self.time_range = [low, high] if self.time_range is None else [min(low, self.time_range[0]), max(high, self.time_range[1])]
+        self.rows += n
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        manifest = {
+            "columns": TELEMETRY_COLUMNS,
+            "rows": self.rows,
+            "time_range": self.time_range,
+            "sites": self.sites
+        }
+        with open(os.path.join(self.path, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TelemetryReader:
+    def __init__(self, path: str, chunk_rows: int = 1 << 20):
+        """
+        :param path: 数据集目录
+        :param chunk_rows: 每块映射的记录数，决定单块内存占用
+        """
+        self.path = path
+        self.chunk_rows = chunk_rows
+        manifest = _read_manifest(path)
+        self.rows = manifest["rows"]
+        self.sites = manifest["sites"]
+        self.time_range = manifest["time_range"]
+        self.columns = manifest["columns"]
+
+    def iter_chunks(self, columns: Iterable[str] = tuple(TELEMETRY_COLUMNS)) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        逐块产出各列的内存映射视图
+        每块单独映射，块处理完毕后映射即释放，常驻内存不随文件大小增长
+        """
+        columns = list(columns)
+        for start in range(0, self.rows, self.chunk_rows):
+            count = min(self.chunk_rows, self.rows - start)
+            chunk = {}
+            for name in columns:
+                dtype = np.dtype(self.columns[name])
+                chunk[name] = np.memmap(os.path.join(self.path, f"{name}.bin"), dtype=dtype, mode="r",
+                                        offset=start * dtype.itemsize, shape=(count,))
+            yield chunk
+            del chunk
+
+    def daily_totals(self) -> Dict[str, np.ndarray]:
+        """
+        逐块累计站点×日的停机时长、能耗与记录数
+        内存占用为O(站点数×天数)，与记录总数无关
+        """
+        n_sites = len(self.sites)
+        origin = self.time_range[0] // SECONDS_PER_DAY if self.time_range else 0
+        n_days = (self.time_range[1] // SECONDS_PER_DAY - origin + 1) if self.time_range else 0
+        size = n_sites * n_days
+        downtime = np.zeros(size)
+        energy = np.zeros(size)
+        records = np.zeros(size, dtype=np.int64)
+        for chunk in self.iter_chunks():
+            cell = chunk["site"].astype(np.int64) * n_days + (chunk["timestamp"] // SECONDS_PER_DAY - origin)
+            downtime += np.bincount(cell, weights=chunk["downtime"], minlength=size)
+            energy += np.bincount(cell, weights=chunk["energy"], minlength=size)
+            records += np.bincount(cell, minlength=size)
+        shape = (n_sites, n_days)
+        return {
+            "downtime": downtime.reshape(shape),
+            "energy": energy.reshape(shape),
+            "records": records.reshape(shape),
+            "first_day": origin
+        }
+
+    def summarize(self, window_days: int = 30) -> Dict[str, Any]:
+        """
+        站点级滚动统计(列式)
+        downtime/energy_consumption为最近一个窗口的累计值，可直接传入批量需求挖掘；
+        另给出窗口峰值停机、与上一窗口相比的变化量和覆盖天数
+        """
+        totals = self.daily_totals()
+        n_sites, n_days = totals["downtime"].shape
+        window = max(1, min(window_days, n_days))
+
+        def window_sums(daily):
+            padded = np.concatenate([np.zeros((n_sites, 1)), np.cumsum(daily, axis=1)], axis=1)
+            return padded[:, window:] - padded[:, :-window]
+
+        if n_days:
+            downtime_windows = window_sums(totals["downtime"])
+            energy_windows = window_sums(totals["energy"])
+        else:
+            downtime_windows = energy_windows = np.zeros((n_sites, 1))
+
+        def change(windows):
+            if windows.shape[1] <= window:
+                return np.zeros(n_sites)
+            return windows[:, -1] - windows[:, -1 - window]
+
+        return {
+            "client_id": [site["id"] for site in self.sites],
+            "industry": [site.get("industry", "通用") for site in self.sites],
+            "downtime": downtime_windows[:, -1],
+            "energy_consumption": energy_windows[:, -1],
+            "peak_window_downtime": downtime_windows.max(axis=1),
+            "downtime_change": change(downtime_windows),
+            "energy_change": change(energy_windows),
+            "days_observed": (totals["records"] > 0).sum(axis=1),
+            "records": totals["records"].sum(axis=1),
+            "window_days": window
+        }
@@ -0,0 +1,89 @@
+"""
+文本特征模块
+为知识库检索、去重等功能提供中英文混合文本的规范化、分词与SimHash指纹，
+以及实体消解使用的企业名称与联系人规范化
+"""
+
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+from typing import List
+
+import numpy as np
+
+_CJK_RUN = re.compile(r"[一-鿿]+")
+_WORD = re.compile(r"[a-z0-9]+")
+_SPACES = re.compile(r"\s+")
+_PARENS = re.compile(r"\([^)]*\)")
+_NON_WORD = re.compile(r"[^0-9a-z一-鿿]+")
+# 名称末尾的组织形式后缀，可能叠加出现(如"集团有限公司")
+_CN_SUFFIX = re.compile(r"(?:股份有限公司|有限责任公司|有限公司|股份公司|集团|公司|企业|工厂|厂)$")
+_EN_SUFFIX = re.compile(r"(?:^| )(?:co|ltd|limited|inc|corp|corporation|company|group|gmbh|llc|plc)$")
+_CN_TITLE = re.compile(r"(?:总经理|副总|经理|总监|主任|工程师|工|先生|女士|老师|总)$")
+_EN_TITLE = re.compile(r"^(?:mr|mrs|ms|dr|miss) ")
+
+
+def normalize_text(text: str) -> str:
+    """全角转半角、转小写并压缩空白"""
+    text = unicodedata.normalize("NFKC", str(text)).lower()
+    return _SPACES.sub(" ", text).strip()
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    中英文混合分词
+    中文按字二元组(单字词保留单字)切分，英文与数字按单词切分
+    """
+    text = normalize_text(text)
+    tokens = _WORD.findall(text)
+    for run in _CJK_RUN.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def simhash(text: str, bits: int = 64) -> int:
+    """
+    SimHash指纹：词项哈希按位加权投票(权重为词频)
+    近似文本的指纹汉明距离小
+    """
+    counts = Counter(tokenize(text))
+    if not counts:
+        return 0
+    hashes = np.array([
+        int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+        for token in counts
+    ], dtype=np.uint64)
+    weights = np.array(list(counts.values()), dtype=np.int64)
+    bit_values = (hashes[:, None] >> np.arange(bits, dtype=np.uint64)) & np.uint64(1)
+    votes = ((bit_values.astype(np.int64) * 2 - 1) * weights[:, None]).sum(axis=0)
+    return sum(1 << i for i in np.flatnonzero(votes > 0).tolist())
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def normalize_company_name(name: str) -> str:
+    """
+    企业名称规范化：全角转半角、去括号内容(如地区)与标点，并剥离末尾的组织形式后缀，
+    "XX科技(上海)有限公司"与"XX科技"得到相同结果；剥离后为空时保留原名称
+    """
+    text = _NON_WORD.sub(" ", _PARENS.sub(" ", normalize_text(name))).strip()
+    stripped = text
+    while True:
+        shorter = _EN_SUFFIX.sub("", _CN_SUFFIX.sub("", stripped)).strip()
+        if shorter == stripped:
+            break
+        stripped = shorter
+    return (stripped or text).replace(" ", "")
+
+
+def normalize_contact(contact: str) -> str:
+    """联系人规范化：去称谓与职务(张经理 -> 张，Mr. John Smith -> johnsmith)"""
+    text = _NON_WORD.sub(" ", normalize_text(contact)).strip()
+    text = _EN_TITLE.sub("", text)
+    return (_CN_TITLE.sub("", text) or text).replace(" ", "")
@@ -0,0 +1,303 @@
+"""
+链路追踪模块
+以上下文管理器/装饰器记录嵌套的耗时区间(工作流 → 阶段 → 方法 → 大模型调用)，
+可按类别对区间做cProfile采样，导出Chrome trace JSON(chrome://tracing、Perfetto)与
+火焰图折叠栈；未开启追踪时每个埋点只有一次全局变量判断
+用法: python -m modules.tracing --output trace.json --collapsed trace.folded --profile stage
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Callable, Iterable, List, Optional
+
+# 当前活动的追踪器，None表示追踪关闭
+_tracer = None
+# 当前上下文中最内层的区间
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("id", "parent", "name", "category", "args", "path", "thread_id", "start_ns", "end_ns", "profile")
+
+    def __init__(self, span_id: int, parent: Optional["Span"], name: str, category: str, args: Dict[str, Any]):
+        self.id = span_id
+        self.parent = parent
+        self.name = name
+        self.category = category
+        self.args = args
+        self.path = (parent.path if parent is not None else ()) + (name,)
+        self.thread_id = threading.get_ident()
+        self.start_ns = 0
+        self.end_ns = 0
+        self.profile = None
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+
+class Tracer:
+    def __init__(self, profile_categories: Iterable[str] = (), profile_top: int = 15):
+        """
+        :param profile_categories: 需要cProfile采样的区间类别，如("stage",)
+        :param profile_top: 每个采样区间保留的累计耗时最高的函数数
+        """
+        self.profile_categories = frozenset(profile_categories)
+        self.profile_top = profile_top
+        self.spans: List[Span] = []
+        self.origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        # 同一时刻只允许一个cProfile实例，嵌套或并发的区间不重复采样
+        self._profiling = False
+
+    def _new_span(self, name: str, category: str, args: Dict[str, Any]) -> Span:
+        with self._lock:
+            self._next_id += 1
+            span_id = self._next_id
+        return Span(span_id, _current_span.get(), name, category, args)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    # ---- 导出 ----
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace事件格式(完整事件ph=X，时间单位微秒)"""
+        pid = os.getpid()
+        events = []
+        for span in sorted(self.spans, key=lambda s: s.start_ns):
+            args = dict(span.args, span_id=span.id)
+            if span.parent is not None:
+                args["parent_id"] = span.parent.id
+            if span.profile is not None:
+                args["profile"] = span.profile
+            events.append({
+                "name": span.name,
+                "cat": span.category or "default",
+                "ph": "X",
+                "ts": (span.start_ns - self.origin_ns) / 1000,
+                "dur": span.duration_ns / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": args
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False, default=str)
+
+    def _self_times(self) -> Dict[int, int]:
+        """区间自身耗时 = 总耗时 - 同线程子区间耗时(跨线程的子区间与父区间并行，不扣除)"""
+        self_ns = {span.id: span.duration_ns for span in self.spans}
+        for span in self.spans:
+            if span.parent is not None and span.parent.id in self_ns and span.thread_id == span.parent.thread_id:
+                self_ns[span.parent.id] -= span.duration_ns
+        return {span_id: max(0, ns) for span_id, ns in self_ns.items()}
+
+    def collapsed_stacks(self) -> List[str]:
+        """火焰图折叠栈(flamegraph.pl/speedscope格式)，权重为自身耗时(微秒)"""
+        totals: Dict[tuple, int] = {}
+        self_ns = self._self_times()
+        for span in self.spans:
+            totals[span.path] = totals.get(span.path, 0) + self_ns[span.id]
+        return [f"{';'.join(path)} {ns // 1000}" for path, ns in sorted(totals.items()) if ns >= 1000]
+
+    def write_collapsed(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.collapsed_stacks()) + "\n")
+
+    def summary(self, top: Optional[int] = None) -> List[Dict[str, Any]]:
+        """按区间名汇总调用次数、总耗时与自身耗时，自身耗时高的排在前面"""
+        self_ns = self._self_times()
+        rows: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans:
+            row = rows.setdefault(span.name, {"name": span.name, "category": span.category,
+                                              "count": 0, "total_ms": 0.0, "self_ms": 0.0})
+            row["count"] += 1
+            row["total_ms"] += span.duration_ns / 1e6
+            row["self_ms"] += self_ns[span.id] / 1e6
+        result = sorted(rows.values(), key=lambda row: row["self_ms"], reverse=True)
+        for row in result:
+            row["total_ms"], row["self_ms"] = round(row["total_ms"], 3), round(row["self_ms"], 3)
+        return result[:top] if top else result
+
+
+class _SpanContext:
+    __slots__ = ("tracer", "name", "category", "args", "span", "token", "profiler")
+
+    def __init__(self, tracer: Tracer, name: str, category: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self) -> Span:
+        tracer = self.tracer
+        self.span = span = tracer._new_span(self.name, self.category, self.args)
+        self.token = _current_span.set(span)
+        self.profiler = None
+        if self.category in tracer.profile_categories:
+            with tracer._lock:
+                claimed, tracer._profiling = not tracer._profiling, True
+            if claimed:
+                # 分析器只在需要采样时加载，避免拖慢包的导入
+                import cProfile
+
+                self.profiler = cProfile.Profile()
+                try:
+                    self.profiler.enable()
+                except ValueError:
+                    # 已有其他分析工具(如覆盖率统计)在运行
+                    self.profiler = None
+                    tracer._profiling = False
+        span.start_ns = time.perf_counter_ns()
+        return span
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self.span
+        span.end_ns = time.perf_counter_ns()
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.tracer._profiling = False
+            span.profile = _profile_top(self.profiler, self.tracer.profile_top)
+        if exc_type is not None:
+            span.args["error"] = exc_type.__name__
+        _current_span.reset(self.token)
+        self.tracer._finish(span)
+        return False
+
+
+class _NoopContext:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopContext()
+
+
+def _profile_top(profiler, top: int) -> List[Dict[str, Any]]:
+    import io
+    import pstats
+
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, func), (calls, _, tottime, cumtime, _) in stats.stats.items():
+        rows.append({"function": f"{os.path.basename(filename)}:{line}({func})", "calls": calls,
+                     "tottime_ms": round(tottime * 1000, 3), "cumtime_ms": round(cumtime * 1000, 3)})
+    rows.sort(key=lambda row: row["cumtime_ms"], reverse=True)
+    return rows[:top]
+
+
+def span(name: str, category: str = "", **args):
+    """
+    记录一个区间
+    用法: with span("planning", "stage"): ...
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP
+    return _SpanContext(tracer, name, category, args)
+
+
+def annotate(**args):
+    """给当前区间附加参数(如处理条数)，未开启追踪时不做任何事"""
+    current = _current_span.get()
+    if current is not None:
+        current.args.update(args)
+
+
+def traced(name: Optional[str] = None, category: str = "method"):
+    """
+    装饰器形式的区间，默认以函数限定名(类名.方法名)命名
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            with _SpanContext(tracer, span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def propagate(func: Callable) -> Callable:
+    """
+    让提交到线程池的函数沿用当前区间作为父区间
+    (contextvars不会自动传入线程池的工作线程)
+    """
+    parent = _current_span.get()
+    if _tracer is None or parent is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _current_span.set(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_span.reset(token)
+    return wrapper
+
+
+def start_tracing(profile_categories: Iterable[str] = (), profile_top: int = 15) -> Tracer:
+    """开启进程内追踪，返回收集区间的追踪器"""
+    global _tracer
+    _tracer = Tracer(profile_categories, profile_top)
+    return _tracer
+
+
+def stop_tracing() -> Optional[Tracer]:
+    """关闭追踪，返回此前的追踪器"""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def is_tracing() -> bool:
+    return _tracer is not None
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="追踪一次完整营销工作流")
+    parser.add_argument("--output", default="trace.json", help="Chrome trace JSON输出路径")
+    parser.add_argument("--collapsed", default=None, help="火焰图折叠栈输出路径")
+    parser.add_argument("--profile", nargs="*", default=[], help="需要cProfile采样的区间类别，如stage")
+    args = parser.parse_args()
+
+    from modules.industrial_marketing_system import IndustrialMarketingSystem
+    # 以-m运行时本文件是__main__，埋点引用的是modules.tracing中的追踪器
+    from modules.tracing import start_tracing, stop_tracing
+
+    tracer = start_tracing(args.profile)
+    try:
+        IndustrialMarketingSystem().run_workflow()
+    finally:
+        stop_tracing()
+    tracer.write_chrome_trace(args.output)
+    if args.collapsed:
+        tracer.write_collapsed(args.collapsed)
+    print(f"追踪结果已写入: {args.output}")
+    for row in tracer.summary(top=10):
+        print(f"{row['name']:<48} {row['count']:>5}次 总{row['total_ms']:>10.2f}ms 自身{row['self_ms']:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
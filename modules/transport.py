@@ -0,0 +1,338 @@
+"""
+提供商传输层模块
+按端点(协议, 主机, 端口)维护HTTP keep-alive连接池，请求结束后连接归还复用，
+避免每次调用重新建立TCP/TLS连接；每个端点的并发连接数有上限，超出时排队等待。
+提供同步(ConnectionPool)与asyncio(AsyncConnectionPool)两种客户端，
+http2=True时改用httpx的HTTP/2客户端在单个连接上多路复用(需安装httpx[http2])
+"""
+
+import asyncio
+import http.client
+import select
+import socket
+import ssl
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+# 复用的空闲连接可能已被服务端关闭，此时换新连接重试
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+# 请求已发出后连接断开时，服务端可能已处理该请求；只有幂等方法可以换连接重发，
+# 否则提供商的POST调用可能被执行(并计费)两次
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+
+class TransportError(Exception):
+    """传输层错误"""
+
+
+class PoolTimeoutError(TransportError):
+    """等待空闲连接超时"""
+
+
+def _endpoint(url: str) -> Tuple[Tuple[str, str, int], str]:
+    """拆分URL为端点键(协议, 主机, 端口)与请求路径"""
+    parts = urlsplit(url)
+    scheme = parts.scheme or "http"
+    port = parts.port or (443 if scheme == "https" else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return (scheme, parts.hostname, port), path
+
+
+def _dropped(connection: http.client.HTTPConnection) -> bool:
+    """空闲连接可读说明服务端已关闭(或发来了无法对应请求的数据)，不能再复用"""
+    sock = connection.sock
+    if sock is None:
+        return True
+    try:
+        return bool(select.select([sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+def _httpx():
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError("HTTP/2传输需要安装httpx[http2]") from e
+    return httpx
+
+
+class ConnectionPool:
+    def __init__(self, max_connections_per_endpoint: int = 10, max_idle_per_endpoint: Optional[int] = None,
+                 timeout: float = 60.0, pool_timeout: float = 30.0, http2: bool = False):
+        """
+        :param max_connections_per_endpoint: 每个端点同时使用的连接数上限
+        :param max_idle_per_endpoint: 每个端点保留的空闲连接数上限，默认与连接数上限相同
+        :param timeout: 连接与读取超时(秒)
+        :param pool_timeout: 连接数已满时等待空闲连接的超时(秒)
+        :param http2: 使用httpx的HTTP/2客户端
+        """
+        self.max_connections_per_endpoint = max_connections_per_endpoint
+        self.max_idle_per_endpoint = max_idle_per_endpoint or max_connections_per_endpoint
+        self.timeout = timeout
+        self.pool_timeout = pool_timeout
+        self.http2 = http2
+        self._idle: Dict[Tuple[str, str, int], list] = {}
+        self._slots: Dict[Tuple[str, str, int], threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "connections_created": 0, "connections_reused": 0, "pool_waits": 0}
+        self._client = None
+        if http2:
+            httpx = _httpx()
+            self._client = httpx.Client(http2=True, timeout=timeout, limits=httpx.Limits(
+                max_connections=max_connections_per_endpoint,
+                max_keepalive_connections=self.max_idle_per_endpoint))
+
+    def _slot(self, key: Tuple[str, str, int]) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = threading.BoundedSemaphore(self.max_connections_per_endpoint)
+        return slot
+
+    def _acquire(self, key: Tuple[str, str, int]) -> Tuple[http.client.HTTPConnection, bool]:
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                connection = idle.pop() if idle else None
+                if connection is None:
+                    self.stats["connections_created"] += 1
+                    break
+            if not _dropped(connection):
+                with self._lock:
+                    self.stats["connections_reused"] += 1
+                return connection, True
+            connection.close()
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(host, port, timeout=self.timeout)
+        connection.connect()
+        # 小请求在长连接上连续发送，关闭Nagle避免等待上一个包的确认
+        connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return connection, False
+
+    def _release(self, key: Tuple[str, str, int], connection: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_endpoint:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def request(self, method: str, url: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        发送请求并读取完整响应
+        复用的连接在请求发出前失效时换新连接重试；请求发出后才断开的，只重试幂等方法
+        :return: (状态码, 小写键的响应头, 响应体)
+        :raises PoolTimeoutError: 端点连接数已满且等待超时
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+        if self._client is not None:
+            response = self._client.request(method, url, content=body, headers=headers)
+            return response.status_code, {k.lower(): v for k, v in response.headers.items()}, response.content
+
+        key, path = _endpoint(url)
+        slot = self._slot(key)
+        if not slot.acquire(blocking=False):
+            with self._lock:
+                self.stats["pool_waits"] += 1
+            if not slot.acquire(timeout=self.pool_timeout):
+                raise PoolTimeoutError(f"等待{key[1]}:{key[2]}的空闲连接超时")
+        try:
+            retryable = method.upper() in IDEMPOTENT_METHODS
+            while True:
+                connection, reused = self._acquire(key)
+                sent = False
+                try:
+                    connection.request(method, path, body=body, headers=headers or {})
+                    sent = True
+                    response = connection.getresponse()
+                    data = response.read()
+                except _STALE_ERRORS:
+                    connection.close()
+                    if reused and (not sent or retryable):
+                        continue
+                    raise
+                except Exception:
+                    connection.close()
+                    raise
+                if response.will_close:
+                    connection.close()
+                else:
+                    self._release(key, connection)
+                return response.status, {name.lower(): value for name, value in response.getheaders()}, data
+        finally:
+            slot.release()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+        if self._client is not None:
+            self._client.close()
+
+
+class _AsyncConnection:
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def usable(self) -> bool:
+        return not self.reader.at_eof() and not self.writer.is_closing()
+
+    def close(self):
+        self.writer.close()
+
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes, bool]:
+    """读取一个HTTP/1.1响应，返回(状态码, 响应头, 响应体, 连接是否可复用)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("连接已被服务端关闭")
+    version, status = status_line.split(None, 2)[:2]
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    keep_alive = version == b"HTTP/1.1" and headers.get("connection", "").lower() != "close"
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0], 16)
+            if size == 0:
+                # 跳过尾部字段直至空行
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        body = b"".join(chunks)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    else:
+        body = await reader.read()
+        keep_alive = False
+    return int(status), headers, body, keep_alive
+
+
+class AsyncConnectionPool:
+    def __init__(self, max_connections_per_endpoint: int = 10, max_idle_per_endpoint: Optional[int] = None,
+                 timeout: float = 60.0, pool_timeout: float = 30.0, http2: bool = False):
+        """
+        asyncio版连接池，参数含义与ConnectionPool相同；实例需在同一事件循环内使用
+        """
+        self.max_connections_per_endpoint = max_connections_per_endpoint
+        self.max_idle_per_endpoint = max_idle_per_endpoint or max_connections_per_endpoint
+        self.timeout = timeout
+        self.pool_timeout = pool_timeout
+        self.http2 = http2
+        self._idle: Dict[Tuple[str, str, int], list] = {}
+        self._slots: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+        self._ssl_context = None
+        self.stats = {"requests": 0, "connections_created": 0, "connections_reused": 0, "pool_waits": 0}
+        self._client = None
+        if http2:
+            httpx = _httpx()
+            self._client = httpx.AsyncClient(http2=True, timeout=timeout, limits=httpx.Limits(
+                max_connections=max_connections_per_endpoint,
+                max_keepalive_connections=self.max_idle_per_endpoint))
+
+    async def _acquire(self, key: Tuple[str, str, int]) -> Tuple[_AsyncConnection, bool]:
+        idle = self._idle.get(key)
+        while idle:
+            connection = idle.pop()
+            if connection.usable():
+                self.stats["connections_reused"] += 1
+                return connection, True
+            connection.close()
+        scheme, host, port = key
+        if scheme == "https" and self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=self._ssl_context if scheme == "https" else None),
+            timeout=self.timeout)
+        self.stats["connections_created"] += 1
+        return _AsyncConnection(reader, writer), False
+
+    def _release(self, key: Tuple[str, str, int], connection: _AsyncConnection):
+        idle = self._idle.setdefault(key, [])
+        if len(idle) < self.max_idle_per_endpoint:
+            idle.append(connection)
+        else:
+            connection.close()
+
+    async def request(self, method: str, url: str, body: Optional[bytes] = None,
+                      headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        发送请求并读取完整响应，重试规则与ConnectionPool.request相同
+        :return: (状态码, 小写键的响应头, 响应体)
+        """
+        self.stats["requests"] += 1
+        if self._client is not None:
+            response = await self._client.request(method, url, content=body, headers=headers)
+            return response.status_code, {k.lower(): v for k, v in response.headers.items()}, response.content
+
+        key, path = _endpoint(url)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = asyncio.Semaphore(self.max_connections_per_endpoint)
+        if not slot.locked():
+            # 有空闲名额时acquire不会挂起
+            await slot.acquire()
+        else:
+            self.stats["pool_waits"] += 1
+            try:
+                await asyncio.wait_for(slot.acquire(), timeout=self.pool_timeout)
+            except asyncio.TimeoutError:
+                raise PoolTimeoutError(f"等待{key[1]}:{key[2]}的空闲连接超时")
+        try:
+            body = body or b""
+            lines = [f"{method} {path} HTTP/1.1", f"Host: {key[1]}:{key[2]}", f"Content-Length: {len(body)}"]
+            lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+            request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+            retryable = method.upper() in IDEMPOTENT_METHODS
+            while True:
+                connection, reused = await self._acquire(key)
+                sent = False
+                try:
+                    connection.writer.write(request)
+                    await connection.writer.drain()
+                    sent = True
+                    status, response_headers, data, keep_alive = await asyncio.wait_for(
+                        _read_response(connection.reader), timeout=self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    connection.close()
+                    if reused and (not sent or retryable):
+                        continue
+                    raise
+                except BaseException:
+                    connection.close()
+                    raise
+                if keep_alive:
+                    self._release(key, connection)
+                else:
+                    connection.close()
+                return status, response_headers, data
+        finally:
+            slot.release()
+
+    async def close(self):
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+        if self._client is not None:
+            await self._client.aclose()
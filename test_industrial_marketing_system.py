@@ -2,13 +2,42 @@
 工业营销自动化系统集成测试脚本
 """
 
+import json
+
+import pytest
+
 from modules.strategy_insight import StrategyInsight
 from modules.planning import Planning
 from modules.content_creation import ContentCreation
 from modules.execution import Execution
 from modules.analysis import Analysis
+from modules.rolling_metrics import RollingMetrics
+from modules.channel_stats import compare_stats
+from modules.failure_digest import build_failure_digest
+from modules.knowledge_store import KnowledgeStore
+from modules.retrieval_index import HybridRetrievalIndex
+from modules.strategy_rules import StrategyRuleEngine
+from modules.pricing_engine import PricingEngine
+from modules.budget_allocator import BudgetAllocator, channel_inputs, greedy_allocate
+from modules.market_scoring import MarketScoringEngine
+from modules.needs_mining import mine_needs_batch
+from modules.telemetry_loader import TelemetryReader, TelemetryWriter
+from modules.competitor_intel import CompetitorIntelStore
+from modules.llm_orchestrator import LLMOrchestrator
+from modules.content_cache import ContentCache
+from modules.kit_export import export_kits
+from modules.job_queue import JobQueue
+from modules.service import CampaignService
+from modules.mock_provider import HTTPProvider, SimulatedProvider, serve_http
+from modules import tracing
+from modules.transport import AsyncConnectionPool, ConnectionPool
+
+@pytest.fixture(autouse=True)
+def isolated_data_dir(tmp_path, monkeypatch):
+    """默认数据文件(知识库等)写入临时目录，测试之间互不影响"""
+    monkeypatch.setenv("MARKETING_DATA_DIR", str(tmp_path / "data"))
 
-def test_full_workflow():
+def test_full_workflow(tmp_path):
     print("=== 工业营销自动化系统集成测试开始 ===")
     
     # 模拟输入数据
@@ -38,7 +67,7 @@ def test_full_workflow():
     
     # 第一步：战略洞察
     print("\n1. 执行战略洞察...")
-    insight = StrategyInsight()
+    insight = StrategyInsight(competitor_store=CompetitorIntelStore(str(tmp_path / "competitor_intel.db")))
     insight.process_client_needs(client_data)
     insight.analyze_competition(competitor_data)
     insight.evaluate_market_opportunities(market_data)
@@ -73,7 +102,7 @@ def test_full_workflow():
     
     # 第五步：复盘分析
     print("\n5. 复盘分析结果...")
-    analysis = Analysis()
+    analysis = Analysis(knowledge_store=KnowledgeStore(str(tmp_path / "knowledge_base.db")))
     sales_data = {
         "potential_clients": potential_clients,
         "channel_feedbacks": execution.channel_feedbacks["feedbacks"],
@@ -88,5 +117,955 @@ def test_full_workflow():
     
     print("\n=== 工业营销自动化系统集成测试完成 ===")
 
+def test_rolling_metrics_incremental():
+    metrics = RollingMetrics()
+    clients = [{"name": "A公司", "channel": "行业展会", "type": "国企"}]
+    feedbacks = [{"channel": "行业展会", "effectiveness": "高"}]
+    stage_progress = [{"client": "A公司", "current_stage": "初步接触"}]
+    sales_data = {
+        "potential_clients": clients,
+        "channel_feedbacks": feedbacks,
+        "sales_progress": {"stage_progress": stage_progress}
+    }
+    metrics.ingest(sales_data)
+    assert metrics.channel_performance() == {"行业展会": {"leads": 1, "conversions": 0}}
+    
+    # 追加事件只处理新增部分，同一客户的阶段推进覆盖旧阶段
+    clients.append({"name": "B公司", "channel": "垂直平台", "type": "民企"})
+    feedbacks.append({"channel": "垂直平台", "effectiveness": "低"})
+    stage_progress.append({"client": "A公司", "current_stage": "方案确认"})
+    metrics.ingest(sales_data)
+    assert metrics.total_clients == 2
+    assert metrics.converted_clients == 1
+    assert metrics.channel_performance()["行业展会"] == {"leads": 1, "conversions": 1}
+    assert dict(metrics.stage_counts) == {"方案确认": 1}
+    assert metrics.low_effectiveness_channels() == ["垂直平台"]
+    assert metrics.window_rates("client_type")["国企"]["weekly"] == 1.0
+    
+    # 新的数据快照触发重建而不是重复累加
+    metrics.ingest(dict(sales_data, potential_clients=list(clients)))
+    assert metrics.total_clients == 2
+
+def test_channel_significance():
+    results = {s["segment"]: s for s in compare_stats({
+        "小样本渠道": {"leads": 1, "conversions": 1},
+        "低效渠道": {"leads": 200, "conversions": 20},
+        "高效渠道": {"leads": 300, "conversions": 90}
+    })}
+    # 1条线索1次转化不足以"胜出"
+    assert not results["小样本渠道"]["significant"]
+    assert results["高效渠道"]["direction"] == "高"
+    assert results["低效渠道"]["direction"] == "低"
+    assert results["高效渠道"]["wilson_low"] < 0.3 < results["高效渠道"]["wilson_high"]
+
+    # 数千个转化率相同的分组：未校正时约5%会"显著"，BH校正后不应有任何分组被判为显著
+    import numpy as np
+    rng = np.random.default_rng(7)
+    null_results = compare_stats({f"渠道{i}": {"leads": 200, "conversions": int(c)}
+                                  for i, c in enumerate(rng.binomial(200, 0.1, 3000))})
+    assert sum(s["p_value"] < 0.05 for s in null_results) > 50
+    assert not any(s["significant"] for s in null_results)
+
+def test_failure_digest_is_bounded():
+    sizes = []
+    for n in (50, 5000):
+        metrics = RollingMetrics()
+        for i in range(n):
+            channel = f"渠道{i % 200}"
+            metrics.record_client({"name": f"客户{i}", "channel": channel, "type": "民企"})
+            metrics.record_feedback({"channel": channel, "effectiveness": "低" if i % 5 == 0 else "中"})
+            metrics.record_stage({"client": f"客户{i}", "current_stage": "初步接触" if i % 4 else "方案确认"})
+        digest = build_failure_digest(metrics, top_k=5, max_flags=5)
+        assert len(digest["top_channels"]) <= 5
+        assert len(digest["anomalies"]) <= 5
+        sizes.append(len(json.dumps(digest, ensure_ascii=False)))
+    # 数据量增长100倍，摘要规模基本不变
+    assert sizes[1] < sizes[0] * 1.5
+
+def test_knowledge_store_dedup_and_search(tmp_path):
+    store = KnowledgeStore(str(tmp_path / "kb.db"))
+    entry = {"title": "低效渠道: 垂直平台应对方案", "content": "针对低效渠道的标准处理流程", "tags": ["渠道优化"]}
+    assert store.add_entries("template", [entry]) == {"added": 1, "deduplicated": 0}
+    assert store.add_entries("template", [dict(entry, tags=["内容策略"])]) == {"added": 0, "deduplicated": 1}
+    store.add_entry("experience", "成功案例", "国企客户技术合规方案成交", tags=["精准定位"])
+    
+    hits = store.search("垂直平台 渠道", top_k=1)
+    assert hits[0]["title"] == entry["title"]
+    assert hits[0]["occurrences"] == 2
+    assert set(hits[0]["tags"]) == {"渠道优化", "内容策略"}
+    assert [e["title"] for e in store.find_by_tag("精准定位")] == ["成功案例"]
+    store.close()
+    
+    # 重新打开后数据仍在
+    assert KnowledgeStore(str(tmp_path / "kb.db")).count() == 2
+
+def test_knowledge_store_shared_across_stages(tmp_path):
+    import copy
+    from modules.industrial_marketing_system import IndustrialMarketingSystem, SAMPLE_CAMPAIGN
+
+    # 默认知识库落在本地数据目录，新进程可读回
+    system = IndustrialMarketingSystem()
+    assert system.knowledge_store.db_path == str(tmp_path / "data" / "knowledge_base.db")
+    system.knowledge_store.add_entry("experience", "国企 技术合规导向 经验", "制造业国企客户重视合规认证，优先展示白皮书", ["国企"])
+    assert KnowledgeStore().count() == 1
+
+    campaign = copy.deepcopy(SAMPLE_CAMPAIGN)
+    campaign["market_data"]["customer_segments"][0].update(market_size=5000, growth_rate=0.3)
+    results = system.run_campaign(campaign)
+    # 战略洞察与计划阶段都检索同一个知识库，复盘写入的也是这个库
+    assert system.modules["strategy_insight"].knowledge_store is system.knowledge_store
+    assert system.modules["analysis"].knowledge_store is system.knowledge_store
+    assert any(doc["source"] == "knowledge" for doc in system.modules["strategy_insight"].retrieval_index.docs)
+    strategies = results["planning"]["client_strategies"]["strategies"]
+    assert strategies and strategies[0]["lessons"] == ["国企 技术合规导向 经验"]
+    assert system.knowledge_store.count() > 1
+
+def test_retrieval_index_incremental_and_reopen(tmp_path):
+    path = str(tmp_path / "rag")
+    index = HybridRetrievalIndex(path, dim=128, capacity_step=2)
+    index.add_many([
+        {"text": "A公司 智能维护系统 降低维护成本30%", "source": "competitor_case"},
+        {"text": "华东制造业 数字化转型需求旺盛", "source": "industry_trend"}
+    ])
+    index.add("国企客户 技术合规方案 成交经验", source="knowledge")
+    
+    hits = index.search("设备维护成本高", top_k=1)
+    assert hits[0]["source"] == "competitor_case"
+    assert index.search("维护成本", sources=["industry_trend"]) == []
+    
+    # 重新打开内存映射文件后无需重建向量
+    reopened = HybridRetrievalIndex(path, dim=128, capacity_step=2)
+    assert len(reopened) == 3
+    assert reopened.search("技术合规", top_k=1)[0]["source"] == "knowledge"
+    
+    # 维度不一致时拒绝打开，而不是按错误形状读取向量
+    try:
+        HybridRetrievalIndex(path, dim=256, capacity_step=2)
+        assert False, "维度不一致应报错"
+    except ValueError:
+        pass
+
+def test_strategy_rule_engine():
+    engine = StrategyRuleEngine()
+    rules = engine.match_many(["制造业国企", "长三角民营制造", "汽车外资企业", "个体工商户"])
+    assert [r and r["segment"] for r in rules] == ["国企", "民企", "外企", None]
+    # 同时命中多个关键词时按规则顺序取优先级最高者
+    assert engine.match("民企参股国企")["segment"] == "国企"
+    
+    # 新增细分客户只需追加规则数据
+    engine.add_rule({
+        "segment": "专精特新",
+        "keywords": ["专精特新", "小巨人"],
+        "strategy": {"approach": "技术创新导向", "focus": "联合研发"},
+        "value_proposition": {"value": "定制化技术方案", "differentiator": "研发协同"},
+        "channels": ["产业园区对接会"],
+        "content_formats": ["技术白皮书"],
+        "scripts": [{"type": "联合研发", "script": "我们可以与贵司工程团队共建..."}]
+    })
+    planning = Planning(rule_engine=engine)
+    planning.match_client_strategies({"target_clients": ["省级小巨人企业"]})
+    assert planning.develop_channel_strategies()["channel_mix"][0]["channels"] == ["产业园区对接会"]
+
+def test_pricing_engine_matches_analytic_optimum():
+    bundle = {"name": "标准方案", "cost_multiplier": 1.0, "value_multiplier": 1.0, "demand_share": 1.0,
+              "features": [], "target": ""}
+    engine = PricingEngine(bundles=[bundle], discount_tiers=[(0, 0.0)], price_points=4001, price_range=(0.5, 3.0))
+    quote = engine.optimize([{"segment": "测试", "reference_price": 100.0, "base_demand": 50,
+                              "elasticity": 2.0, "unit_cost": 60.0, "min_margin": 0.0}])[0]
+    # 常弹性需求下最优价格 p* = c·e/(e-1) = 120
+    assert abs(engine.optimize_arrays([100.0], [50], [2.0], [60.0], [0.0])["net_price"][0, 0] - 120) < 0.5
+    assert quote["feasible"] and quote["expected_margin"] > 0
+    
+    # 成本底线高于所有价格点时不给出报价
+    infeasible = engine.optimize([{"segment": "亏损", "reference_price": 100.0, "base_demand": 50,
+                                   "elasticity": 2.0, "unit_cost": 400.0, "min_margin": 0.1}])[0]
+    assert not infeasible["feasible"]
+
+def test_budget_allocator_matches_greedy():
+    channels = channel_inputs(["行业展会", "垂直平台", "私域社群", "国际展会"],
+                              {"行业展会": {"leads": 40, "conversions": 10}})
+    allocation = BudgetAllocator().allocate(channels, 200000)
+    assert abs(sum(item["budget"] for item in allocation) - 200000) < 1
+    
+    greedy = greedy_allocate(channels, 200000, step=100)
+    for item in allocation:
+        assert abs(item["budget"] - greedy[item["channel"]]) <= 200
+    
+    planning = Planning()
+    planning.match_client_strategies({"target_clients": ["制造业国企", "民营企业"]})
+    strategies = planning.develop_channel_strategies(total_budget=300000)
+    assert all("budget_allocation" in mix for mix in strategies["channel_mix"])
+    assert abs(sum(item["budget"] for item in strategies["budget_allocation"]) - 300000) < 1
+
+def test_market_scoring_engine():
+    market_data = {
+        "customer_segments": [
+            {"name": "制造业国企", "market_size": 5000, "growth_rate": 0.15},
+            {"name": "化工民企", "market_size": 800, "growth_rate": 0.2},
+            {"name": "能源外企", "market_size": 3000, "growth_rate": 0.05}
+        ],
+        "regional_data": [
+            {"name": "华东", "demand_level": 8, "competition_index": 3},
+            {"name": "西南", "demand_level": 6, "competition_index": 1},
+            {"name": "华北", "demand_level": 5, "competition_index": 5}
+        ],
+        "industry_trends": [
+            {"industry": "汽车", "growth_potential": 6, "profitability": 5, "key_trend": "电动化"},
+            {"industry": "半导体", "growth_potential": 9, "profitability": 8, "key_trend": "国产替代"}
+        ]
+    }
+    scores = MarketScoringEngine(top_k=2).score(market_data)
+    assert scores["target_segments"] == ["制造业国企"]
+    assert scores["top_regions"] == ["西南", "华东"]
+    assert [r["industry"] for r in scores["industry_ratings"]] == ["半导体", "汽车"]
+    assert scores["heat_map"]["matrix"].shape == (3, 2)
+    assert scores["top_cells"][0] == {"region": "西南", "industry": "半导体", "score": 1.0}
+    
+    # 权重可配置
+    reweighted = MarketScoringEngine(weights={"growth_potential": 0.0, "profitability": 1.0}).score(market_data)
+    assert reweighted["industry_ratings"][0]["rating"] == 8.0
+
+def test_client_needs_batch():
+    result = mine_needs_batch({
+        "client_id": ["A", "B", "C", "D"],
+        "industry": ["化工", "化工", "汽车", "汽车"],
+        "downtime": [12, 3, None, 20],
+        "energy_consumption": [1500, 900, 800, 800],
+        "explicit_need_count": [0, 2, 4, 0],
+        "critical_issue": [False, False, False, True]
+    })
+    assert result["industry_baselines"] == {"化工": 1200.0, "汽车": 800.0}
+    assert result["implicit_needs"] == [["提高设备可靠性", "节能优化方案"], [], [], ["提高设备可靠性"]]
+    assert result["urgency_rating"].tolist() == [0, 5, 8, 8]
+    
+    # 单客户接口与批量判定一致，缺失数据不再报错
+    insight = StrategyInsight()
+    needs = insight.process_client_needs({
+        "industry": "化工",
+        "industry_average": 1000,
+        "operational_data": {"downtime": None, "energy_consumption": 1200}
+    })
+    assert needs["implicit_needs"] == ["节能优化方案"]
+
+def test_telemetry_rolling_features(tmp_path):
+    day = 86400
+    sites = [{"id": "P1", "industry": "化工"}, {"id": "P2", "industry": "化工"}]
+    with TelemetryWriter(str(tmp_path), sites) as writer:
+        writer.append([0, 1, 0], [0, 0, 5 * day], [2.0, 1.0, 3.0], [100.0, 50.0, 100.0])
+    # 追加写入后分块读取
+    with TelemetryWriter(str(tmp_path)) as writer:
+        writer.append([0, 1], [9 * day, 9 * day], [20.0, 0.0], [300.0, 40.0])
+    
+    features = TelemetryReader(str(tmp_path), chunk_rows=2).summarize(window_days=5)
+    assert features["records"].tolist() == [3, 2]
+    assert features["downtime"].tolist() == [23.0, 0.0]
+    assert features["peak_window_downtime"].tolist() == [23.0, 1.0]
+    assert features["downtime_change"].tolist() == [21.0, -1.0]
+    
+    result = StrategyInsight().process_telemetry(str(tmp_path), window_days=5)
+    assert result["implicit_needs"] == [["提高设备可靠性", "节能优化方案"], []]
+
+def test_competitor_intel_dedup(tmp_path):
+    store = CompetitorIntelStore(str(tmp_path / "intel.db"))
+    stats = store.upsert_cases([
+        {"client": "A公司", "solution": "智能维护系统", "value_prop": "降低维护成本30%"},
+        {"client": "A公司", "solution": "智能维护系统", "value_prop": "帮助降低维护成本30%"},
+        {"client": "B公司", "solution": "智能维护系统", "value_prop": "降低维护成本30%"}
+    ])
+    assert stats == {"added": 2, "merged": 1, "unchanged": 0}
+    assert store.upsert_cases([{"client": "A公司", "solution": "智能维护系统", "value_prop": "降低维护成本30%"}])["unchanged"] == 1
+    assert store.top_solutions()[0] == {"solution": "智能维护系统", "wins": 3, "clients": 2}
+    # 仅数值不同的案例是不同的宣传口径，不合并
+    assert store.upsert_cases([{"client": "A公司", "solution": "智能维护系统", "value_prop": "降低维护成本50%"}]) \
+        == {"added": 1, "merged": 0, "unchanged": 0}
+    assert sorted(case["value_proposition"] for case in store.case_studies(client="A公司")) \
+        == ["降低维护成本30%", "降低维护成本50%"]
+    
+    store.upsert_activities([{"channel": "行业展会", "content_type": "技术演示", "success_rate": 0.2}])
+    store.upsert_activities([{"channel": "行业展会", "content_type": "技术演示", "success_rate": 0.4},
+                             {"channel": "线上研讨会", "content_type": "直播", "success_rate": 0.1}])
+    assert store.count("activities") == 2
+    assert store.channel_success_rates()["行业展会"]["avg_success_rate"] == 0.4
+    
+    # 报告默认只覆盖本次输入，历史情报需显式纳入
+    competitor_data = {"win_cases": [{"client": "C公司", "solution": "能源管理平台"}]}
+    report = StrategyInsight(competitor_store=store).analyze_competition(competitor_data)
+    assert report["ingested"]["cases"]["added"] == 1
+    assert [case["client"] for case in report["case_studies"]] == ["C公司"]
+    assert report["channel_success_rates"] == {}
+    report = StrategyInsight(competitor_store=store).analyze_competition(competitor_data, include_history=True)
+    assert report["ingested"]["cases"]["unchanged"] == 1
+    assert report["case_studies"][0]["client"] == "A公司"
+    assert "加强行业展会渠道布局(竞品成功率40%)" in report["countermeasures"]
+    
+    # 生成简报时沿用已有报告，不再重复写入情报库
+    class CountingStore(CompetitorIntelStore):
+        upserts = 0
+        
+        def upsert_cases(self, *args, **kwargs):
+            CountingStore.upserts += 1
+            return super().upsert_cases(*args, **kwargs)
+    
+    insight = StrategyInsight(competitor_store=CountingStore(str(tmp_path / "counting.db")))
+    insight.process_client_needs({"pain_points": ["设备维护成本高"]})
+    report = insight.analyze_competition({"win_cases": [{"client": "D公司", "solution": "预测性维护"}],
+                                          "marketing_activities": [{"channel": "行业展会", "content_type": "技术演示",
+                                                                    "success_rate": 0.5}]})
+    insight.evaluate_market_opportunities({"customer_segments": [], "regional_data": []})
+    brief = insight.generate_strategy_brief()
+    assert CountingStore.upserts == 1
+    assert brief["risks_and_opportunities"][0] == f"竞争应对：{', '.join(report['countermeasures'])}"
+
+def test_content_generation_fan_out():
+    import threading
+    
+    # 5个请求全部同时在途才能通过栅栏，串行执行时栅栏超时，不依赖耗时阈值
+    barrier = threading.Barrier(5, timeout=10)
+    lock = threading.Lock()
+    in_flight = [0, 0]
+    
+    class SlowOrchestrator(LLMOrchestrator):
+        def _call_provider_api(self, provider, model, prompt, **kwargs):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            try:
+                barrier.wait()
+            finally:
+                with lock:
+                    in_flight[0] -= 1
+            if "外企" in prompt:
+                raise RuntimeError("超时")
+            return {"response": "# 方案\n## 要点\n- 内容", "tokens_used": 10, "success": True}
+    
+    plan = {"client_strategies": {"strategies": [
+        {"type": segment, "value_proposition": f"{segment}价值"} for segment in ["国企", "民企", "外企", "合资", "私企"]
+    ]}}
+    content = ContentCreation(orchestrator=SlowOrchestrator(), max_workers=5)
+    materials = content.generate_technical_materials(plan)["materials"]
+    
+    assert in_flight[1] == 5 and not barrier.broken
+    assert [m["title"] for m in materials] == [f"{s}技术方案" for s in ["国企", "民企", "外企", "合资", "私企"]]
+    assert [m["optimized"] for m in materials] == [True, True, False, True, True]
+
+def test_markdown_validation_accepts_template_example():
+    import re
+    from modules.prompt_manager import PromptEngineeringManager
+    
+    prompt_manager = PromptEngineeringManager()
+    template = prompt_manager.get_template("content_creation")["template"]
+    example = re.search(r"```markdown\n(.*?)```", template, re.S).group(1)
+    # 模板要求的输出格式本身必须通过校验，否则生成的技术资料全部降级为模板内容
+    assert prompt_manager.validate_response_format(example, "markdown")
+    assert prompt_manager.validate_response_format(example.replace("\n", "\r\n"), "markdown")
+    assert prompt_manager.validate_response_format("# 标题\n\n## 成功案例\n1. 案例1", "markdown")
+    assert not prompt_manager.validate_response_format("标准技术方案内容", "markdown")
+    
+    plan = {"client_strategies": {"strategies": [{"type": "国企", "value_proposition": "国企价值"}]}}
+    content = ContentCreation(orchestrator=LLMOrchestrator(provider=SimulatedProvider(time_scale=0)))
+    assert content.generate_technical_materials(plan)["materials"][0]["optimized"]
+
+def test_sales_script_cache():
+    class ScriptOrchestrator(LLMOrchestrator):
+        def _call_provider_api(self, provider, model, prompt, **kwargs):
+            return {"response": json.dumps({"variants": ["话术A", "话术B"]}), "tokens_used": 50, "success": True}
+    
+    cache = ContentCache()
+    plan = {
+        "client_strategies": {
+            "strategies": [{"type": "国企"}, {"type": "国企"}],
+            "value_propositions": [{"type": "国企", "value": "符合国家标准的解决方案"}]
+        },
+        "pricing_plans": {"plans": [{"name": "高级方案"}]}
+    }
+    orchestrator = ScriptOrchestrator()
+    for _ in range(3):
+        content = ContentCreation(orchestrator=orchestrator, content_cache=cache)
+        content.marketing_plan = plan
+        scripts = content.generate_sales_scripts()
+    
+    # 重复客户类型不产生重复场景，相同场景跨活动只生成一次
+    assert [s["type"] for s in scripts["scenarios"]] == ["技术沟通", "价格谈判", "增值服务"]
+    assert all(s["cached"] and s["variants"] == ["话术A", "话术B"] for s in scripts["scenarios"])
+    assert orchestrator.stats["total_requests"] == 3
+    report = cache.report()
+    assert (report["generated"], report["hits"], report["tokens_used"], report["tokens_saved"]) == (3, 6, 150, 300)
+    
+    # 并发活动同时未命中相同场景：只有第一个调用方请求大模型，其余等待其结果
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    
+    release = threading.Event()
+    calls = []
+    
+    class BlockingOrchestrator(ScriptOrchestrator):
+        def _call_provider_api(self, provider, model, prompt, **kwargs):
+            calls.append(prompt)
+            assert release.wait(10)
+            return super()._call_provider_api(provider, model, prompt, **kwargs)
+    
+    cache = ContentCache()
+    orchestrator = BlockingOrchestrator()
+    
+    def generate():
+        content = ContentCreation(orchestrator=orchestrator, content_cache=cache)
+        content.marketing_plan = plan
+        return content.generate_sales_scripts()
+    
+    def wait_until(condition, timeout=10):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return condition()
+    
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        first = pool.submit(generate)
+        assert wait_until(lambda: len(calls) == 3)
+        followers = [pool.submit(generate) for _ in range(3)]
+        coalesced = wait_until(lambda: cache.report()["coalesced"] == 9)
+        release.set()
+        assert coalesced
+        results = [first.result()] + [future.result() for future in followers]
+    assert len(calls) == 3 and cache.report()["generated"] == 3
+    assert all(s["variants"] == ["话术A", "话术B"] for result in results for s in result["scenarios"])
+    assert [s["cached"] for s in results[1]["scenarios"]] == [True] * 3
+
+def test_kit_export_formats(tmp_path):
+    import os
+    import re
+    import zipfile
+    
+    kit = {
+        "technical_materials": {"materials": [
+            {"type": "国企定制内容", "title": "国企技术方案", "content": "# 方案\n## 优势\n- 合规" * 200, "optimized": True}
+        ]},
+        "sales_scripts": {"scenarios": [{"client_type": "国企", "type": "技术沟通", "variants": ["符合<GB/T>标准 & 认证"]}]}
+    }
+    paths = export_kits([dict(kit, name="a"), dict(kit, name="b")], str(tmp_path), max_workers=2)
+    assert [p["html"].endswith(f"{name}.html") for p, name in zip(paths, "ab")] == [True, True]
+    
+    page = open(paths[0]["html"], encoding="utf-8").read()
+    assert 'class="step"' in page and "符合&lt;GB/T&gt;标准 &amp; 认证" in page
+    
+    with zipfile.ZipFile(paths[0]["xlsx"]) as archive:
+        assert "符合&lt;GB/T&gt;标准 &amp; 认证" in archive.read("xl/worksheets/sheet2.xml").decode("utf-8")
+    
+    # 交叉引用表中的偏移须指向对应对象
+    data = open(paths[0]["pdf"], "rb").read()
+    xref = int(re.search(rb"startxref\n(\d+)", data).group(1))
+    offsets = re.findall(rb"(\d{10}) 00000 n", data[xref:])
+    assert all(data[int(offset):].startswith(f"{i} 0 obj".encode()) for i, offset in enumerate(offsets, start=1))
+    assert int(re.search(rb"/Count (\d+)", data).group(1)) > 1
+    
+    # 名称清理为导出目录内的文件名，同名追加序号而不是互相覆盖
+    out = tmp_path / "out"
+    names = ["../逃逸", "a/b", "a", "A", "..", "", "a"]
+    paths = export_kits([dict(kit, name=name) for name in names], str(out), formats=["html"], max_workers=2)
+    files = [os.path.basename(p["html"]) for p in paths]
+    assert files == ["_逃逸.html", "a_b.html", "a.html", "A_00003.html", "kit_00004.html", "kit_00005.html",
+                     "a_00006.html"]
+    assert all(os.path.dirname(p["html"]) == str(out) for p in paths)
+    assert sorted(os.listdir(out)) == sorted(files) and not (tmp_path / "逃逸.html").exists()
+
+def test_campaign_service_jobs_and_events(tmp_path):
+    import asyncio
+    
+    def runner(payload, progress):
+        for stage in ("strategy_insight", "planning"):
+            progress(stage, "started")
+            progress(stage, "completed")
+        if payload.get("fail"):
+            raise RuntimeError("模拟失败")
+        return {"echo": payload["name"]}
+    
+    async def request(port, method, path, body=b""):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        response = await reader.read()
+        writer.close()
+        head, _, payload = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), payload.decode("utf-8")
+    
+    async def scenario():
+        service = CampaignService(JobQueue(str(tmp_path / "jobs.db")), workers=2, runner=runner, port=0)
+        await service.start()
+        try:
+            status, body = await request(service.port, "POST", "/jobs", json.dumps({"name": "华东活动"}).encode())
+            assert status == 202
+            job_id = json.loads(body)["job_id"]
+            _, stream = await request(service.port, "GET", f"/jobs/{job_id}/events")
+            events = [line[7:] for line in stream.splitlines() if line.startswith("event: ")]
+            assert events == ["queued", "started"] + ["stage"] * 4 + ["succeeded"]
+            status, body = await request(service.port, "GET", f"/jobs/{job_id}")
+            assert json.loads(body)["result"] == {"echo": "华东活动"}
+            
+            _, body = await request(service.port, "POST", "/jobs", json.dumps({"name": "x", "fail": True}).encode())
+            _, stream = await request(service.port, "GET", f"/jobs/{json.loads(body)['job_id']}/events")
+            assert "event: failed" in stream
+            assert (await request(service.port, "POST", "/jobs", b"{bad"))[0] == 400
+            assert (await request(service.port, "GET", "/jobs/missing"))[0] == 404
+        finally:
+            await service.close()
+    
+    asyncio.run(scenario())
+    
+    # 进程中断后运行中的任务重新排队，中断执行的阶段事件不再推送
+    queue = JobQueue(str(tmp_path / "jobs.db"), max_attempts=2)
+    job_id = queue.submit({"name": "中断"})
+    queue.add_event(job_id, {"event": "queued"})
+    assert queue.claim()[0] == job_id
+    queue.add_event(job_id, {"event": "started"})
+    assert queue.recover() == 1 and queue.get(job_id)["status"] == "queued"
+    assert [(e["event"], e["attempt"]) for e in queue.events(job_id)] == [("queued", 0), ("requeued", 1)]
+    
+    # 达到最大执行次数后标记为失败，不再无限重试
+    assert queue.claim()[0] == job_id
+    queue.add_event(job_id, {"event": "started"})
+    assert queue.recover() == 0 and queue.claim() is None
+    assert queue.get(job_id)["status"] == "failed" and queue.get(job_id)["attempts"] == 2
+    assert [e["event"] for e in queue.events(job_id)] == ["queued", "requeued", "failed"]
+    assert [e["seq"] for e in queue.events(job_id)] == [1, 3, 5]
+
+def test_simulated_provider():
+    prompt = "请为国企客户生成3条风格不同的话术变体"
+    first = SimulatedProvider(seed=7, time_scale=0).complete(prompt, task_type="sales_script")
+    second = SimulatedProvider(seed=7, time_scale=0).complete(prompt, task_type="sales_script")
+    assert first == second
+    assert len(json.loads(first["response"])["variants"]) == 3
+    causes = json.loads(SimulatedProvider(time_scale=0).complete("x", task_type="failure_analysis")["response"])
+    assert all(set(c) == {"cause", "evidence", "improvement"} for c in causes["root_causes"])
+    
+    # 限流按提供商给出的等待时间重试，重试耗尽后按失败处理
+    flaky = SimulatedProvider(rate_limit_rate=0.5, time_scale=0)
+    orchestrator = LLMOrchestrator(provider=flaky, max_retries=3)
+    results = orchestrator.dispatch_batch("content_creation", [f"提示词{i}" for i in range(20)])
+    assert flaky.stats["rate_limited"] > 0 and orchestrator.stats["retries"] > 0
+    assert sum(isinstance(r, dict) for r in results) == orchestrator.stats["successful_requests"] > 10
+    
+    server = serve_http(SimulatedProvider(rate_limit_rate=1.0, time_scale=0), port=0)
+    try:
+        limited = LLMOrchestrator(provider=HTTPProvider(f"http://127.0.0.1:{server.server_port}/v1"), max_retries=1)
+        try:
+            limited.dispatch_request("content_creation", "提示词")
+            assert False, "限流未抛出异常"
+        except Exception as e:
+            assert "请求过于频繁" in str(e)
+        assert limited.stats["retries"] == 1
+    finally:
+        server.shutdown()
+
+def test_tracing_spans():
+    orchestrator = LLMOrchestrator(provider=SimulatedProvider(time_scale=0))
+    orchestrator.dispatch_batch("content_creation", ["未追踪"])
+    
+    tracer = tracing.start_tracing(profile_categories=("stage",))
+    try:
+        with tracing.span("workflow", "workflow"):
+            with tracing.span("content_creation", "stage"):
+                orchestrator.dispatch_batch("content_creation", ["提示词A", "提示词B"])
+            Execution().resolve_clients([{"name": "XX制造企业", "contact": "张经理"},
+                                         {"name": "ＸＸ制造企业有限公司", "contact": "张经理"}])
+    finally:
+        tracing.stop_tracing()
+    
+    # 处理条数记录在区间参数中，而不是逐次打印
+    resolve = next(span for span in tracer.spans if span.name == "Execution.resolve_clients")
+    assert resolve.args == {"clients": 2, "entities": 1}
+    tracing.annotate(clients=0)
+    
+    # 线程池中的大模型调用挂在阶段区间之下
+    paths = {";".join(span.path) for span in tracer.spans}
+    assert "workflow;content_creation;llm.dispatch;llm.call" in paths
+    assert sum(span.name == "llm.call" for span in tracer.spans) == 2
+    
+    events = tracer.to_chrome_trace()["traceEvents"]
+    assert events[0]["name"] == "workflow" and all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    assert next(e for e in events if e["cat"] == "stage")["args"]["profile"]
+    assert all(line.startswith("workflow") for line in tracer.collapsed_stacks())
+    assert tracing.span("关闭后", "stage").__enter__() is None
+
+def test_shared_services():
+    import os
+    import subprocess
+    import sys
+    
+    import modules
+    from modules.services import get_services, reset_services
+    
+    # 导入包本身不加载任何子模块
+    loaded = subprocess.run([sys.executable, "-c", "import sys, modules; print(len([m for m in sys.modules if m.startswith('modules.')]))"],
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    assert loaded.strip() == "0"
+    assert modules.StrategyInsight is StrategyInsight
+    
+    reset_services()
+    services = get_services()
+    insight, analysis, content = StrategyInsight(), Analysis(), ContentCreation()
+    assert insight.orchestrator is analysis.orchestrator is content.orchestrator is services.orchestrator
+    assert insight.prompt_manager is services.prompt_manager
+    reset_services()
+    assert get_services().orchestrator is not services.orchestrator
+
+def test_transport_connection_reuse():
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    
+    server = serve_http(SimulatedProvider(time_scale=0), port=0)
+    url = f"http://127.0.0.1:{server.server_port}/v1/chat/completions"
+    body = json.dumps({"task_type": "sales_script", "messages": [{"content": "生成2条"}]}).encode("utf-8")
+    try:
+        pool = ConnectionPool(max_connections_per_endpoint=2)
+        for _ in range(10):
+            status, headers, payload = pool.request("POST", url, body=body)
+        assert status == 200 and headers["content-type"].startswith("application/json")
+        assert len(json.loads(json.loads(payload)["choices"][0]["message"]["content"])["variants"]) == 2
+        assert (pool.stats["connections_created"], pool.stats["connections_reused"]) == (1, 9)
+        
+        # 并发请求数超过连接上限时排队，不新建连接
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            statuses = list(executor.map(lambda _: pool.request("POST", url, body=body)[0], range(30)))
+        assert statuses == [200] * 30 and pool.stats["connections_created"] <= 2
+        pool.close()
+        
+        async def run_async():
+            async_pool = AsyncConnectionPool(max_connections_per_endpoint=3)
+            results = await asyncio.gather(*(async_pool.request("POST", url, body=body) for _ in range(30)))
+            await async_pool.close()
+            return [r[0] for r in results], async_pool.stats
+        
+        statuses, stats = asyncio.run(run_async())
+        assert statuses == [200] * 30 and stats["connections_created"] <= 3 and stats["pool_waits"] > 0
+    finally:
+        server.shutdown()
+
+def test_transport_retries_only_idempotent_requests():
+    import asyncio
+    import socketserver
+    import threading
+    
+    received = []
+    
+    class DropSecondRequest(socketserver.StreamRequestHandler):
+        """每个连接正常响应第一个请求；第二个请求读完后不响应直接断开(服务端可能已执行)"""
+        def handle(self):
+            for index in range(2):
+                request_line = self.rfile.readline()
+                if not request_line:
+                    return
+                length = 0
+                while True:
+                    line = self.rfile.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                self.rfile.read(length)
+                received.append(request_line.split()[0].decode())
+                if index == 0:
+                    self.wfile.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+    
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), DropSecondRequest)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    try:
+        # GET是幂等的，复用连接断开后换新连接重发
+        pool = ConnectionPool()
+        assert pool.request("GET", url)[0] == 200 and pool.request("GET", url)[0] == 200
+        assert received == ["GET"] * 3
+    
+        # POST发出后连接断开不重发，避免提供商重复执行与计费
+        received.clear()
+        pool = ConnectionPool()
+        assert pool.request("POST", url, body=b"{}")[0] == 200
+        try:
+            pool.request("POST", url, body=b"{}")
+            assert False, "POST不应重发"
+        except ConnectionError:
+            pass
+        assert received == ["POST"] * 2
+    
+        async def run_async():
+            async_pool = AsyncConnectionPool()
+            assert (await async_pool.request("POST", url, body=b"{}"))[0] == 200
+            try:
+                await async_pool.request("POST", url, body=b"{}")
+                assert False, "POST不应重发"
+            except ConnectionError:
+                pass
+            await async_pool.close()
+    
+        received.clear()
+        asyncio.run(run_async())
+        assert received == ["POST"] * 2
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_http_provider_retries_after_idle_close():
+    import socketserver
+    import threading
+    
+    received = []
+    
+    class CloseIdleConnection(socketserver.StreamRequestHandler):
+        """每个连接只响应一个请求；之后关闭空闲连接，或在读到下一个请求时关闭(空闲超时与复用交错)"""
+        wait_for_next = False
+        
+        def handle(self):
+            for index in range(2 if self.wait_for_next else 1):
+                request_line = self.rfile.readline()
+                if not request_line:
+                    return
+                length = 0
+                while True:
+                    line = self.rfile.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                prompt = json.loads(self.rfile.read(length))["messages"][0]["content"]
+                received.append(prompt)
+                if index == 0:
+                    payload = json.dumps({"choices": [{"message": {"content": f"回复:{prompt}"}}],
+                                          "usage": {"total_tokens": 3}}).encode("utf-8")
+                    self.wfile.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(payload), payload))
+    
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), CloseIdleConnection)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        for wait_for_next in (False, True):
+            CloseIdleConnection.wait_for_next = wait_for_next
+            received.clear()
+            provider = HTTPProvider(f"http://127.0.0.1:{server.server_address[1]}/v1", pool=ConnectionPool())
+            orchestrator = LLMOrchestrator(provider=provider)
+            # 复用连接被服务端关闭后，第二次POST换新连接完成，而不是落入降级内容
+            assert orchestrator.dispatch_request("sales_script", "第一条")["response"] == "回复:第一条"
+            assert orchestrator.dispatch_request("sales_script", "第二条")["response"] == "回复:第二条"
+            assert orchestrator.stats["successful_requests"] == 2
+            if wait_for_next:
+                # 请求发出后才断开的，连接池不重发POST，由调度器按可重试错误重试一次
+                assert received == ["第一条", "第二条", "第二条"] and orchestrator.stats["retries"] == 1
+            else:
+                assert received == ["第一条", "第二条"]
+            provider.pool.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_execution_records():
+    from modules.job_queue import dumps
+    from modules.records import PotentialClient, Stage, to_dicts
+    
+    execution = Execution()
+    kit = {"channel_strategies": {"channel_mix": [{"type": "国企", "channels": ["行业展会", "国际展会"]}]}}
+    clients = execution.publish_to_channels(kit)["potential_clients"]
+    execution.interact_and_follow_up(clients)
+    progress = execution.track_sales_progress(execution.interaction_records)
+    
+    client = clients[0]
+    assert isinstance(client, PotentialClient) and not hasattr(client, "__dict__")
+    assert client["type"] == client.client_type == "国企" and client["channel"] == "行业展会"
+    assert progress["stage_progress"][0]["current_stage"] is Stage.NEEDS_ANALYSIS
+    
+    # 记录与等价字典在统计和序列化上结果一致
+    sales_data = {"potential_clients": clients, "channel_feedbacks": execution.channel_feedbacks["feedbacks"],
+                  "sales_progress": progress}
+    from_records, from_dicts = RollingMetrics(), RollingMetrics()
+    from_records.ingest(sales_data)
+    from_dicts.ingest(to_dicts(sales_data))
+    assert from_records.channel_performance() == from_dicts.channel_performance()
+    assert from_records.conversion_rate == from_dicts.conversion_rate
+    assert json.loads(dumps(sales_data)) == to_dicts(sales_data)
+
+def test_followup_scheduler(tmp_path):
+    from modules.followup_scheduler import FollowUpScheduler, TokenBucket
+    from modules.llm_orchestrator import LLMOrchestrator
+    from modules.mock_provider import SimulatedProvider
+    
+    db_path = str(tmp_path / "followup.db")
+    orchestrator = LLMOrchestrator(provider=SimulatedProvider(time_scale=0))
+    scheduler = FollowUpScheduler(db_path, orchestrator=orchestrator, rate_per_sec=1000)
+    execution = Execution(scheduler=scheduler)
+    execution.marketing_kit = {}
+    execution.interact_and_follow_up([
+        {"name": "A", "contact": "甲", "interest": "技术合规方案"},
+        {"name": "B", "contact": "乙", "interest": "ROI分析"},
+        {"name": "C", "contact": "丙", "interest": "全球技术标准"},
+    ])
+    same_day = scheduler.schedule_many([
+        {"client": "D", "action": "电话回访", "deadline": "2025-10-28", "priority": "低"},
+        {"client": "E", "action": "电话回访", "deadline": "2025-10-28", "priority": "高"},
+    ])
+    assert len(scheduler) == 5
+    assert scheduler.cancel(same_day[0]) and len(scheduler) == 4
+    
+    # 截止时间先后，同一天高优先级在前
+    due = scheduler.pop_due(now=scheduler.next_due() + 86400 * 3, limit=3)
+    assert [action.client for _, action in due] == ["E", "B", "C"]
+    scheduler.close()
+    
+    # 重启后未完成的发送重新排队，堆从数据库重建
+    scheduler = FollowUpScheduler(db_path, orchestrator=orchestrator, rate_per_sec=1000)
+    assert scheduler.recovered == 3 and len(scheduler) == 4
+    summary = scheduler.run_due(now=scheduler.next_due() + 86400 * 30)
+    assert summary == {"dispatched": 4, "succeeded": 4, "retried": 0, "failed": 0}
+    assert scheduler.counts() == {"done": 4, "cancelled": 1}
+    assert "variants" in scheduler.get(same_day[1])["result"]
+    scheduler.close()
+    
+    # 工作流与服务接入调度器：执行阶段的下一步行动入队，服务的后台线程到期发送，关闭时停止
+    import asyncio
+    import copy
+    import time
+    from modules.industrial_marketing_system import IndustrialMarketingSystem, SAMPLE_CAMPAIGN
+    
+    campaign = copy.deepcopy(SAMPLE_CAMPAIGN)
+    campaign["market_data"]["customer_segments"][0].update(market_size=5000, growth_rate=0.3)
+    scheduler = FollowUpScheduler(str(tmp_path / "workflow_followup.db"), orchestrator=orchestrator, rate_per_sec=1000)
+    results = IndustrialMarketingSystem(scheduler=scheduler).run_campaign(campaign)
+    assert [client["name"] for client in results["execution"]["potential_clients"]] == ["XX制造企业"]
+    assert scheduler.counts() == {"pending": 1}
+    
+    async def serve():
+        service = CampaignService(JobQueue(str(tmp_path / "jobs.db")), workers=1, port=0, scheduler=scheduler)
+        await service.start()
+        try:
+            job_id = service.queue.submit(campaign)
+            service._wakeup.set()
+            deadline = time.monotonic() + 10
+            while scheduler.counts().get("done", 0) < 2 and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            assert service.queue.get(job_id)["status"] == "succeeded"
+        finally:
+            await service.close()
+    
+    asyncio.run(serve())
+    assert scheduler.counts() == {"done": 2} and scheduler._worker is None
+    scheduler.close()
+    
+    now, waits = [0.0], []
+    bucket = TokenBucket(rate=2, burst=1, clock=lambda: now[0], sleep=waits.append)
+    for _ in range(3):
+        bucket.acquire()
+    assert waits == [0.5, 1.0]
+
+def test_entity_resolution():
+    from modules.entity_resolution import resolve_entities
+    from modules.text_features import normalize_company_name, normalize_contact
+    
+    assert normalize_company_name("ＸＸ科技(上海)有限公司") == normalize_company_name("XX科技") == "xx科技"
+    assert normalize_contact("张经理") == normalize_contact("张工") == "张"
+    
+    clients = [
+        {"name": "XX制造企业", "contact": "张经理", "interest": "ROI分析", "channel": "行业展会", "type": "国企"},
+        {"name": "YY科技公司", "contact": "李总监", "interest": "ROI分析", "channel": "垂直平台", "type": "民企"},
+        {"name": "ＸＸ制造企业有限公司", "contact": "张工", "interest": "ROI分析", "channel": "垂直平台", "type": "国企"},
+        {"name": "苏州华启精密机械有限公司", "contact": "王经理", "interest": "ROI分析", "channel": "国际展会", "type": "民企"},
+        {"name": "苏州华启精密机槭", "contact": "王", "interest": "ROI分析", "channel": "行业展会", "type": "民企"},
+        # 仅差一字且联系人不同，视为不同企业
+        {"name": "苏州华兴精密机械", "contact": "赵总", "interest": "ROI分析", "channel": "行业展会", "type": "民企"},
+    ]
+    resolution = resolve_entities(clients)
+    assert resolution.labels.tolist() == [0, 1, 0, 2, 2, 3]
+    assert resolution.representatives.tolist() == [0, 1, 3, 5]
+    
+    # 空白或只有标点的名称各自成为单独实体，不影响其他名称的签名
+    from modules.entity_resolution import minhash_signatures
+    blank = resolve_entities([{"name": ""}, {"name": "甲乙科技"}, {"name": "()"}, {"name": "甲乙科技有限公司"},
+                              {"name": ""}])
+    assert blank.labels.tolist() == [0, 1, 2, 1, 3]
+    assert resolve_entities([{"name": "A公司"}, {"name": ""}]).labels.tolist() == [0, 1]
+    assert (minhash_signatures(["", "甲乙"])[1] == minhash_signatures(["甲乙"])[0]).all()
+    
+    # 执行阶段按企业去重，复盘按实体计客户数
+    execution = Execution()
+    execution.marketing_kit = {}
+    unique = execution.resolve_clients(clients)
+    assert [client["name"] for client in unique] == ["XX制造企业", "YY科技公司", "苏州华启精密机械有限公司", "苏州华兴精密机械"]
+    execution.interact_and_follow_up(unique)
+    assert len(execution.interaction_records["records"]) == 4
+    
+    metrics = RollingMetrics()
+    metrics.ingest({"potential_clients": clients, "client_entities": execution.client_entities,
+                    "sales_progress": {"stage_progress": [
+                        {"client": "XX制造企业", "current_stage": "方案确认"},
+                        {"client": "ＸＸ制造企业有限公司", "current_stage": "方案确认"}]}})
+    assert metrics.total_clients == 4 and metrics.converted_clients == 1
+    assert metrics.client_type_stats["国企"]["leads"] == 1
+    
+    # 两条同为空名称(或相同空白)的线索是两个实体，计数不合并
+    blank_clients = [{"name": "", "type": "民企"}, {"name": "  ", "type": "民企"}, {"name": "", "type": "民企"},
+                     {"name": "  ", "type": "民企"}, {"name": "甲乙科技", "type": "民企"}]
+    execution.resolve_clients(blank_clients)
+    assert execution.client_entities == {"甲乙科技": "甲乙科技"}
+    metrics = RollingMetrics()
+    metrics.ingest({"potential_clients": blank_clients, "client_entities": execution.client_entities})
+    assert metrics.total_clients == 5 and metrics.client_type_stats["民企"]["leads"] == 5
+
+def test_prompt_experiment():
+    import time
+    from modules.prompt_experiments import PromptExperiment, build_eval_set, regressions
+    from modules.prompt_manager import PromptEngineeringManager
+
+    class PlainTextProvider(SimulatedProvider):
+        """提示词要求纯文本时不按JSON输出"""
+        def complete(self, prompt, task_type="", model="simulated", **kwargs):
+            result = super().complete(prompt, task_type, model, **kwargs)
+            if "纯文本" in prompt:
+                result["response"] = "话术一\n话术二"
+            return result
+
+    prompt_manager = PromptEngineeringManager()
+    prompt_manager.register_version("sales_script", "1.1", "为{client_type}客户生成{variant_count}条{scenario}话术，直接输出纯文本。")
+    assert prompt_manager.versions("sales_script") == ["1.0", "1.1"]
+    assert prompt_manager.get_template("sales_script")["version"] == "1.0"
+
+    variables = prompt_manager.get_template("sales_script")["variables"]
+    assert build_eval_set("sales_script", variables, 5, seed=1) == build_eval_set("sales_script", variables, 5, seed=1)
+
+    orchestrator = LLMOrchestrator(provider=PlainTextProvider(time_scale=0))
+    experiment = PromptExperiment("sales_script", cases=12, orchestrator=orchestrator,
+                                  prompt_manager=prompt_manager, max_workers=4)
+    report = experiment.run()
+    baseline, candidate = report["results"]
+    assert baseline["calls"] == candidate["calls"] == 12
+    assert baseline["format_valid_rate"] == 1.0 and baseline["schema_completeness"] == 1.0
+    assert candidate["format_valid_rate"] == 0.0 and candidate["prompt_tokens_mean"] < baseline["prompt_tokens_mean"]
+    assert report["winner"] == "1.0"
+    assert [item["version"] for item in regressions(report)] == ["1.1"]
+
+    # 重跑命中调度器缓存，结果不变
+    requests = orchestrator.stats["total_requests"]
+    assert experiment.run()["results"] == report["results"]
+    assert orchestrator.stats["total_requests"] == requests * 2
+
+    # 评测用例无放回抽样：互不重复，数量不超过变量取值组合数(3*3*2)
+    cases = build_eval_set("failure_analysis", ["total_clients", "conversion_rate", "digest"], 50)
+    assert len(cases) == 18 and len({tuple(case.values()) for case in cases}) == 18
+
+    class UntimedProvider(SimulatedProvider):
+        """不报告延迟，实验只能按实际耗时计时"""
+        def complete(self, prompt, task_type="", model="simulated", **kwargs):
+            time.sleep(0.02)
+            result = super().complete(prompt, task_type, model, **kwargs)
+            result.pop("latency_ms", None)
+            return result
+
+    # 重跑命中缓存的调用沿用首次测得的延迟，不会因几乎零耗时拉低延迟统计
+    experiment = PromptExperiment("sales_script", cases=3, orchestrator=LLMOrchestrator(provider=UntimedProvider(time_scale=0)),
+                                  prompt_manager=prompt_manager, max_workers=2)
+    first = experiment.run()["results"][0]
+    second = experiment.run()["results"][0]
+    assert first["latency_p50_ms"] >= 15 and second["latency_p50_ms"] == first["latency_p50_ms"]
+
 if __name__ == "__main__":
-    test_full_workflow()
\ No newline at end of file
+    import os
+    import pathlib
+    import tempfile
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["MARKETING_DATA_DIR"] = workdir
+        test_full_workflow(pathlib.Path(workdir))
\ No newline at end of file